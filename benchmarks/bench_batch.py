@@ -0,0 +1,43 @@
+"""
+Compares analyzing a large push one commit at a time against
+`CommitAnalyzer.analyze_batch`, which vectorizes every message that needs
+an ML type suggestion in a single pass.
+
+Run with: python -m benchmarks.bench_batch
+"""
+from src.core.analyzer.analyzer import CommitAnalyzer
+from src.core.analyzer.classifier import get_classifier
+from .common import measure, print_report
+
+
+PUSH_SIZE = 300
+
+TEMPLATES = [
+    "wibble: jwt token expiry window {n}",
+    "misc: dark mode switch {n}",
+    "thing: sql injection in queries {n}",
+    "feat(api): add pagination to list endpoint {n}",
+    "x: lorem ipsum dolor {n}",
+]
+
+
+def build_push(size: int) -> list[str]:
+    return [TEMPLATES[n % len(TEMPLATES)].format(n=n) for n in range(size)]
+
+
+def main() -> None:
+    messages = build_push(PUSH_SIZE)
+    analyzer = CommitAnalyzer()
+    get_classifier()
+
+    assert analyzer.analyze_batch(messages) == [analyzer.analyze_commit(m) for m in messages]
+
+    results = {
+        "analyze_commit loop": measure(lambda: [analyzer.analyze_commit(m) for m in messages], repeat=20),
+        "analyze_batch": measure(lambda: analyzer.analyze_batch(messages), repeat=20),
+    }
+    print_report(f"Push of {PUSH_SIZE} commits", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Compares per-message latency of the commit-type ML stage when the TF-IDF
+model is fitted for every message (previous behaviour) against the shared,
+pre-fitted classifier.
+
+Run with: python -m benchmarks.bench_classifier
+"""
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from src.config.data import commit_training_data
+from src.core.analyzer.classifier import get_classifier
+from .common import measure, print_report
+import itertools
+
+
+# Messages with invalid types that miss the keyword stage and reach the ML stage.
+MESSAGES = [
+    "wibble: jwt token expiry window",
+    "misc: dark mode switch",
+    "thing: sql injection in queries",
+    "x: lorem ipsum dolor",
+]
+
+
+def refit_per_message(message: str) -> str:
+    x_train = []
+    y_train = []
+    for commit_type, messages in commit_training_data.items():
+        x_train.extend(messages)
+        y_train.extend([commit_type] * len(messages))
+
+    vectorizer = TfidfVectorizer()
+    vectorizer.fit(x_train)
+    x_train_vectorized = vectorizer.transform(x_train)
+    similarities = cosine_similarity(vectorizer.transform([message]), x_train_vectorized)[0]
+    return y_train[similarities.argmax()]
+
+
+def main() -> None:
+    messages = itertools.cycle(MESSAGES)
+    classifier = get_classifier()
+
+    results = {
+        "refit per message": measure(lambda: refit_per_message(next(messages))),
+        "shared classifier": measure(lambda: classifier.most_similar(next(messages))),
+    }
+    print_report("ML stage latency per message", results)
+    speedup = results["refit per message"]["mean_us"] / results["shared classifier"]["mean_us"]
+    print(f"  speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
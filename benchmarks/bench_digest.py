@@ -0,0 +1,38 @@
+"""
+Outbound Telex requests and bytes for a push of mixed commits when each
+violating commit is sent on its own against per-push digests.
+
+Run with: python -m benchmarks.bench_digest
+"""
+from src.core.models import Commit, CommitAuthor, GitHubPayload, Pusher
+from src.routers.github import NotificationOptions, analyze_violations, format_notifications
+from .bench_batch import build_push
+import asyncio
+import time
+
+
+PUSH_SIZE = 200
+
+
+def build_payload(size: int) -> GitHubPayload:
+    author = CommitAuthor("Jane Doe", "jane@example.com")
+    commits = [
+        Commit(f"{n:040x}", message, "2025-02-18T10:17:54+01:00", f"https://github.com/org/repo/commit/{n:040x}", author)
+        for n, message in enumerate(build_push(size))
+    ]
+    return GitHubPayload(pusher=Pusher("jane"), commits=commits)
+
+
+def main() -> None:
+    violations = asyncio.run(analyze_violations(build_payload(PUSH_SIZE)))
+    print(f"Push of {PUSH_SIZE} commits, {len(violations)} with issues")
+    for digest in ("off", "push"):
+        start = time.perf_counter()
+        notifications = format_notifications(violations, NotificationOptions(digest))
+        elapsed = (time.perf_counter() - start) * 1e3
+        size = sum(len(message.encode()) for _, message in notifications)
+        print(f"  digest={digest:<5} {len(notifications):>4} requests  {size / 1024:>8.1f} KiB  format {elapsed:>6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measures how long analysis of a large push takes on each executor backend
+and how responsive the event loop stays meanwhile (worst delay of a 1ms
+heartbeat task, standing in for health checks and other webhooks).
+
+Run with: python -m benchmarks.bench_executor
+"""
+from src.config.config import settings
+from src.core.analyzer.executor import run_analysis, shutdown_executor
+from .bench_batch import build_push
+import asyncio
+import time
+
+
+PUSH_SIZE = 2000
+
+
+async def heartbeat(stop: asyncio.Event, delays: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        delays.append(time.perf_counter() - start - 0.001)
+
+
+async def analyze_with_heartbeat(messages: list[str]) -> tuple[float, float]:
+    await run_analysis(messages[:10])  # Start and preload executor workers
+    stop, delays = asyncio.Event(), []
+    beat = asyncio.create_task(heartbeat(stop, delays))
+    await asyncio.sleep(0)  # Let the heartbeat start waiting before analysis begins
+
+    start = time.perf_counter()
+    await run_analysis(messages)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await beat
+    return elapsed, max(delays, default=0.0)
+
+
+def main() -> None:
+    messages = build_push(PUSH_SIZE)
+    print(f"Analysis of {PUSH_SIZE} commits")
+    for backend in ("inline", "thread", "process"):
+        settings.analysis_executor = backend
+        try:
+            elapsed, worst_delay = asyncio.run(analyze_with_heartbeat(messages))
+        finally:
+            shutdown_executor()
+        print(f"  {backend:<10} total {elapsed * 1e3:>8.1f}ms  worst loop delay {worst_delay * 1e3:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-commit formatting time of the previous inline `format_analysis` against
+the precompiled formatters, measured alongside batch analysis of the same
+push so both per-commit costs of the webhook can be compared.
+
+Run with: python -m benchmarks.bench_formatter
+"""
+from datetime import datetime
+from src.core.analyzer.analyzer import CommitAnalyzer
+from src.core.analyzer.formatter import FORMATTERS
+from src.core.models import Commit, CommitIssue
+from .bench_digest import build_payload
+from .common import measure, print_report
+
+
+PUSH_SIZE = 200
+
+ISSUE_ICONS = {"high": "🔴", "medium": "🟡", "low": "🔵"}
+
+RESOURCES = (
+    "\n💡 Resources\n"
+    "└─ Conventional Commits: <https://www.conventionalcommits.org|Conventional Commits>\n"
+    "└─ Commit Best Practices: <https://dev.to/sheraz4194/good-commit-vs-bad-commit-best-practices-for-git-1plc|Best Practices>\n"
+    "└─ Git Best Practices: <https://git-scm.com/book/en/v2/Distributed-Git-Contributing-to-a-Project|Git Contributing>"
+)
+
+
+def inline_format(commit: Commit, issues: list[CommitIssue]) -> str:
+    """The formatter previously inlined in `CommitAnalyzer.format_analysis`."""
+    timestamp = datetime.fromisoformat(commit.timestamp.replace("Z", "+00:00"))
+    formatted_time = timestamp.strftime("%-I:%M%p. %A, %B %-d, %Y.")
+    author_info = f"{commit.author.name} ({commit.author.email})"
+    commit_details = (
+        "📝 *Commit Details*\n"
+        f"└─ Hash: `{commit.id[:8]}`\n"
+        f"└─ Author: {author_info}\n"
+        f"└─ URL: <{commit.url}|commit url>\n"
+        f"└─ Time: {formatted_time}\n"
+        f"└─ Message:\n"
+        f"• ```{commit.message}```\n"
+    )
+    formatted_issues = "\n".join(
+        f"{ISSUE_ICONS[issue.severity]} {issue.message}\n"
+        f"   └─ {issue.suggestion.replace(chr(10), chr(10) + '     ')}"
+        for issue in sorted(issues, key=lambda x: x.severity)
+    )
+    return f"{commit_details}\n🔍 *Analysis Results*\n{formatted_issues}\n{RESOURCES}"
+
+
+def main() -> None:
+    commits = build_payload(PUSH_SIZE).commits
+    messages = [commit.message for commit in commits]
+    analyzer = CommitAnalyzer()
+    all_issues = analyzer._analyze_uncached(messages)
+    violations = [(commit, issues) for commit, issues in zip(commits, all_issues) if issues]
+
+    def format_all(format_commit):
+        return lambda: [format_commit(commit, issues) for commit, issues in violations]
+
+    results = {
+        "analyze_batch (uncached)": measure(lambda: analyzer._analyze_uncached(messages), repeat=10, warmup=1),
+        "inline format_analysis": measure(format_all(inline_format), repeat=50),
+    }
+    for name, formatter in FORMATTERS.items():
+        results[f"formatter {name}"] = measure(format_all(formatter.format_commit), repeat=50)
+
+    print_report(f"Push of {PUSH_SIZE} commits, {len(violations)} with issues (totals per push)", results)
+    print("Per violating commit")
+    for name, stats in results.items():
+        per_commit = stats["median_us"] / (PUSH_SIZE if name.startswith("analyze") else len(violations))
+        print(f"  {name:<28} {per_commit:>8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
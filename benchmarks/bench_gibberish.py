@@ -0,0 +1,32 @@
+"""
+Microbenchmark of gibberish detection: the original per-word Python loops,
+the precompiled detector with and without its verdict memo, and the NumPy
+path scoring all words of a batch of messages at once.
+
+Run with: python -m benchmarks.bench_gibberish
+"""
+from src.core.analyzer.gibberish import GibberishDetector
+from tests.test_gibberish import reference_check_gibberish, sample_words
+from .common import measure, print_report
+
+
+def main() -> None:
+    # Commit vocabularies repeat heavily: 2000 words drawn from 500 distinct ones.
+    vocabulary = sample_words(500)
+    words = [vocabulary[(i * 7919) % len(vocabulary)] for i in range(2000)]
+    warm = GibberishDetector()
+    warm.score(words)
+
+    results = {
+        "reference loops": measure(lambda: [reference_check_gibberish(w) for w in words], repeat=50),
+        "precompiled, cold memo": measure(
+            lambda: [d.is_gibberish(w) for d in [GibberishDetector()] for w in words], repeat=50
+        ),
+        "precompiled, warm memo": measure(lambda: [warm.is_gibberish(w) for w in words], repeat=50),
+        "numpy batch, cold memo": measure(lambda: GibberishDetector().score(words), repeat=50),
+    }
+    print_report(f"Gibberish check of {len(words)} words", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Cost of serving `/integration.json`: building and serializing the config on
+every request, as before it was prebuilt, against looking up the prepared
+body, then full requests through the app for a fresh poll and for a
+revalidation answered with 304 Not Modified.
+
+Run with: python -m benchmarks.bench_integration_config
+"""
+from fastapi.responses import JSONResponse
+from main import app
+from src.config.integration_config import generate_json_config, get_prepared_config
+from .common import measure, measure_async, print_report
+import asyncio
+import httpx
+
+
+async def _requests() -> dict[str, dict[str, float]]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        etag = (await client.get("/integration.json")).headers["etag"]
+        return {
+            "request (200)": await measure_async(lambda: client.get("/integration.json"), repeat=500),
+            "request (304)": await measure_async(
+                lambda: client.get("/integration.json", headers={"if-none-match": etag}), repeat=500
+            ),
+        }
+
+
+def main() -> None:
+    results = {
+        "build and serialize": measure(lambda: JSONResponse(generate_json_config()), repeat=2000),
+        "prepared lookup": measure(get_prepared_config, repeat=2000),
+    }
+    results.update(asyncio.run(_requests()))
+    print_report("/integration.json", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compares the keyword stage of commit type suggestion: one substring scan of
+the message per indicator phrase against the compiled single-pass matcher,
+for short subjects and long commit bodies.
+
+Run with: python -m benchmarks.bench_keywords
+"""
+from src.config.data import commit_types
+from src.core.analyzer.keywords import KeywordMatcher
+from .common import measure, print_report
+
+
+SUBJECT = "wibble: jwt token expiry window"
+PARAGRAPH = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit. The worker now "
+    "batches outbound requests and retries transient failures with jitter.\n"
+)
+
+
+def substring_scan(message: str) -> dict[str, int]:
+    return {
+        commit_type: sum(word in message for word in indicators)
+        for commit_type, indicators in commit_types.items()
+    }
+
+
+def main() -> None:
+    matcher = KeywordMatcher.for_indicators(commit_types)
+    for name, message in {
+        "subject": SUBJECT,
+        "2KB body": SUBJECT + "\n\n" + PARAGRAPH * 14,
+        "16KB body": SUBJECT + "\n\n" + PARAGRAPH * 112,
+    }.items():
+        message = message.lower()
+        assert matcher.scores(message) == substring_scan(message)
+        print_report(
+            f"Keyword stage, {name} ({len(message)} chars)",
+            {
+                "substring scan": measure(lambda: substring_scan(message)),
+                "compiled matcher": measure(lambda: matcher.scores(message)),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
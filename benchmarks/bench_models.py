@@ -0,0 +1,68 @@
+"""
+Per-commit validation time and retained memory of GitHub push payloads
+parsed into untyped dicts (previous `GitHubPayload`), pydantic models and
+the slotted dataclasses now used by the webhook. Commits carry file lists
+and committer details like real GitHub payloads; only the typed variants
+drop the fields the analyzer does not use.
+
+Run with: python -m benchmarks.bench_models
+"""
+from pydantic import BaseModel
+from src.core.models import GitHubPayload
+from .bench_streaming import build_payload
+from .common import measure
+import tracemalloc
+
+
+COMMITS = 1_000
+
+
+class UntypedPayload(BaseModel):
+    pusher: dict
+    commits: list
+
+
+class AuthorModel(BaseModel):
+    name: str
+    email: str | None = None
+
+
+class CommitModel(BaseModel):
+    id: str
+    message: str
+    timestamp: str
+    url: str
+    author: AuthorModel
+
+
+class ModelPayload(BaseModel):
+    pusher: AuthorModel
+    commits: list[CommitModel]
+
+
+def retained_bytes(model: type[BaseModel], body: bytes) -> int:
+    tracemalloc.start()
+    payload = model.model_validate_json(body)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del payload
+    return retained
+
+
+def main() -> None:
+    body = build_payload(COMMITS)
+    variants = {
+        "untyped dicts": UntypedPayload,
+        "pydantic models": ModelPayload,
+        "slotted dataclasses": GitHubPayload,
+    }
+    print(f"Validating a push of {COMMITS} commits ({len(body) / 1024:.0f} KiB)")
+    for name, model in variants.items():
+        stats = measure(lambda: model.model_validate_json(body), repeat=30)
+        per_commit_us = stats["median_us"] / COMMITS
+        per_commit_bytes = retained_bytes(model, body) / COMMITS
+        print(f"  {name:<22} {per_commit_us:>6.2f}us/commit  {per_commit_bytes:>8.0f} B/commit retained")
+
+
+if __name__ == "__main__":
+    main()
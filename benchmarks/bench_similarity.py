@@ -0,0 +1,83 @@
+"""
+Recall and latency of the ML-stage similarity backends on synthetic
+training corpora of increasing size. Queries are near-duplicates of
+training commits; recall is the share of queries for which the approximate index
+returns a training row as similar as the exact search does.
+
+Run with: python -m benchmarks.bench_similarity
+"""
+from src.config.data import commit_training_data
+from src.core.analyzer.classifier import CommitTypeClassifier
+from src.core.analyzer.similarity import ExactIndex, PrunedIndex
+import numpy as np
+import time
+
+
+CORPUS_SIZES = (1_000, 10_000, 50_000, 200_000)
+QUERIES = 200
+VOCABULARY_SIZE = 30_000
+
+
+def synthetic_corpus(size: int, rng: np.random.Generator) -> dict[str, list[str]]:
+    """
+    Generates commits per type mixing words of the type's training examples
+    with words drawn from a Zipf-distributed vocabulary, like a real corpus.
+    """
+    type_words = {
+        commit_type: sorted({word for message in messages for word in message.lower().split()})
+        for commit_type, messages in commit_training_data.items()
+    }
+    commit_types = list(type_words)
+    corpus = {commit_type: [] for commit_type in commit_types}
+    for _ in range(size):
+        commit_type = commit_types[rng.integers(len(commit_types))]
+        words = list(rng.choice(type_words[commit_type], size=4))
+        words += [f"w{rank}" for rank in np.minimum(rng.zipf(1.3, size=10), VOCABULARY_SIZE)]
+        corpus[commit_type].append(f"{commit_type}: {' '.join(words)}")
+    return corpus
+
+
+def perturb(message: str, rng: np.random.Generator) -> str:
+    """Returns a near-duplicate of a training message with a quarter of its words replaced."""
+    words = message.split()
+    for position in rng.choice(len(words), size=len(words) // 4, replace=False):
+        words[position] = f"w{rng.integers(VOCABULARY_SIZE)}"
+    return " ".join(words)
+
+
+def timed(func, *args) -> tuple[object, float]:
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'corpus':>8} {'backend':>9} {'build ms':>9} {'batch ms':>9} {'single us':>10} {'recall':>7}")
+    for size in CORPUS_SIZES:
+        corpus = synthetic_corpus(size, rng)
+        messages = [message for messages in corpus.values() for message in messages]
+        queries = [perturb(messages[i], rng) for i in rng.choice(len(messages), size=QUERIES)]
+        classifier = CommitTypeClassifier.fit(corpus)
+        vectors = classifier.transform(queries)
+
+        exact_scores = None
+        backends = {"exact": ExactIndex} | {
+            f"approx/{terms}": lambda matrix, terms=terms: PrunedIndex(matrix, query_terms=terms)
+            for terms in (2, 3, 4)
+        }
+        for name, backend in backends.items():
+            index, build_time = timed(backend, classifier.x_train_vectorized)
+            (_, scores), batch_time = timed(index.query, vectors)
+            _, single_time = timed(lambda: [index.query(vectors[i]) for i in range(50)])
+            if exact_scores is None:
+                exact_scores = scores
+            recall = float(np.mean(np.isclose(scores, exact_scores)))
+            print(
+                f"{size:>8} {name:>9} {build_time * 1e3:>9.1f} {batch_time * 1e3:>9.1f} "
+                f"{single_time / 50 * 1e6:>10.1f} {recall:>7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
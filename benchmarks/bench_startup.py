@@ -0,0 +1,129 @@
+"""
+Measures cold start in fresh interpreters, so import costs are included:
+- the commit-type classifier: fitted at startup with scikit-learn, as
+  before the persisted artifact, or with the in-house NumPy fit that
+  replaced it, versus memory-mapped from the persisted artifact
+- the app: importing it with the ML stack deferred, then loading the ML
+  stack as the background warm-up does
+- a uvicorn server: time until it answers `/integration.json` and until
+  `/ready` reports the analyzer warm
+
+With the bundled training data the artifact starts about 0.9s faster than
+the scikit-learn baseline (1.58s vs 0.66s median). The NumPy fit is about as
+fast as memory-mapping the artifact for a corpus this small, because
+loading the artifact also hashes the training data.
+
+Run with: python -m benchmarks.bench_startup
+"""
+from src.config.data import commit_training_data
+from src.config.config import settings
+from src.core.analyzer.artifact import build_artifact
+import httpx
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+
+SCENARIOS = {
+    # The baseline before the artifact: scikit-learn imported and fitted in every worker.
+    "scikit-learn fit at startup": (
+        "from sklearn.feature_extraction.text import TfidfVectorizer\n"
+        "from src.config.data import commit_training_data\n"
+        "messages = [m for ms in commit_training_data.values() for m in ms]\n"
+        "labels = [t for t, ms in commit_training_data.items() for _ in ms]\n"
+        "vectorizer = TfidfVectorizer()\n"
+        "x_train = vectorizer.fit_transform(messages).tocsr()\n"
+        "similarities = (x_train @ vectorizer.transform(['misc: dark mode switch']).T).toarray().ravel()\n"
+        "labels[similarities.argmax()]\n"
+    ),
+    "NumPy fit at startup": (
+        "from src.core.analyzer.classifier import CommitTypeClassifier\n"
+        "from src.config.data import commit_training_data\n"
+        "CommitTypeClassifier.fit(commit_training_data).most_similar('misc: dark mode switch')\n"
+    ),
+    "memory-mapped artifact": (
+        "from src.core.analyzer.classifier import get_classifier\n"
+        "get_classifier().most_similar('misc: dark mode switch')\n"
+    ),
+    "app import": (
+        "import main, sys\n"
+        "assert 'numpy' not in sys.modules\n"
+    ),
+    "app import + ML warm-up": (
+        "import main\n"
+        "from src.core.analyzer.executor import _warm_up_worker\n"
+        "_warm_up_worker()\n"
+    ),
+}
+
+
+def time_interpreter(code: str, repeat: int) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        samples.append((time.perf_counter() - start) * 1e3)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(url: str, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        try:
+            if httpx.get(url, headers={"host": "test"}, timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(url)
+
+
+def time_server(repeat: int) -> dict[str, dict[str, float]]:
+    """Starts uvicorn and returns the times until it first responds and until it is ready."""
+    samples = {"first response": [], "ready": []}
+    for _ in range(repeat):
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        start = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            env=os.environ | {"ANALYZER_WARMUP": "true"},
+        )
+        try:
+            deadline = start + 60
+            _wait_for(f"{base_url}/integration.json", deadline)
+            samples["first response"].append((time.perf_counter() - start) * 1e3)
+            _wait_for(f"{base_url}/ready", deadline)
+            samples["ready"].append((time.perf_counter() - start) * 1e3)
+        finally:
+            server.terminate()
+            server.wait()
+    return {
+        name: {"median_ms": statistics.median(values), "min_ms": min(values)}
+        for name, values in samples.items()
+    }
+
+
+def main(repeat: int = 5) -> None:
+    build_artifact(commit_training_data, settings.model_artifact_dir)
+
+    print("Cold start (fresh interpreter)")
+    for name, code in SCENARIOS.items():
+        stats = time_interpreter(code, repeat)
+        print(f"  {name:<28} median {stats['median_ms']:>8.1f}ms  min {stats['min_ms']:>8.1f}ms")
+
+    print("uvicorn server start")
+    for name, stats in time_server(repeat).items():
+        print(f"  {name:<28} median {stats['median_ms']:>8.1f}ms  min {stats['min_ms']:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
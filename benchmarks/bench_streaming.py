@@ -0,0 +1,105 @@
+"""
+Peak memory of processing a synthetic 10k-commit GitHub push through the
+webhook route with the whole body parsed by pydantic (default) against the
+streaming parser (GITHUB_STREAMING). The route is called over ASGI and
+receives the body in 64 KiB chunks as a server would; commits carry file
+lists and committer details like real GitHub payloads. Telex sends are
+replaced by a no-op so only ingestion and analysis are measured.
+
+Run with: python -m benchmarks.bench_streaming
+"""
+from main import app
+from src.config.config import settings
+from src.utils import telex_utils
+import asyncio
+import json
+import time
+import tracemalloc
+
+
+COMMITS = 10_000
+CHUNK_SIZE = 64 * 1024
+
+
+def build_payload(size: int) -> bytes:
+    person = {"name": "Jane Doe", "email": "jane@example.com", "username": "jane"}
+    commits = [
+        {
+            "id": f"{n:040x}",
+            "tree_id": f"{n * 7:040x}",
+            "distinct": True,
+            "message": "feat(api): add pagination to list endpoint" if n % 3 else f"misc: mirror sync {n}",
+            "timestamp": "2025-02-18T10:17:54+01:00",
+            "url": f"https://github.com/org/repo/commit/{n:040x}",
+            "author": person,
+            "committer": person,
+            "added": [f"src/module_{n}/file_{k}.py" for k in range(5)],
+            "removed": [],
+            "modified": [f"src/module_{n}/other_{k}.py" for k in range(10)],
+        }
+        for n in range(size)
+    ]
+    return json.dumps({
+        "ref": "refs/heads/main",
+        "repository": {"name": "repo", "full_name": "org/repo"},
+        "pusher": {"name": "jane", "email": "jane@example.com"},
+        "commits": commits,
+    }).encode()
+
+
+async def post(body: bytes) -> tuple[int, float, float]:
+    """Sends the body to the webhook in chunks and returns status, seconds and peak MiB."""
+    chunks = [body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+    status = []
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/v2/webhook/github/channel/",
+        "raw_path": b"/api/v2/webhook/github/channel/",
+        "query_string": b"",
+        "headers": [(b"host", b"test"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+    # The chunks stand in for network buffers and are excluded from the measurement.
+    tracemalloc.start()
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return status[0], elapsed, peak / 2**20
+
+
+async def discard_payload(payload: str, url: str) -> None:
+    pass
+
+
+def main() -> None:
+    settings.analysis_cache_backend = "none"
+    settings.dedup_enabled = False
+    telex_utils.send_payload = discard_payload
+    body = build_payload(COMMITS)
+    asyncio.run(post(build_payload(100)))  # loads the classifier outside the measurement
+    print(f"Push of {COMMITS} commits ({len(body) / 2**20:.1f} MiB body)")
+    for name, streaming in (("buffered pydantic", False), ("streaming", True)):
+        settings.github_streaming = streaming
+        status, elapsed, peak = asyncio.run(post(body))
+        assert status == 200, status
+        print(f"  {name:<20} peak {peak:>8.1f} MiB  time {elapsed:>6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
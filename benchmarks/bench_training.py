@@ -0,0 +1,43 @@
+"""
+Time to add a handful of labelled examples to the commit-type classifier
+by refitting on the merged corpus (previous behaviour) against folding them
+into the existing model incrementally, on synthetic corpora of increasing size.
+
+Run with: python -m benchmarks.bench_training
+"""
+from src.core.analyzer.classifier import CommitTypeClassifier
+from src.core.analyzer.training import merge_examples
+from .bench_similarity import synthetic_corpus
+import numpy as np
+import time
+
+
+CORPUS_SIZES = (1_000, 10_000, 100_000)
+EXAMPLES = {
+    "docs": ["docs(api): describe webhook retries", "docs: add flamegraph walkthrough"],
+    "perf": ["perf(queue): batch telex deliveries per channel"],
+}
+
+
+def timed(func) -> tuple[object, float]:
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1e3
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print("Adding 3 labelled examples")
+    for size in CORPUS_SIZES:
+        corpus = synthetic_corpus(size, rng)
+        classifier = CommitTypeClassifier.fit(corpus)
+        _, refit_ms = timed(lambda: CommitTypeClassifier.fit(merge_examples(corpus, EXAMPLES)))
+        _, incremental_ms = timed(lambda: classifier.with_examples(EXAMPLES))
+        print(
+            f"  {size:>7} commits  full refit {refit_ms:>9.1f}ms  "
+            f"incremental {incremental_ms:>7.1f}ms  speedup {refit_ms / incremental_ms:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
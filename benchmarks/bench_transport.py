@@ -0,0 +1,49 @@
+"""
+Compares outbound delivery throughput of the pooled HTTP client against the
+curl subprocess fallback, sending to a local stand-in server.
+
+Run with: python -m benchmarks.bench_transport
+"""
+from src.config.config import settings
+from src.utils.telex_utils import close_http_client, send_payloads
+from .fake_server import FakeServer
+import asyncio
+import json
+import shutil
+import time
+
+
+SENDS = 200
+PAYLOAD = json.dumps({"event_name": "pushed_commits", "message": "x" * 2000, "status": "success", "username": "bench"})
+
+
+async def sends_per_second(url: str, curl_command: str | None) -> float:
+    settings.curl_command = curl_command
+    try:
+        start = time.perf_counter()
+        errors = await send_payloads([PAYLOAD] * SENDS, url)
+        elapsed = time.perf_counter() - start
+    finally:
+        await close_http_client()
+
+    assert not any(errors), errors
+    return SENDS / elapsed
+
+
+def main() -> None:
+    original_curl_command = settings.curl_command
+    transports = {"pooled httpx": None}
+    if shutil.which("curl"):
+        transports["curl subprocess"] = shutil.which("curl")
+
+    print(f"Outbound throughput ({SENDS} sends, concurrency {settings.telex_max_concurrency})")
+    with FakeServer() as server:
+        for name, curl_command in transports.items():
+            rate = asyncio.run(sends_per_second(f"{server.url}/webhooks/bench", curl_command))
+            print(f"  {name:<28} {rate:>10.1f} sends/s")
+
+    settings.curl_command = original_curl_command
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Webhook throughput of the multi-worker launcher at 1, 2, 4 and 8 workers.
+Each run starts `python main.py` with WORKERS set, waits until every worker
+reports ready, then posts pushes from the seeded corpus with enough
+concurrency to keep all workers busy; notifications go to a local fake
+Telex. The analysis cache and deduplication are disabled so every push is
+analyzed. Reports pushes and commits per second, latency, and the combined
+proportional set size (PSS) of the workers, in which pages of the
+memory-mapped classifier shared between workers are only counted once.
+Afterwards `/metrics` is checked to count every analyzed commit, whichever
+worker answers the scrape.
+
+Run with: python -m benchmarks.bench_workers
+"""
+from .common import summarize
+from .fake_server import FakeServer
+from .suite import build_push
+from pathlib import Path
+import asyncio
+import httpx
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+
+WORKER_COUNTS = (1, 2, 4, 8)
+PUSHES = 400
+PUSH_SIZE = 20
+CONCURRENCY_PER_WORKER = 4
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> list[int]:
+    children = []
+    for task in Path(f"/proc/{pid}/task").glob("*"):
+        children.extend(int(child) for child in (task / "children").read_text().split())
+    return children
+
+
+def _memory_mib(pids: list[int]) -> tuple[float, float] | None:
+    """Combined PSS and RSS of the processes, or None where /proc is unavailable."""
+    pss = rss = 0
+    try:
+        for pid in pids:
+            pss += sum(
+                int(line.split()[1])
+                for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()
+                if line.startswith("Pss:")
+            )
+            rss += sum(
+                int(line.split()[1])
+                for line in Path(f"/proc/{pid}/status").read_text().splitlines()
+                if line.startswith("VmRSS:")
+            )
+    except OSError:
+        return None
+    return pss / 1024, rss / 1024
+
+
+async def _commits_analyzed(client: httpx.AsyncClient) -> float:
+    response = await client.get("/metrics")
+    for line in response.text.splitlines():
+        if line.startswith("commits_analyzed_total "):
+            return float(line.split()[1])
+    return 0.0
+
+
+async def _wait_ready(client: httpx.AsyncClient, workers: int, deadline: float) -> None:
+    # Requests land on arbitrary workers, so wait for a run of ready answers.
+    consecutive = 0
+    while consecutive < 4 * workers:
+        if time.perf_counter() > deadline:
+            raise TimeoutError("workers did not become ready")
+        try:
+            response = await client.get("/ready")
+            consecutive = consecutive + 1 if response.status_code == 200 else 0
+        except httpx.TransportError:
+            consecutive = 0
+        if not consecutive:
+            await asyncio.sleep(0.05)
+
+
+async def _load(base_url: str, workers: int, body: bytes) -> dict[str, float]:
+    concurrency = workers * CONCURRENCY_PER_WORKER
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers={"host": "test"}, limits=limits, timeout=60) as client:
+        await _wait_ready(client, workers, time.perf_counter() + 120)
+        latencies = []
+        remaining = iter(range(PUSHES))
+
+        async def post_pushes() -> None:
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/v2/webhook/github/bench-channel/",
+                    content=body,
+                    headers={"content-type": "application/json"},
+                )
+                assert response.status_code == 200, response.text
+                latencies.append((time.perf_counter() - start) * 1e6)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(post_pushes() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+        # Snapshots are written every second; give the last ones time to land.
+        await asyncio.sleep(2)
+        commits = await _commits_analyzed(client)
+        assert commits == PUSHES * PUSH_SIZE, f"/metrics counted {commits} commits"
+    return {"pushes_per_s": PUSHES / elapsed, **summarize(latencies)}
+
+
+def run(workers: int, telex_url: str, body: bytes) -> dict[str, float | None]:
+    port = _free_port()
+    environment = os.environ | {
+        "WORKERS": str(workers),
+        "PORT": str(port),
+        "RELOAD_VALUE": "false",
+        "TELEX_WEBHOOK_URL": telex_url,
+        "ANALYSIS_CACHE_BACKEND": "none",
+        "DEDUP_ENABLED": "false",
+        "METRICS_DIR": ".cache/bench-metrics",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "main.py"], env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        stats = asyncio.run(_load(f"http://127.0.0.1:{port}", workers, body))
+        # A single worker is served by the launcher process itself.
+        stats["memory_mib"] = _memory_mib(_children(server.pid) if workers > 1 else [server.pid])
+    finally:
+        server.terminate()
+        server.wait()
+    return stats
+
+
+def main() -> None:
+    body = json.dumps(build_push(PUSH_SIZE)).encode()
+    print(f"{PUSHES} pushes of {PUSH_SIZE} commits, {CONCURRENCY_PER_WORKER} concurrent requests per worker "
+          f"({os.cpu_count()} CPUs)")
+    with FakeServer() as server:
+        for workers in WORKER_COUNTS:
+            stats = run(workers, f"{server.url}/webhooks", body)
+            memory = (
+                "  PSS {:>7.1f} MiB (RSS sum {:>7.1f} MiB)".format(*stats["memory_mib"])
+                if stats["memory_mib"] is not None else ""
+            )
+            print(
+                f"  {workers} workers  {stats['pushes_per_s']:>8.1f} pushes/s  "
+                f"{stats['pushes_per_s'] * PUSH_SIZE:>9.1f} commits/s  "
+                f"median {stats['median_us'] / 1e3:>7.1f}ms  p95 {stats['p95_us'] / 1e3:>7.1f}ms{memory}"
+            )
+
+
+if __name__ == "__main__":
+    main()
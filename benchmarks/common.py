@@ -0,0 +1,53 @@
+import statistics
+import time
+from typing import Awaitable, Callable
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Returns latency statistics for samples in microseconds."""
+    samples = sorted(samples)
+    return {
+        "runs": len(samples),
+        "mean_us": statistics.fmean(samples),
+        "median_us": statistics.median(samples),
+        "p95_us": samples[int(len(samples) * 0.95) - 1],
+        "min_us": samples[0],
+    }
+
+
+def measure(func: Callable[[], object], repeat: int = 200, warmup: int = 5) -> dict[str, float]:
+    """Runs `func` repeatedly and returns latency statistics in microseconds."""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return summarize(samples)
+
+
+async def measure_async(
+    func: Callable[[], Awaitable[object]], repeat: int = 200, warmup: int = 5
+) -> dict[str, float]:
+    """Awaits `func` repeatedly on the running loop and returns latency statistics in microseconds."""
+    for _ in range(warmup):
+        await func()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return summarize(samples)
+
+
+def print_report(title: str, results: dict[str, dict[str, float]]) -> None:
+    """Prints a small table of results produced by `measure`."""
+    print(title)
+    for name, stats in results.items():
+        print(
+            f"  {name:<28} mean {stats['mean_us']:>10.1f}us  "
+            f"median {stats['median_us']:>10.1f}us  p95 {stats['p95_us']:>10.1f}us"
+        )
@@ -0,0 +1,129 @@
+"""
+Seeded synthetic commit messages for benchmarks, grouped by the analysis
+path they exercise:
+
+- good: conventional commits with a body, which pass the format checks
+- keyword, ml, semantic, fallback: invalid commit types whose suggestion is
+  decided by each stage of `FormatAnalyzer._suggest_commit_type`
+- long_body: valid subjects with long, partly overlong bodies
+- gibberish: valid subjects full of random consonant clusters
+
+Messages are unique per index, so result caches do not hide analysis cost,
+and the same seed always yields the same corpus for the same training data.
+"""
+from src.config.data import commit_types, example_commits, semantic_patterns
+from src.core.analyzer.format_analyzer import FormatAnalyzer
+from src.core.analyzer.keywords import KeywordMatcher
+import random
+import string
+
+
+CATEGORIES = ("good", "keyword", "ml", "semantic", "fallback", "long_body", "gibberish")
+
+SCOPES = ("api", "ui", "db", "auth", "cache", "search", "billing", "queue")
+INVALID_TYPES = ("misc", "thing", "x", "stuff", "wip2", "changes")
+
+GOOD_SUBJECTS = {
+    "feat": ("add cursor pagination", "support bulk uploads", "introduce audit trail"),
+    "fix": ("resolve race in token refresh", "handle empty payloads", "prevent duplicate emails"),
+    "docs": ("document retry settings", "clarify setup steps"),
+    "refactor": ("simplify request parsing", "restructure config loading"),
+    "perf": ("cache compiled templates", "reduce allocations in parser"),
+    "test": ("cover webhook retries", "verify digest windows"),
+}
+BODIES = (
+    "Keeps the previous behaviour for existing clients.",
+    "Measured with the benchmark suite before and after the change.",
+    "Follow-up to the review comments on the previous change.",
+    "The old code path is kept behind a setting for one release.",
+)
+# Invalid-type subjects and the suggestion stage that decides them.
+STAGE_SUBJECTS = {
+    "keyword": ("add retry to uploads", "fix crash on login", "document env vars", "optimize query plans"),
+    "ml": ("dark mode switch", "sql injection in queries", "session hijacking", "typo in readme"),
+    "semantic": (
+        "connect billing to ledger", "allow users to pick avatars",
+        "bootstrap application shell", "provide ability to mute",
+    ),
+    "fallback": ("lorem ipsum dolor", "banana bread recipe", "friday afternoon musings"),
+}
+MAX_DRAWS = 100
+CONSONANTS = "".join(sorted(set(string.ascii_lowercase) - set("aeiouy")))
+
+
+def _gibberish_word(rng: random.Random) -> str:
+    return "".join(rng.choice(CONSONANTS) for _ in range(rng.randint(5, 9)))
+
+
+def _good(rng: random.Random, n: int) -> str:
+    commit_type = rng.choice(tuple(GOOD_SUBJECTS))
+    subject = rng.choice(GOOD_SUBJECTS[commit_type])
+    return f"{commit_type}({rng.choice(SCOPES)}): {subject}\n\n{rng.choice(BODIES)} Refs #{n}."
+
+
+def _invalid(rng: random.Random, n: int, stage: str) -> str:
+    # Types, scopes and the index all feed the similarity stages, so draw
+    # until the message is decided by the requested stage.
+    for _ in range(MAX_DRAWS):
+        subject = rng.choice(STAGE_SUBJECTS[stage])
+        message = f"{rng.choice(INVALID_TYPES)}({rng.choice(SCOPES)}): {subject}\n\nrefs #{n}"
+        if suggestion_stage(message) == stage:
+            return message
+    raise RuntimeError(f"No {stage} message found in {MAX_DRAWS} draws; update STAGE_SUBJECTS")
+
+
+def _long_body(rng: random.Random, n: int) -> str:
+    lines = [
+        " ".join(rng.choice(BODIES).split()[: rng.randint(4, 12)] * rng.randint(1, 3))
+        for _ in range(rng.randint(20, 60))
+    ]
+    return _good(rng, n) + "\n" + "\n".join(lines)
+
+
+def _gibberish(rng: random.Random, n: int) -> str:
+    words = " ".join(_gibberish_word(rng) for _ in range(rng.randint(3, 6)))
+    return f"fix({rng.choice(SCOPES)}): {words}\n\n{' '.join(_gibberish_word(rng) for _ in range(12))} {n}"
+
+
+def generate(category: str, count: int, seed: int = 0) -> list[str]:
+    """Returns `count` messages of a category."""
+    rng = random.Random(f"{category}:{seed}")
+    if category == "good":
+        return [_good(rng, n) for n in range(count)]
+    if category == "long_body":
+        return [_long_body(rng, n) for n in range(count)]
+    if category == "gibberish":
+        return [_gibberish(rng, n) for n in range(count)]
+    if category in STAGE_SUBJECTS:
+        return [_invalid(rng, n, category) for n in range(count)]
+    raise ValueError(f"Unknown corpus category: {category}")
+
+
+def generate_mix(count: int, seed: int = 0) -> list[tuple[str, str]]:
+    """Returns `count` `(category, message)` pairs spread evenly over the categories, shuffled."""
+    per_category = -(-count // len(CATEGORIES))
+    mix = [
+        (category, message)
+        for category in CATEGORIES
+        for message in generate(category, per_category, seed)
+    ]
+    random.Random(seed).shuffle(mix)
+    return mix[:count]
+
+
+def suggestion_stage(message: str) -> str | None:
+    """
+    Returns the `_suggest_commit_type` stage that decides a message's
+    suggested type, or None when no suggestion is needed.
+    """
+    analyzer = FormatAnalyzer(message, commit_types, example_commits)
+    analyzer.check_all()
+    stages = analyzer.stage_seconds
+    if "keyword" not in stages:
+        return None
+    if "ml" not in stages:
+        return "keyword"
+    if "semantic" not in stages:
+        return "ml"
+    scores = KeywordMatcher.for_patterns(semantic_patterns).scores(message.lower())
+    return "semantic" if any(score > 0 for score in scores.values()) else "fallback"
@@ -0,0 +1,53 @@
+import asyncio
+import socket
+import threading
+import time
+import uvicorn
+
+
+class FakeServer:
+    """
+    Local stand-in for the Telex and Slack webhooks. Accepts any POST,
+    records the request bodies and answers with `status_code` after
+    `delay` seconds. Runs uvicorn on an ephemeral port in a background thread.
+    """
+    def __init__(self, status_code: int = 200, delay: float = 0.0) -> None:
+        self.status_code = status_code
+        self.delay = delay
+        self.bodies: list[bytes] = []
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(("127.0.0.1", 0))
+        self._server = uvicorn.Server(
+            uvicorn.Config(self._app, interface="asgi3", log_level="error", lifespan="off", http="h11")
+        )
+        self._thread = threading.Thread(target=self._server.run, kwargs={"sockets": [self._socket]}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._socket.getsockname()
+        return f"http://{host}:{port}"
+
+    async def _app(self, scope, receive, send) -> None:
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        self.bodies.append(body)
+
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        await send({"type": "http.response.start", "status": self.status_code, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": b'{"status": "ok"}'})
+
+    def __enter__(self) -> "FakeServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.should_exit = True
+        self._thread.join()
@@ -0,0 +1,213 @@
+"""
+Reproducible benchmark suite for the analyzer and webhook pipeline, with
+machine-readable results for comparing commits.
+
+Measures, on the seeded corpus in `benchmarks.corpus`:
+- `CommitAnalyzer.analyze_commit` per corpus category, one unseen message per call
+- `CommitAnalyzer.format_analysis` per category with violations
+- the `/api/v2/webhook/github/{channel}/` route end to end through the ASGI
+  app, buffered and streaming, with notifications sent to a local fake Telex
+
+The analysis cache and deduplication are disabled so repeated runs measure
+the same work. Results are printed and, with --output, written as JSON
+together with the git revision and environment they were taken on. With
+--compare, medians are compared to a previous JSON file and the exit status
+is 1 when any benchmark is slower by more than --threshold.
+
+Run with: python -m benchmarks.suite [--quick] [--output results.json] [--compare baseline.json]
+"""
+from datetime import datetime, timezone
+from main import app
+from src.config.config import settings
+from src.core.analyzer.analyzer import CommitAnalyzer
+from src.core.models import Commit, CommitAuthor
+from src.utils.telex_utils import close_http_client
+from .common import measure, measure_async, print_report
+from .corpus import CATEGORIES, generate, generate_mix
+from .fake_server import FakeServer
+import argparse
+import asyncio
+import httpx
+import json
+import os
+import platform
+import subprocess
+import sys
+
+
+SEED = 0
+PUSH_SIZES = (1, 50)
+
+
+def build_push(size: int, seed: int = SEED) -> dict:
+    """A GitHub push event of `size` commits drawn from the corpus mix."""
+    person = {"name": "Jane Doe", "email": "jane@example.com", "username": "jane"}
+    return {
+        "ref": "refs/heads/main",
+        "repository": {"name": "repo", "full_name": "org/repo"},
+        "pusher": {"name": "jane", "email": "jane@example.com"},
+        "commits": [
+            {
+                "id": f"{n:040x}",
+                "message": message,
+                "timestamp": "2025-02-18T10:17:54+01:00",
+                "url": f"https://github.com/org/repo/commit/{n:040x}",
+                "author": person,
+                "committer": person,
+            }
+            for n, (_, message) in enumerate(generate_mix(size, seed))
+        ],
+    }
+
+
+def bench_analyzer(analyzer: CommitAnalyzer, repeat: int) -> dict[str, dict[str, float]]:
+    results = {}
+    for category in CATEGORIES:
+        messages = iter(generate(category, repeat + 5, SEED))
+        results[f"analyze_commit/{category}"] = measure(
+            lambda: analyzer.analyze_commit(next(messages)), repeat=repeat, warmup=5
+        )
+    return results
+
+
+def bench_formatter(analyzer: CommitAnalyzer, repeat: int) -> dict[str, dict[str, float]]:
+    results = {}
+    for category in CATEGORIES:
+        commits = [
+            Commit(
+                id=f"{n:040x}",
+                message=message,
+                timestamp="2025-02-18T10:17:54+01:00",
+                url=f"https://github.com/org/repo/commit/{n:040x}",
+                author=CommitAuthor("Jane Doe", "jane@example.com"),
+            )
+            for n, message in enumerate(generate(category, 20, SEED))
+        ]
+        violations = [
+            (commit, issues)
+            for commit, issues in zip(commits, analyzer.analyze_batch([c.message for c in commits]))
+            if issues
+        ]
+        if not violations:
+            continue
+        results[f"format_analysis/{category}"] = measure(
+            lambda: [analyzer.format_analysis(commit, issues) for commit, issues in violations],
+            repeat=repeat,
+        ) | {"commits": len(violations)}
+    return results
+
+
+async def bench_webhook(repeat: int) -> dict[str, dict[str, float]]:
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v2") as client:
+            for mode, streaming in (("buffered", False), ("streaming", True)):
+                settings.github_streaming = streaming
+                for size in PUSH_SIZES:
+                    body = json.dumps(build_push(size)).encode()
+
+                    async def post():
+                        response = await client.post(
+                            "/webhook/github/bench-channel/",
+                            content=body,
+                            headers={"content-type": "application/json"},
+                        )
+                        assert response.status_code == 200, response.text
+
+                    results[f"webhook/{mode}/{size}"] = await measure_async(post, repeat=repeat)
+    finally:
+        settings.github_streaming = False
+        await close_http_client()
+    return results
+
+
+def metadata(quick: bool) -> dict:
+    def git(*args: str) -> str | None:
+        try:
+            return subprocess.run(
+                ["git", *args], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": SEED,
+        "quick": quick,
+        "executor": settings.analysis_executor,
+    }
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """Prints median changes against a baseline and returns the benchmarks that regressed."""
+    print(f"Compared with {baseline['metadata'].get('commit') or 'baseline'} (threshold {threshold:.0%})")
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        change = stats["median_us"] / previous["median_us"] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"  {name:<28} {previous['median_us']:>10.1f}us -> {stats['median_us']:>10.1f}us "
+            f"{change:>+7.1%}{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions, for smoke runs")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="median slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    settings.analysis_cache_backend = "none"
+    settings.dedup_enabled = False
+    settings.async_processing = False
+    settings.digest_mode = "off"
+    repeat = 20 if args.quick else 200
+
+    analyzer = CommitAnalyzer()
+    analyzer.analyze_commit("misc: load the classifier outside the measurements")
+    results = bench_analyzer(analyzer, repeat)
+    print_report("analyze_commit, per message", results)
+    formatted = bench_formatter(analyzer, repeat)
+    print_report("format_analysis, per batch of violating commits", formatted)
+    results |= formatted
+
+    original_url = settings.telex_webhook_url
+    with FakeServer() as server:
+        settings.telex_webhook_url = f"{server.url}/webhooks"
+        try:
+            webhook = asyncio.run(bench_webhook(max(repeat // 4, 5)))
+        finally:
+            settings.telex_webhook_url = original_url
+    print_report("Webhook end to end, per push", webhook)
+    results |= webhook
+
+    report = {"metadata": metadata(args.quick), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
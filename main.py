@@ -1,15 +1,55 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from src.config.middleware import middleware
 from src.routers.router import webhook_router
-from src.routers.telex import telex_json_router
+from src.routers.telex import telex_json_router, slack_relay
+from src.routers.admin import router as admin_router
+from src.routers.metrics import router as metrics_router
+from src.routers.health import router as health_router
+from src.routers.github import push_queue, digest_buffer
 from src.config.config import settings
+from src.utils.telex_utils import close_http_client, get_delivery_manager
+from src.utils.metrics import clear_snapshots, share_metrics
+from src.utils.workers import prepare_workers
+from src.core.analyzer.executor import shutdown_executor, warm_up
+import asyncio
 import uvicorn
 
 
-app = FastAPI(docs_url="/", middleware=middleware)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.metrics_dir:
+        share_metrics(settings.metrics_dir, settings.metrics_snapshot_interval)
+    if settings.delivery_retries:
+        # Picks up notifications spooled before a restart.
+        get_delivery_manager().start()
+    warm_up_task = asyncio.create_task(warm_up()) if settings.analyzer_warmup else None
+    yield
+    if warm_up_task is not None:
+        # A warm-up still running finishes before its executor shuts down.
+        await warm_up_task
+    await push_queue.drain(settings.push_queue_drain_timeout)
+    await digest_buffer.drain(settings.push_queue_drain_timeout)
+    await slack_relay.drain(settings.push_queue_drain_timeout)
+    if settings.delivery_retries:
+        await get_delivery_manager().stop()
+    shutdown_executor()
+    await close_http_client()
+
+
+app = FastAPI(docs_url="/", middleware=middleware, lifespan=lifespan)
 app.include_router(webhook_router)
 app.include_router(telex_json_router)
+app.include_router(admin_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
 
 if __name__ == "__main__":
-    reload_value = settings.reload_value.lower() == "true"
-    uvicorn.run("main:app", host=settings.host, port=settings.port, reload=reload_value)
+    if settings.workers > 1:
+        prepare_workers()
+        uvicorn.run("main:app", host=settings.host, port=settings.port, workers=settings.workers)
+    else:
+        if settings.metrics_dir:
+            clear_snapshots(settings.metrics_dir)
+        reload_value = settings.reload_value.lower() == "true"
+        uvicorn.run("main:app", host=settings.host, port=settings.port, reload=reload_value)
@@ -1,5 +1,10 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Literal
+
+
+DigestMode = Literal["off", "push", "window"]
+MessageFormat = Literal["slack", "plain", "blocks"]
 
 
 class Settings(BaseSettings):
@@ -8,12 +13,66 @@ class Settings(BaseSettings):
     host: str = "127.0.0.1"
     port: int = 8000
     reload_value: str = "true"
+    workers: int = 1 # uvicorn worker processes started by `python main.py`; reload is off when above 1
     telex_webhook_url: str = "https://ping.telex.im/v1/webhooks"
-    curl_command: str | None = "curl" # might require path/to/curl e.g. `/usr/bin/curl`
+    curl_command: str | None = None # opt-in curl transport, might require path/to/curl e.g. `/usr/bin/curl`
+    http_pool_size: int = 20 # keep-alive connections in the outbound HTTP pool
+    http_timeout: float = 10.0
+    http_connect_timeout: float = 5.0
+    http2: bool = False # requires the `h2` package
     app_logo_url: str = "https://example.com/logo.png"
     app_url: str = "https://example.com"
     target_url: str = "https://example.com/target"
     background_color_hexcode: str = "#FFFFFF"
+    telex_max_concurrency: int = 10 # concurrent outbound notifications per push
+    delivery_retries: bool = False # spool failed notifications and retry them in the background
+    delivery_spool_path: str = ".cache/deliveries.sqlite3"
+    delivery_max_attempts: int = 8 # attempts before a notification is kept as a dead letter
+    delivery_backoff_base: float = 1.0 # seconds; doubles per attempt, with full jitter
+    delivery_backoff_max: float = 300.0
+    delivery_poll_interval: float = 1.0 # seconds between checks of the spool for due retries
+    circuit_failure_threshold: int = 5 # consecutive failures before a destination's circuit opens
+    circuit_reset_timeout: float = 30.0 # seconds before an open circuit lets a probe through
+    slack_rate_limit: float = 1.0 # relayed Slack posts per second per webhook URL, 0 to disable
+    slack_rate_burst: int = 3
+    slack_rate_limit_path: str | None = None # SQLite file sharing the rate limit between workers, set for multiple workers
+    slack_max_pending: int = 100 # queued messages per Slack webhook URL before the oldest is dropped
+    slack_max_batch_chars: int = 4000 # longest coalesced Slack post
+    async_processing: bool = False # acknowledge GitHub pushes with 202 and process them in the background
+    push_queue_size: int = 1000
+    push_queue_workers: int = 4
+    push_queue_drain_timeout: float = 25.0 # seconds to finish queued pushes on shutdown
+    github_streaming: bool = False # parse push bodies incrementally and process them chunk by chunk
+    stream_max_value_size: int = 1048576 # largest single JSON value, e.g. one commit, buffered while streaming
+    dedup_enabled: bool = True # skip GitHub deliveries and commits processed within the window
+    dedup_window_seconds: float = 3600.0
+    dedup_max_entries: int = 50000
+    dedup_path: str | None = None # SQLite file sharing claims between workers, set for multiple workers
+    digest_mode: DigestMode = "off" # default for channels without a `digest` query parameter
+    digest_window_seconds: float = 60.0 # how long "window" digests collect violations across pushes
+    digest_max_commits: int = 25 # commit sections per digest message
+    message_format: MessageFormat = "slack" # default for channels without a `format` query parameter
+    analysis_executor: Literal["inline", "thread", "process"] = "inline" # where CPU-bound commit analysis runs
+    analyzer_warmup: bool = True # load the ML stack in the background after startup instead of on the first push
+    analysis_workers: int | None = None # defaults to the number of CPUs
+    analysis_chunk_size: int = 50 # commits per executor task
+    analysis_cache_backend: Literal["none", "memory", "disk"] = "memory" # "disk" shares results between workers
+    analysis_cache_size: int = 10000
+    analysis_cache_ttl: float = 86400.0
+    analysis_cache_path: str = ".cache/analysis.sqlite3"
+    gibberish_vectorized: bool = True # score new words of a batch with NumPy
+    similarity_backend: Literal["auto", "exact", "approximate"] = "auto" # "auto" goes approximate for large training corpora
+    approximate_min_corpus_size: int = 100000
+    approximate_query_terms: int = 4
+    model_artifact_dir: str = ".cache/models" # fitted commit-type classifier artifacts
+    training_examples_path: str = ".cache/training_examples.jsonl" # labelled examples added through the admin API
+    model_reload_interval: float = 5.0 # seconds between checks for examples added by other workers
+    admin_token: str | None = None # bearer token for the admin API, which is disabled when unset
+    metrics_dir: str | None = None # directory through which worker processes aggregate metrics, set for multiple workers
+    metrics_snapshot_interval: float = 1.0 # seconds between metric snapshots written to `metrics_dir`
+    profiling_enabled: bool = False # allow profiling webhook requests sent with `X-Profile: 1` or `?profile=1`
+    profiling_interval: float = 0.001 # seconds between stack samples of a profiled request
+    profiling_dir: str = ".cache/profiles" # collapsed-stack profiles, read back through the admin API
 
     model_config = SettingsConfigDict(env_file=".env")
 
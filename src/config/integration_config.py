@@ -1,13 +1,31 @@
-from datetime import datetime
+"""
+Integration config served to Telex at `/integration.json`.
+
+Telex polls the config often, so it is built and serialized once and only
+rebuilt when the settings it contains change. `created_at` is the time it
+was first built by this process and `updated_at` the time of the last
+rebuild. The ETag is weak and hashes everything but those dates, so every
+worker serving the same settings answers revalidations with the same tag.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
 from .config import settings
+import hashlib
+import json
+
+
+DATE_FORMAT = "%-I:%M%p. %A, %B %-d, %Y."
 
 
-def generate_json_config():
+def generate_json_config(created_at: datetime | None = None, updated_at: datetime | None = None):
+    created_at = created_at or datetime.now()
+    updated_at = updated_at or created_at
     return {
         "data": {
             "date": {
-                "created_at": f"{datetime.now().strftime('%-I:%M%p. %A, %B %-d, %Y.')}",
-                "updated_at": f"{datetime.now().strftime('%-I:%M%p. %A, %B %-d, %Y.')}"
+                "created_at": created_at.strftime(DATE_FORMAT),
+                "updated_at": updated_at.strftime(DATE_FORMAT)
             },
             "descriptions": {
                 "app_name": "GitHub Commit Quality Monitor",
@@ -38,3 +56,45 @@ def generate_json_config():
             "target_url": settings.target_url
         }
     }
+
+
+@dataclass(slots=True, frozen=True)
+class PreparedConfig:
+    """The serialized integration config with the validators for conditional requests."""
+    body: bytes
+    etag: str
+    last_modified: datetime
+    last_modified_header: str
+
+
+_prepared: tuple[tuple[str, ...], PreparedConfig] | None = None
+_created_at: datetime | None = None
+
+
+def _settings_key() -> tuple[str, ...]:
+    return (settings.app_logo_url, settings.app_url, settings.background_color_hexcode, settings.target_url)
+
+
+def get_prepared_config() -> PreparedConfig:
+    """Returns the prebuilt integration config, rebuilding it when the settings it contains change."""
+    global _prepared, _created_at
+    key = _settings_key()
+    prepared = _prepared
+    if prepared is not None and prepared[0] == key:
+        return prepared[1]
+
+    # HTTP dates have one-second resolution; comparisons with If-Modified-Since need the same.
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    _created_at = _created_at or now
+    config = generate_json_config(_created_at.astimezone(), now.astimezone())
+    undated = {name: value for name, value in config["data"].items() if name != "date"}
+    digest = hashlib.sha256(json.dumps(undated, sort_keys=True).encode()).hexdigest()
+    prepared = PreparedConfig(
+        # Serialized as FastAPI's JSONResponse would.
+        body=json.dumps(config, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode(),
+        etag=f'W/"{digest[:32]}"',
+        last_modified=now,
+        last_modified_header=format_datetime(now, usegmt=True),
+    )
+    _prepared = (key, prepared)
+    return prepared
@@ -2,6 +2,7 @@ from .config import settings
 from fastapi.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from ..utils.profiling import ProfilingMiddleware
 
 
 middleware = (
@@ -14,5 +15,6 @@ middleware = (
     Middleware(
         TrustedHostMiddleware,
         allowed_hosts=settings.allowed_hosts.split(",")
-    )
+    ),
+    Middleware(ProfilingMiddleware),
 )
\ No newline at end of file
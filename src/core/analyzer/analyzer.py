@@ -3,10 +3,16 @@ from ...config.data import (
     example_commits,
     commit_training_data
 )
-from ..models import CommitIssue
+from ..models import Commit, CommitIssue
 from .format_analyzer import FormatAnalyzer
 from .quality_analyzer import QualityAnalyzer
-from datetime import datetime
+from .cache import AnalysisCache, get_analysis_cache
+from .gibberish import detector
+from .formatter import get_formatter
+from ...config.config import settings
+from ...utils.metrics import ANALYSIS_STAGE_SECONDS
+from ...utils.profiling import record_stage
+from time import perf_counter
 
 
 class CommitAnalyzer:
@@ -15,60 +21,90 @@ class CommitAnalyzer:
     machine learning, and semantic analysis to ensure commit quality and 
     provide improvement suggestions.
     """
-    def __init__(self) -> None:
-        """Initializes the analyzer with commit types, examples, and training data."""
+    def __init__(self, cache: AnalysisCache | None = None) -> None:
+        """
+        Initializes the analyzer with commit types, examples, and training data.
+        Results are cached in `cache`, defaulting to the cache configured in settings.
+        """
         self.commit_types = commit_types  
         self.example_commits = example_commits.copy()
         self.commit_training_data = commit_training_data.copy()
+        self.cache = cache or get_analysis_cache()
 
-    def _check_content_format(self, message: str) -> list[CommitIssue]:
-        format_analyzer = FormatAnalyzer(message, self.commit_types, self.example_commits)
-        return format_analyzer.check_all()
-        
     def _check_content_quality(self, message: str) -> list[CommitIssue]:
         quality_analyzer = QualityAnalyzer(message)
         return quality_analyzer.check_all()
     
     def analyze_commit(self, message: str) -> list[CommitIssue]:
         """Analyzes a commit message and returns any quality issues found."""
-        issues = []
-        issues.extend([*self._check_content_format(message)])
-        issues.extend([*self._check_content_quality(message)])
-        return [issue for issue in issues if issue]
+        return self.analyze_batch([message])[0]
 
-    def format_analysis(self, commit: dict, issues: list[CommitIssue]) -> str:
-        """Formats analysis results into a human-readable message for Slack."""
-        icons = {"high": "🔴", "medium": "🟡", "low": "🔵"}
-        
-        timestamp = datetime.fromisoformat(commit["timestamp"].replace("Z", "+00:00"))
-        formatted_time = timestamp.strftime("%-I:%M%p. %A, %B %-d, %Y.")
-        
-        author = commit["author"]
-        author_info = f"{author['name']} ({author.get('email')})"
+    def analyze_batch(self, messages: list[str]) -> list[list[CommitIssue]]:
+        """
+        Analyzes several commit messages at once and returns the issues found
+        for each, in order. Cached results are reused; the remaining messages
+        whose type suggestion reaches the ML stage are vectorized together and
+        matched in a single similarity computation.
+        """
+        if self.cache is None:
+            return self._analyze_uncached(messages)
+
+        results = {}
+        for message in dict.fromkeys(messages):
+            issues = self.cache.get(message)
+            if issues is not None:
+                results[message] = issues
+
+        misses = [message for message in dict.fromkeys(messages) if message not in results]
+        for message, issues in zip(misses, self._analyze_uncached(misses)):
+            self.cache.set(message, issues)
+            results[message] = issues
+
+        return [list(results[message]) for message in messages]
 
-        commit_details = (
-            "📝 *Commit Details*\n"
-            f"└─ Hash: `{commit['id'][:8]}`\n"
-            f"└─ Author: {author_info}\n"
-            f"└─ URL: <{commit['url']}|commit url>\n"
-            f"└─ Time: {formatted_time}\n"
-            f"└─ Message:\n"
-            f"• ```{commit['message']}```\n"
-        )
+    def _analyze_uncached(self, messages: list[str]) -> list[list[CommitIssue]]:
+        format_analyzers = [
+            FormatAnalyzer(message, self.commit_types, self.example_commits)
+            for message in messages
+        ]
 
-        if issues:
-            issues_text = "\n".join(
-                f"{icons[issue.severity]} {issue.message}\n"
-                f"   └─ {issue.suggestion.replace(chr(10), chr(10) + '     ')}"
-                for issue in sorted(issues, key=lambda x: x.severity)
-            )
-            analysis_section = "\n🔍 *Analysis Results*\n" f"{issues_text}\n"
+        pending = [analyzer for analyzer in format_analyzers if analyzer.requires_ml_stage]
+        if pending:
+            from .classifier import get_classifier
 
-        suggestions = (
-            "\n💡 Resources\n"
-            "└─ Conventional Commits: <https://www.conventionalcommits.org|Conventional Commits>\n"
-            "└─ Commit Best Practices: <https://dev.to/sheraz4194/good-commit-vs-bad-commit-best-practices-for-git-1plc|Best Practices>\n"
-            "└─ Git Best Practices: <https://git-scm.com/book/en/v2/Distributed-Git-Contributing-to-a-Project|Git Contributing>"
-        )
+            start = perf_counter()
+            matches = get_classifier().most_similar_batch([analyzer.message.lower() for analyzer in pending])
+            elapsed = perf_counter() - start
+            ANALYSIS_STAGE_SECONDS.observe(elapsed, ("ml",))
+            record_stage("analysis.ml", elapsed)
+            for analyzer, match in zip(pending, matches):
+                analyzer.most_similar = match
 
-        return f"{commit_details}{analysis_section}{suggestions}"
\ No newline at end of file
+        if settings.gibberish_vectorized:
+            # Scores every new word of the batch at once; per-message checks then hit the memo.
+            start = perf_counter()
+            detector.score([word for message in messages for word in message.split()])
+            elapsed = perf_counter() - start
+            ANALYSIS_STAGE_SECONDS.observe(elapsed, ("gibberish_batch",))
+            record_stage("analysis.gibberish_batch", elapsed)
+
+        results = []
+        stage_seconds: dict[str, list[float]] = {}
+        for message, format_analyzer in zip(messages, format_analyzers):
+            format_issues = format_analyzer.check_all()
+            start = perf_counter()
+            issues = [*format_issues, *self._check_content_quality(message)]
+            format_analyzer.stage_seconds["gibberish"] = perf_counter() - start
+            results.append([issue for issue in issues if issue])
+            for stage, seconds in format_analyzer.stage_seconds.items():
+                stage_seconds.setdefault(stage, []).append(seconds)
+
+        # Recorded once per stage and batch, which keeps the cost per commit low.
+        for stage, seconds in stage_seconds.items():
+            ANALYSIS_STAGE_SECONDS.observe_many(seconds, (stage,))
+            record_stage(f"analysis.{stage}", sum(seconds))
+        return results
+
+    def format_analysis(self, commit: Commit, issues: list[CommitIssue]) -> str:
+        """Formats analysis results into a human-readable message for Slack."""
+        return get_formatter("slack").format_commit(commit, issues)
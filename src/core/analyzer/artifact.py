@@ -0,0 +1,145 @@
+"""
+Persisted, content-hashed artifacts for the commit-type classifier.
+
+An artifact is a directory named after the hash of the training data it was
+fitted on. Numeric arrays are stored as `.npy` files so they can be
+memory-mapped at startup instead of refitting the model.
+
+Build ahead of time with: python -m src.core.analyzer.artifact
+"""
+from scipy.sparse import csr_matrix
+from .classifier import CommitTypeClassifier
+from pathlib import Path
+import numpy as np
+import tempfile
+import hashlib
+import logging
+import shutil
+import json
+import os
+
+
+ARTIFACT_FORMAT_VERSION = 2
+ARTIFACT_PREFIX = "commit_type_model-"
+
+logger = logging.getLogger(__name__)
+
+
+def training_data_hash(training_data: dict[str, list[str]]) -> str:
+    """Returns a stable content hash of the training data and artifact format."""
+    content = json.dumps(
+        {"format": ARTIFACT_FORMAT_VERSION, "training_data": training_data},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def artifact_path(directory: str | Path, data_hash: str) -> Path:
+    return Path(directory) / f"{ARTIFACT_PREFIX}{data_hash[:16]}"
+
+
+def save_artifact(classifier: CommitTypeClassifier, path: str | Path, data_hash: str) -> Path:
+    """
+    Writes the classifier to `path`. The artifact is assembled in a temporary
+    directory and renamed into place, so readers never observe a partial write.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=path.parent))
+
+    try:
+        terms = sorted(classifier.vocabulary, key=classifier.vocabulary.get)
+        matrix = classifier.x_train_vectorized
+        np.save(tmp_dir / "idf.npy", np.asarray(classifier.idf, dtype=np.float64))
+        np.save(tmp_dir / "data.npy", np.asarray(matrix.data, dtype=np.float64))
+        np.save(tmp_dir / "indices.npy", np.asarray(matrix.indices, dtype=np.int32))
+        np.save(tmp_dir / "indptr.npy", np.asarray(matrix.indptr, dtype=np.int32))
+        np.save(tmp_dir / "counts.npy", np.asarray(classifier.term_counts.data, dtype=np.int32))
+        (tmp_dir / "vocabulary.json").write_text(json.dumps(terms, ensure_ascii=False))
+        (tmp_dir / "meta.json").write_text(
+            json.dumps(
+                {
+                    "format": ARTIFACT_FORMAT_VERSION,
+                    "hash": data_hash,
+                    "shape": list(matrix.shape),
+                    "labels": list(classifier.y_train),
+                }
+            )
+        )
+        os.replace(tmp_dir, path)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not (path / "meta.json").exists():
+            raise
+        # Another process published the same artifact first.
+
+    return path
+
+
+def load_artifact(path: str | Path) -> CommitTypeClassifier:
+    """Loads an artifact, memory-mapping its numeric arrays read-only."""
+    path = Path(path)
+    meta = json.loads((path / "meta.json").read_text())
+    if meta["format"] != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format: {meta['format']}")
+
+    terms = json.loads((path / "vocabulary.json").read_text())
+    shape = tuple(meta["shape"])
+    indices = np.load(path / "indices.npy", mmap_mode="r")
+    indptr = np.load(path / "indptr.npy", mmap_mode="r")
+    # Term counts share the sparsity pattern of the TF-IDF matrix.
+    return CommitTypeClassifier(
+        vocabulary={term: index for index, term in enumerate(terms)},
+        idf=np.load(path / "idf.npy", mmap_mode="r"),
+        x_train_vectorized=csr_matrix(
+            (np.load(path / "data.npy", mmap_mode="r"), indices, indptr), shape=shape, copy=False
+        ),
+        y_train=tuple(meta["labels"]),
+        term_counts=csr_matrix(
+            (np.load(path / "counts.npy", mmap_mode="r"), indices, indptr), shape=shape, copy=False
+        ),
+    )
+
+
+def build_artifact(training_data: dict[str, list[str]], directory: str | Path) -> Path:
+    """Fits the classifier and persists it, removing artifacts for stale training data."""
+    data_hash = training_data_hash(training_data)
+    path = artifact_path(directory, data_hash)
+    save_artifact(CommitTypeClassifier.fit(training_data), path, data_hash)
+    prune_artifacts(directory, keep=path)
+    return path
+
+
+def prune_artifacts(directory: str | Path, keep: Path) -> None:
+    """
+    Removes every artifact in `directory` except `keep`. Processes that have
+    an old artifact memory-mapped keep reading it until they swap models.
+    """
+    for stale in Path(directory).glob(f"{ARTIFACT_PREFIX}*"):
+        if stale != keep:
+            shutil.rmtree(stale, ignore_errors=True)
+
+
+def load_or_build(training_data: dict[str, list[str]], directory: str | Path) -> CommitTypeClassifier:
+    """
+    Memory-maps the artifact matching the training data, building it first if
+    the training data changed. Falls back to an in-memory fit when the
+    artifact directory is not writable.
+    """
+    path = artifact_path(directory, training_data_hash(training_data))
+    if not (path / "meta.json").exists():
+        try:
+            build_artifact(training_data, directory)
+        except OSError as e:
+            logger.warning("Could not persist classifier artifact to %s: %s", directory, e)
+            return CommitTypeClassifier.fit(training_data)
+
+    return load_artifact(path)
+
+
+if __name__ == "__main__":
+    from ...config.data import commit_training_data
+    from ...config.config import settings
+
+    print(build_artifact(commit_training_data, settings.model_artifact_dir))
@@ -0,0 +1,198 @@
+"""
+Content-addressed cache of commit analysis results.
+
+Entries are keyed by a hash of the commit message combined with a
+fingerprint of the rules and training data, so changing either naturally
+invalidates previous results.
+"""
+from ...config.config import settings
+from ...config.data import (
+    commit_types,
+    example_commits,
+    commit_training_data,
+    semantic_patterns,
+    VALID_PAIRS,
+    LETTER_FREQUENCY,
+)
+from ...utils.ttl_cache import TTLCache
+from ...utils.metrics import ANALYSIS_CACHE_REQUESTS
+from ..models import CommitIssue
+from .training import current_training_data
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Protocol
+import threading
+import hashlib
+import sqlite3
+import json
+import time
+
+
+# Bump when analyzer rules change in code rather than in `config/data.py`.
+RULES_VERSION = 1
+
+
+@lru_cache
+def config_fingerprint() -> str:
+    """Returns a hash of the rule version and every dataset the analyzers depend on."""
+    content = json.dumps(
+        {
+            "rules_version": RULES_VERSION,
+            "commit_types": commit_types,
+            "example_commits": example_commits,
+            "commit_training_data": commit_training_data,
+            "semantic_patterns": semantic_patterns,
+            "valid_pairs": sorted(VALID_PAIRS),
+            "letter_frequency": LETTER_FREQUENCY,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class CacheBackend(Protocol):
+    """Storage for cached analysis results."""
+    def get(self, key: str) -> list[CommitIssue] | None: ...
+
+    def set(self, key: str, issues: list[CommitIssue]) -> None: ...
+
+
+class MemoryBackend:
+    """Per-process LRU store with a time-to-live."""
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._entries = TTLCache(maxsize, ttl)
+
+    def get(self, key: str) -> list[CommitIssue] | None:
+        issues = self._entries.get(key)
+        return list(issues) if issues is not None else None
+
+    def set(self, key: str, issues: list[CommitIssue]) -> None:
+        self._entries.set(key, tuple(issues))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskBackend:
+    """
+    SQLite store shared by every worker process on the host. Entries expire
+    after `ttl` seconds and the least recently used ones are pruned once the
+    table grows past `maxsize`.
+    """
+    PRUNE_INTERVAL = 100  # Writes between size checks
+
+    def __init__(self, path: str | Path, maxsize: int, ttl: float) -> None:
+        self.path = Path(path)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache "
+                "(key TEXT PRIMARY KEY, issues TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> list[CommitIssue] | None:
+        now = time.time()
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT issues FROM analysis_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE analysis_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return [CommitIssue(**issue) for issue in json.loads(row[0])]
+
+    def set(self, key: str, issues: list[CommitIssue]) -> None:
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?, ?)",
+                (key, json.dumps([asdict(issue) for issue in issues]), now + self.ttl, now),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_INTERVAL == 0:
+                self._prune(connection, now)
+
+    def _prune(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM analysis_cache WHERE expires_at <= ?", (now,))
+        connection.execute(
+            "DELETE FROM analysis_cache WHERE key IN "
+            "(SELECT key FROM analysis_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        )
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+
+class AnalysisCache:
+    """Caches the issues found for commit messages, counting hits and misses."""
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self.fingerprint = config_fingerprint()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, message: str) -> str:
+        # The training data hash changes when examples are added at runtime.
+        training_hash, _ = current_training_data()
+        return hashlib.sha256(f"{self.fingerprint}\0{training_hash}\0{message}".encode()).hexdigest()
+
+    def get(self, message: str) -> list[CommitIssue] | None:
+        issues = self.backend.get(self.key(message))
+        if issues is None:
+            self.misses += 1
+            ANALYSIS_CACHE_REQUESTS.inc(("miss",))
+        else:
+            self.hits += 1
+            ANALYSIS_CACHE_REQUESTS.inc(("hit",))
+        return issues
+
+    def set(self, message: str, issues: list[CommitIssue]) -> None:
+        self.backend.set(self.key(message), issues)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "size": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_cache: AnalysisCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache | None:
+    """Returns the process-wide cache configured in settings, or None when disabled."""
+    global _cache
+    if settings.analysis_cache_backend == "none":
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if settings.analysis_cache_backend == "disk":
+                    backend = DiskBackend(
+                        settings.analysis_cache_path,
+                        settings.analysis_cache_size,
+                        settings.analysis_cache_ttl,
+                    )
+                else:
+                    backend = MemoryBackend(settings.analysis_cache_size, settings.analysis_cache_ttl)
+                _cache = AnalysisCache(backend)
+    return _cache
@@ -0,0 +1,208 @@
+from scipy.sparse import csr_matrix, vstack
+from dataclasses import dataclass, field
+from collections import Counter
+from ...config.config import settings
+from .similarity import SimilarityIndex, build_index
+import numpy as np
+import threading
+import re
+
+
+# Mirrors the defaults of scikit-learn's TfidfVectorizer so that artifacts fitted
+# offline transform messages identically without importing scikit-learn at runtime.
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def _count_rows(
+    messages: list[str], vocabulary: dict[str, int], grow: bool
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    data, indices, indptr = [], [], [0]
+    for message in messages:
+        tokens = TOKEN_PATTERN.findall(message.lower())
+        if grow:
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+        counts = Counter(vocabulary[token] for token in tokens if token in vocabulary)
+        columns = sorted(counts)
+        data.extend(counts[column] for column in columns)
+        indices.extend(columns)
+        indptr.append(len(indices))
+
+    return (
+        np.asarray(data, dtype=np.int32),
+        np.asarray(indices, dtype=np.int32),
+        np.asarray(indptr, dtype=np.int32),
+    )
+
+
+def _tfidf_weights(counts: np.ndarray, indices: np.ndarray, indptr: np.ndarray, idf: np.ndarray) -> np.ndarray:
+    # np.asarray drops the np.memmap subclass, whose indexing overhead dominates small batches.
+    weights = counts * np.asarray(idf)[indices]
+    if len(indptr) == 2:
+        norms = np.sqrt(weights @ weights) or 1.0
+        weights /= norms
+        return weights
+
+    row_lengths = np.diff(indptr)
+    rows = np.repeat(np.arange(len(row_lengths)), row_lengths)
+    norms = np.sqrt(np.bincount(rows, weights**2, len(row_lengths)))
+    norms[norms == 0] = 1.0
+    weights /= norms[rows]
+    return weights
+
+
+def count_terms(messages: list[str], vocabulary: dict[str, int], grow: bool = False) -> csr_matrix:
+    """
+    Returns the raw term counts of each message as a CSR matrix with sorted
+    column indices. With `grow`, unseen terms are appended to `vocabulary`
+    in place; otherwise they are ignored.
+    """
+    data, indices, indptr = _count_rows(messages, vocabulary, grow)
+    return csr_matrix((data, indices, indptr), shape=(len(messages), len(vocabulary)), copy=False)
+
+
+def tfidf(counts: csr_matrix, idf: np.ndarray) -> csr_matrix:
+    """Weights term counts by idf and L2-normalizes each row, keeping the sparsity pattern."""
+    weights = _tfidf_weights(counts.data, counts.indices, counts.indptr, idf)
+    return csr_matrix((weights, counts.indices, counts.indptr), shape=counts.shape, copy=False)
+
+
+@dataclass(frozen=True)
+class CommitTypeClassifier:
+    """
+    Pre-fitted TF-IDF model used to match commit messages against the
+    training set. Instances are immutable and safe to share between
+    analyzers and threads.
+    """
+    vocabulary: dict[str, int]
+    idf: np.ndarray
+    x_train_vectorized: csr_matrix
+    y_train: tuple[str, ...]
+    term_counts: csr_matrix
+    index: SimilarityIndex | None = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.index is None:
+            object.__setattr__(self, "index", build_index(self.x_train_vectorized))
+
+    @classmethod
+    def fit(cls, training_data: dict[str, list[str]]) -> "CommitTypeClassifier":
+        """Fits the TF-IDF model on the training data and vectorizes the training set."""
+        x_train = []
+        y_train = []
+
+        for commit_type, messages in training_data.items():
+            x_train.extend(messages)
+            y_train.extend([commit_type] * len(messages))
+
+        terms = sorted({token for message in x_train for token in TOKEN_PATTERN.findall(message.lower())})
+        vocabulary = {term: index for index, term in enumerate(terms)}
+        return cls.from_counts(vocabulary, count_terms(x_train, vocabulary), tuple(y_train))
+
+    @classmethod
+    def from_counts(
+        cls, vocabulary: dict[str, int], term_counts: csr_matrix, y_train: tuple[str, ...]
+    ) -> "CommitTypeClassifier":
+        """Builds the model from raw term counts using smoothed idf weights."""
+        document_frequency = np.bincount(term_counts.indices, minlength=len(vocabulary))
+        idf = np.log((1 + term_counts.shape[0]) / (1 + document_frequency)) + 1
+        return cls(vocabulary, idf, tfidf(term_counts, idf), y_train, term_counts)
+
+    def with_examples(self, examples: dict[str, list[str]]) -> "CommitTypeClassifier":
+        """
+        Returns a new model with the labelled examples added. Only the new
+        messages are tokenized; document frequencies and row weights of the
+        existing corpus are updated from the stored term counts. Rows and
+        terms are ordered as `fit` orders them for the merged training data,
+        so either model answers ties in `most_similar` alike.
+        """
+        messages = [message for commit_type in examples for message in examples[commit_type]]
+        labels = self.y_train + tuple(commit_type for commit_type in examples for _ in examples[commit_type])
+        vocabulary = dict(self.vocabulary)
+        new_counts = count_terms(messages, vocabulary, grow=True)
+        counts = self.term_counts
+        counts = csr_matrix(
+            (counts.data, counts.indices, counts.indptr),
+            shape=(counts.shape[0], len(vocabulary)),
+            copy=False,
+        )
+        counts = vstack([counts, new_counts], format="csr")
+
+        # Each example follows the rows of its type, and new types come last.
+        type_order = {commit_type: position for position, commit_type in enumerate(dict.fromkeys(labels))}
+        rows = np.argsort([type_order[label] for label in labels], kind="stable")
+        counts = counts[rows]
+        if len(vocabulary) > len(self.vocabulary):
+            terms = sorted(vocabulary)
+            columns = np.empty(len(terms), dtype=np.int32)
+            columns[[vocabulary[term] for term in terms]] = np.arange(len(terms), dtype=np.int32)
+            counts = csr_matrix((counts.data, columns[counts.indices], counts.indptr), shape=counts.shape)
+            counts.sort_indices()
+            vocabulary = {term: index for index, term in enumerate(terms)}
+        return self.from_counts(vocabulary, counts, tuple(labels[row] for row in rows))
+
+    def transform(self, messages: list[str]) -> csr_matrix:
+        """Vectorizes messages into L2-normalized TF-IDF rows."""
+        counts, indices, indptr = _count_rows(messages, self.vocabulary, grow=False)
+        return csr_matrix(
+            (_tfidf_weights(counts, indices, indptr, self.idf), indices, indptr),
+            shape=(len(messages), len(self.idf)),
+            copy=False,
+        )
+
+    def most_similar(self, message: str) -> tuple[str, float]:
+        """Returns the training label closest to the message and its cosine similarity."""
+        return self.most_similar_batch([message])[0]
+
+    def most_similar_batch(self, messages: list[str]) -> list[tuple[str, float]]:
+        """
+        Returns the closest training label and its cosine similarity for each
+        message, using one sparse transform and one similarity index query for
+        the batch.
+        """
+        if not messages:
+            return []
+
+        most_similar_idx, best_scores = self.index.query(self.transform(messages))
+        return [
+            (self.y_train[idx], float(score))
+            for idx, score in zip(most_similar_idx, best_scores)
+        ]
+
+
+_classifier: CommitTypeClassifier | None = None
+_classifier_version: str | None = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier() -> CommitTypeClassifier:
+    """
+    Returns the process-wide classifier, memory-mapping the persisted artifact
+    on first use and swapping in a new one when training examples are added.
+    While one thread loads the new model, others keep using the current one.
+    """
+    global _classifier, _classifier_version
+    from .training import current_training_data
+
+    data_hash, training_data = current_training_data()
+    if data_hash != _classifier_version:
+        if _classifier_lock.acquire(blocking=_classifier is None):
+            try:
+                data_hash, training_data = current_training_data()
+                if data_hash != _classifier_version:
+                    from .artifact import load_or_build
+                    from .executor import classifier_loaded
+
+                    _classifier = load_or_build(training_data, settings.model_artifact_dir)
+                    _classifier_version = data_hash
+                    classifier_loaded()
+            finally:
+                _classifier_lock.release()
+    return _classifier
+
+
+def install_classifier(classifier: CommitTypeClassifier, data_hash: str) -> None:
+    """Atomically replaces the process-wide classifier with one fitted on `data_hash`."""
+    global _classifier, _classifier_version
+    with _classifier_lock:
+        _classifier, _classifier_version = classifier, data_hash
@@ -0,0 +1,164 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from ...config.config import settings
+from ...utils.metrics import COMMITS_ANALYZED, VIOLATIONS, share_metrics
+from ..models import CommitIssue
+from .analyzer import CommitAnalyzer
+from .gibberish import detector
+from typing import Literal
+import contextvars
+import threading
+import logging
+import asyncio
+import os
+
+
+logger = logging.getLogger(__name__)
+
+_executor: Executor | None = None
+_executor_lock = threading.Lock()
+_analyzer_state: Literal["cold", "warming", "warm", "failed"] = "cold"
+
+MAX_WARM_UP_ROUNDS = 20
+
+
+def _preload_worker() -> None:
+    """Loads the fitted classifier so the first analysis in a worker pays no startup cost."""
+    from .classifier import get_classifier
+
+    get_classifier()
+
+
+def _init_worker() -> None:
+    """Shares the worker's metrics with the web process when configured, then preloads the classifier."""
+    if settings.metrics_dir:
+        share_metrics(settings.metrics_dir, settings.metrics_snapshot_interval)
+    _preload_worker()
+
+
+def _warm_up_worker() -> int:
+    """
+    Imports NumPy and SciPy, loads the classifier and builds the vectorized
+    gibberish tables, returning the id of the process warmed up.
+    """
+    _preload_worker()
+    detector.prepare_vectorized()
+    return os.getpid()
+
+
+def classifier_loaded() -> None:
+    """
+    Marks the analyzer warm when the classifier is loaded by a push rather
+    than by `warm_up`, including after a failed warm-up.
+    """
+    global _analyzer_state
+    if _analyzer_state in ("cold", "failed"):
+        _analyzer_state = "warm"
+
+
+def analyze_messages(messages: list[str]) -> list[list[CommitIssue]]:
+    """Analyzes a batch of commit messages. Runs inline or inside an executor worker."""
+    return CommitAnalyzer().analyze_batch(messages)
+
+
+def get_executor() -> Executor | None:
+    """
+    Returns the executor configured by `settings.analysis_executor`, creating
+    it on first use, or None when analysis runs inline on the event loop.
+    """
+    global _executor
+    if settings.analysis_executor == "inline":
+        return None
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                executor_class = (
+                    ProcessPoolExecutor if settings.analysis_executor == "process" else ThreadPoolExecutor
+                )
+                _executor = executor_class(
+                    max_workers=settings.analysis_workers,
+                    initializer=_init_worker,
+                )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shuts down the analysis executor, waiting for running analyses to finish."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+
+async def run_analysis(messages: list[str]) -> list[list[CommitIssue]]:
+    """
+    Analyzes commit messages on the configured executor backend. Large pushes
+    are split into chunks of `settings.analysis_chunk_size` messages that are
+    analyzed in parallel, so the event loop is never blocked by CPU work.
+    """
+    executor = get_executor()
+    if executor is None:
+        all_issues = analyze_messages(messages)
+    else:
+        loop = asyncio.get_running_loop()
+        chunk_size = settings.analysis_chunk_size
+        chunks = [messages[i:i + chunk_size] for i in range(0, len(messages), chunk_size)]
+        if isinstance(executor, ThreadPoolExecutor):
+            # Each chunk runs in a copy of the request's context, so profiled
+            # requests keep the analysis sub-stage timings recorded on threads.
+            calls = [
+                loop.run_in_executor(executor, contextvars.copy_context().run, analyze_messages, chunk)
+                for chunk in chunks
+            ]
+        else:
+            calls = [loop.run_in_executor(executor, analyze_messages, chunk) for chunk in chunks]
+        results = await asyncio.gather(*calls)
+        all_issues = [issues for chunk_issues in results for issues in chunk_issues]
+
+    COMMITS_ANALYZED.inc(amount=len(messages))
+    for issues in all_issues:
+        for issue in issues:
+            VIOLATIONS.inc((issue.message, issue.severity))
+    return all_issues
+
+
+def analyzer_state() -> str:
+    """Returns whether the ML stack is "cold", "warming", "warm" or "failed" to warm up."""
+    return _analyzer_state
+
+
+async def _warm_up_processes(executor: Executor, workers: int) -> set[int]:
+    # Idle workers take the next task, so a worker that warms up first can take
+    # several; submit rounds until every worker process has run one.
+    loop = asyncio.get_running_loop()
+    warmed: set[int] = set()
+    for _ in range(MAX_WARM_UP_ROUNDS):
+        warmed.update(
+            await asyncio.gather(*(loop.run_in_executor(executor, _warm_up_worker) for _ in range(workers)))
+        )
+        if len(warmed) >= workers:
+            return warmed
+    logger.warning("Warmed up %d of %d analysis worker processes", len(warmed), workers)
+    return warmed
+
+
+async def warm_up() -> None:
+    """
+    Loads the ML stack on the analysis executor, or a thread when analysis
+    runs inline, so neither the event loop nor the first push waits for it.
+    With the process executor, every worker process is warmed up.
+    """
+    global _analyzer_state
+    _analyzer_state = "warming"
+    executor = get_executor()
+    try:
+        if isinstance(executor, ProcessPoolExecutor):
+            await _warm_up_processes(executor, settings.analysis_workers or os.cpu_count() or 1)
+        else:
+            await asyncio.get_running_loop().run_in_executor(executor, _warm_up_worker)
+    except Exception:
+        _analyzer_state = "failed"
+        logger.exception("Analyzer warm-up failed")
+    else:
+        _analyzer_state = "warm"
@@ -1,8 +1,9 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
 import string
+from functools import cached_property
+from time import perf_counter
 from ..models import CommitIssue
 from ...config.data import semantic_patterns
-from sklearn.metrics.pairwise import cosine_similarity
+from .keywords import KeywordMatcher
 
 
 class FormatAnalyzer:
@@ -22,11 +23,12 @@ class FormatAnalyzer:
             else None
         )
         self.valid_commit_types = commit_types.copy()
+        self.keyword_matcher = KeywordMatcher.for_indicators(commit_types)
         self.example_commits = example_commits.copy()
         self.semantic_patterns = semantic_patterns.copy()
         self.issues = []
-        
-        self.vectorizer = TfidfVectorizer()
+        self.most_similar: tuple[str, float] | None = None  # Precomputed ML stage match, see `CommitAnalyzer.analyze_batch`
+        self.stage_seconds: dict[str, float] = {}  # Time spent per stage, recorded in metrics by `CommitAnalyzer`
         
     def _check_subject(self) -> None:
         first_word = self.subject.split(":")[1].strip() if ":" in self.subject else None
@@ -117,58 +119,63 @@ class FormatAnalyzer:
                 )
             )
             
-    def _suggest_commit_type(self) -> str:
-        """Suggests the most appropriate commit type using a three-stage analysis pipeline."""
-        message = self.message.lower()
+    @property
+    def requires_ml_stage(self) -> bool:
+        """Whether suggesting a commit type for this message will reach the ML stage."""
+        return (
+            bool(self.commit_type)
+            and self.commit_type.lower() not in self.valid_commit_types
+            and self.keyword_commit_type is None
+        )
 
-        type_scores = {
-            commit_type: sum(word in message for word in indicators)
-            for commit_type, indicators in self.valid_commit_types.items()
-        }
+    @cached_property
+    def keyword_commit_type(self) -> str | None:
+        """Commit type with the most indicator keywords in the message, if any."""
+        start = perf_counter()
+        message = self.message.lower()
+        type_scores = self.keyword_matcher.scores(message)
+        self.stage_seconds["keyword"] = perf_counter() - start
 
         if any(score > 0 for score in type_scores.values()):
             return max(type_scores.items(), key=lambda x: x[1])[0]
+        return None
 
-        self._prepare_ml_classifier()
-        message_vectorized = self.vectorizer.transform([message])
-        similarities = cosine_similarity(message_vectorized, self.x_train_vectorized)[0]
+    def _suggest_commit_type(self) -> str:
+        """Suggests the most appropriate commit type using a three-stage analysis pipeline."""
+        if self.keyword_commit_type:
+            return self.keyword_commit_type
 
-        if max(similarities) > 0.3:  # If we have a decent similarity match
-            most_similar_idx = similarities.argmax()
-            return self.y_train[most_similar_idx]
+        message = self.message.lower()
+        if self.most_similar is None:
+            # Imported here so NumPy and SciPy load on the first ML-stage suggestion.
+            from .classifier import get_classifier
 
-        semantic_patterns = self.semantic_patterns
-        semantic_scores = {
-            commit_type: sum(
-                1 for pattern in patterns if any(word in message for word in pattern)
-            )
-            for commit_type, patterns in semantic_patterns.items()
-        }
+            start = perf_counter()
+            self.most_similar = get_classifier().most_similar(message)
+            self.stage_seconds["ml"] = perf_counter() - start
+        most_similar_type, similarity = self.most_similar
+
+        if similarity > 0.3:  # If we have a decent similarity match
+            return most_similar_type
+
+        start = perf_counter()
+        semantic_scores = KeywordMatcher.for_patterns(semantic_patterns).scores(message)
+        self.stage_seconds["semantic"] = perf_counter() - start
 
         if any(score > 0 for score in semantic_scores.values()):
             return max(semantic_scores.items(), key=lambda x: x[1])[0]
 
         return "chore" # Fallback value
     
-    def _prepare_ml_classifier(self) -> None:
-        """
-        Prepares the machine learning classifier for commit type prediction.
-        Transforms the training dataset into TF-IDF vectors for similarity-based
-        classification of commit messages.
-        """
-        x_train = []
-        y_train = []  
-
-        for commit_type, messages in self.commit_training_data.items():
-            x_train.extend(messages)
-            y_train.extend([commit_type] * len(messages))
-
-        self.vectorizer.fit(x_train)
-        self.x_train_vectorized = self.vectorizer.transform(x_train)
-        self.y_train = y_train
-            
     def check_all(self) -> list[CommitIssue]:
+        start = perf_counter()
         self._check_subject()
+        subject_done = perf_counter()
         self._check_body()
+        body_done = perf_counter()
         self._check_commit_type()
+        stage_seconds = self.stage_seconds
+        stage_seconds["subject"] = subject_done - start
+        stage_seconds["body"] = body_done - subject_done
+        stage_seconds["type"] = perf_counter() - body_done
         return self.issues
\ No newline at end of file
@@ -0,0 +1,245 @@
+"""
+Precompiled notification formatters for Slack mrkdwn, plain text and Slack
+Block Kit JSON.
+
+Static fragments are rendered once per formatter, and each issue is rendered
+once and reused, since issues come from a small set of rules. Messages are
+then assembled with a single join.
+"""
+from ...config.config import MessageFormat
+from ..models import Commit, CommitIssue
+from abc import ABC, abstractmethod
+from datetime import datetime
+from functools import lru_cache
+from json.encoder import encode_basestring
+import json
+
+
+SEVERITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+ISSUE_ICONS = {"high": "🔴", "medium": "🟡", "low": "🔵"}
+
+# (label, url, link text)
+RESOURCES = (
+    ("Conventional Commits", "https://www.conventionalcommits.org", "Conventional Commits"),
+    ("Commit Best Practices", "https://dev.to/sheraz4194/good-commit-vs-bad-commit-best-practices-for-git-1plc", "Best Practices"),
+    ("Git Best Practices", "https://git-scm.com/book/en/v2/Distributed-Git-Contributing-to-a-Project", "Git Contributing"),
+)
+
+MAX_CACHED_ISSUES = 4096
+
+
+def sort_issues(issues: list[CommitIssue]) -> list[CommitIssue]:
+    """Orders issues from high to low severity, keeping the analyzer's order within a severity."""
+    return sorted(issues, key=lambda issue: SEVERITY_ORDER.get(issue.severity, len(SEVERITY_ORDER)))
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(timestamp: str) -> str:
+    """Formats an ISO 8601 commit timestamp, e.g. `7:10AM. Monday, February 17, 2025.`"""
+    return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).strftime("%-I:%M%p. %A, %B %-d, %Y.")
+
+
+def _author(commit: Commit) -> str:
+    author = commit.author
+    return f"{author.name} ({author.email})" if author.email else author.name
+
+
+def _digest_title(count: int) -> str:
+    return f"{count} commit needs attention" if count == 1 else f"{count} commits need attention"
+
+
+class MessageFormatter(ABC):
+    """Base class caching the rendering of each issue for an output target."""
+    name: MessageFormat
+    # Most commits a digest message can hold; longer digests are split.
+    max_digest_commits: int | None = None
+
+    def __init__(self) -> None:
+        self._issues: dict[CommitIssue, str] = {}
+
+    def _issue(self, issue: CommitIssue) -> str:
+        fragment = self._issues.get(issue)
+        if fragment is None:
+            if len(self._issues) >= MAX_CACHED_ISSUES:
+                self._issues.clear()
+            fragment = self._issues[issue] = self._render_issue(issue)
+        return fragment
+
+    @abstractmethod
+    def _render_issue(self, issue: CommitIssue) -> str:
+        """Renders one issue, cached by `_issue`."""
+
+    @abstractmethod
+    def format_commit(self, commit: Commit, issues: list[CommitIssue]) -> str:
+        """Formats the analysis of a single commit."""
+
+    @abstractmethod
+    def format_digest(self, reports: list[tuple[Commit, list[CommitIssue]]]) -> str:
+        """Formats the issues of several commits into one message with a shared footer."""
+
+
+class SlackFormatter(MessageFormatter):
+    """Slack mrkdwn, the format Telex relays to Slack channels."""
+    name = "slack"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._footer = "\n💡 Resources\n" + "\n".join(
+            f"└─ {label}: <{url}|{text}>" for label, url, text in RESOURCES
+        )
+
+    def _render_issue(self, issue: CommitIssue) -> str:
+        suggestion = issue.suggestion.replace("\n", "\n     ")
+        return f"{ISSUE_ICONS[issue.severity]} {issue.message}\n   └─ {suggestion}"
+
+    def format_commit(self, commit: Commit, issues: list[CommitIssue]) -> str:
+        parts = [
+            "📝 *Commit Details*\n└─ Hash: `", commit.id[:8],
+            "`\n└─ Author: ", _author(commit),
+            "\n└─ URL: <", commit.url,
+            "|commit url>\n└─ Time: ", format_timestamp(commit.timestamp),
+            "\n└─ Message:\n• ```", commit.message, "```\n",
+        ]
+        if issues:
+            parts += ["\n🔍 *Analysis Results*\n", "\n".join(map(self._issue, sort_issues(issues))), "\n"]
+        parts.append(self._footer)
+        return "".join(parts)
+
+    def format_digest(self, reports: list[tuple[Commit, list[CommitIssue]]]) -> str:
+        parts = ["📋 *Commit Digest*: ", _digest_title(len(reports)), "\n\n"]
+        for number, (commit, issues) in enumerate(reports, start=1):
+            if number > 1:
+                parts.append("\n")
+            parts += [
+                "*", str(number), ".* `", commit.id[:8], "` by ", commit.author.name,
+                " · <", commit.url, "|commit url>\n• ```", commit.message, "```\n",
+                "\n".join(map(self._issue, sort_issues(issues))), "\n",
+            ]
+        parts.append(self._footer)
+        return "".join(parts)
+
+
+class PlainTextFormatter(MessageFormatter):
+    """Plain text without markup, for channels that do not render mrkdwn."""
+    name = "plain"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._footer = "\nResources\n" + "\n".join(f"- {label}: {url}" for label, url, _ in RESOURCES)
+
+    def _render_issue(self, issue: CommitIssue) -> str:
+        suggestion = issue.suggestion.replace("\n", "\n  ")
+        return f"[{issue.severity.upper()}] {issue.message}\n  {suggestion}"
+
+    def format_commit(self, commit: Commit, issues: list[CommitIssue]) -> str:
+        parts = [
+            "Commit Details\n- Hash: ", commit.id[:8],
+            "\n- Author: ", _author(commit),
+            "\n- URL: ", commit.url,
+            "\n- Time: ", format_timestamp(commit.timestamp),
+            "\n- Message: ", commit.message, "\n",
+        ]
+        if issues:
+            parts += ["\nAnalysis Results\n", "\n".join(map(self._issue, sort_issues(issues))), "\n"]
+        parts.append(self._footer)
+        return "".join(parts)
+
+    def format_digest(self, reports: list[tuple[Commit, list[CommitIssue]]]) -> str:
+        parts = ["Commit Digest: ", _digest_title(len(reports)), "\n\n"]
+        for number, (commit, issues) in enumerate(reports, start=1):
+            if number > 1:
+                parts.append("\n")
+            parts += [
+                str(number), ". ", commit.id[:8], " by ", commit.author.name, " - ", commit.url,
+                "\n   ", commit.message, "\n",
+                "\n".join(map(self._issue, sort_issues(issues))), "\n",
+            ]
+        parts.append(self._footer)
+        return "".join(parts)
+
+
+# Encodes a string as a JSON string literal, skipping the overhead of `json.dumps`.
+_text = encode_basestring
+
+# Slack rejects messages over these limits.
+MAX_BLOCKS = 50
+MAX_SECTION_CHARS = 3000
+MAX_FIELD_CHARS = 2000
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+class BlocksFormatter(MessageFormatter):
+    """
+    Slack Block Kit JSON (`{"blocks": [...]}`), serialized into the message
+    text. Digests use one section per commit between a header and a footer,
+    and section text is truncated to Slack's limit.
+    """
+    name = "blocks"
+    max_digest_commits = MAX_BLOCKS - 2
+
+    def __init__(self) -> None:
+        super().__init__()
+        resources = " · ".join(f"<{url}|{text}>" for _, url, text in RESOURCES)
+        self._footer = json.dumps(
+            {"type": "context", "elements": [{"type": "mrkdwn", "text": f"💡 {resources}"}]},
+            ensure_ascii=False,
+        )
+        self._commit_header = json.dumps(
+            {"type": "header", "text": {"type": "plain_text", "text": "📝 Commit Details"}}, ensure_ascii=False
+        )
+
+    def _render_issue(self, issue: CommitIssue) -> str:
+        suggestion = issue.suggestion.replace("\n", "\n     ")
+        return f"{ISSUE_ICONS[issue.severity]} *{issue.message}*\n   └─ {suggestion}"
+
+    def _issues_block(self, issues: list[CommitIssue]) -> str:
+        text = "\n".join(map(self._issue, sort_issues(issues)))
+        return self._section(text)
+
+    @staticmethod
+    def _section(text: str) -> str:
+        return '{"type": "section", "text": {"type": "mrkdwn", "text": ' + _text(_truncate(text, MAX_SECTION_CHARS)) + "}}"
+
+    def format_commit(self, commit: Commit, issues: list[CommitIssue]) -> str:
+        fields = (
+            f"*Hash:*\n`{commit.id[:8]}`",
+            f"*Author:*\n{_author(commit)}",
+            f"*Time:*\n{format_timestamp(commit.timestamp)}",
+            f"*URL:*\n<{commit.url}|commit url>",
+        )
+        parts = [
+            '{"blocks": [', self._commit_header,
+            ', {"type": "section", "fields": [',
+            ", ".join('{"type": "mrkdwn", "text": ' + _text(_truncate(field, MAX_FIELD_CHARS)) + "}" for field in fields),
+            "]}, ", self._section(f"```{_truncate(commit.message, MAX_SECTION_CHARS - 6)}```"),
+        ]
+        if issues:
+            parts += [", ", self._issues_block(issues)]
+        parts += [", ", self._footer, "]}"]
+        return "".join(parts)
+
+    def format_digest(self, reports: list[tuple[Commit, list[CommitIssue]]]) -> str:
+        header = {"type": "header", "text": {"type": "plain_text", "text": f"📋 Commit Digest: {_digest_title(len(reports))}"}}
+        parts = ['{"blocks": [', json.dumps(header, ensure_ascii=False)]
+        for number, (commit, issues) in enumerate(reports, start=1):
+            summary = f"*{number}.* `{commit.id[:8]}` by {commit.author.name} · <{commit.url}|commit url>\n```"
+            issues_text = "```\n" + "\n".join(map(self._issue, sort_issues(issues)))
+            # The message gives way first, so the issues stay readable.
+            budget = max(MAX_SECTION_CHARS - len(summary) - len(issues_text), 1)
+            parts += [", ", self._section(summary + _truncate(commit.message, budget) + issues_text)]
+        parts += [", ", self._footer, "]}"]
+        return "".join(parts)
+
+
+FORMATTERS: dict[str, MessageFormatter] = {
+    formatter.name: formatter for formatter in (SlackFormatter(), PlainTextFormatter(), BlocksFormatter())
+}
+
+
+def get_formatter(name: MessageFormat) -> MessageFormatter:
+    """Returns the shared formatter for an output target."""
+    return FORMATTERS[name]
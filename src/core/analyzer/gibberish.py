@@ -0,0 +1,211 @@
+"""
+Precompiled gibberish detection for commit message words.
+
+`GibberishDetector` applies the same four checks `QualityAnalyzer` has
+always used, backed by lookup tables built once from `VALID_PAIRS` and
+`LETTER_FREQUENCY`, and memoizes verdicts per word since commit vocabularies
+repeat heavily. `score` adds a NumPy path that checks many words at once;
+NumPy is imported and its tables built on the first batch large enough to
+use it.
+"""
+from ...config.data import LETTER_FREQUENCY, VALID_PAIRS
+import string
+import re
+
+
+VOWELS = frozenset("aeiouy")
+ALPHABET = string.ascii_lowercase
+PAD = len(ALPHABET)  # Code used to pad words in the NumPy path
+
+# The frequency check compares floats against this threshold; NumPy sums in a
+# different order than the scalar loop, so rows this close are re-checked in Python.
+_FREQUENCY_THRESHOLD = 0.5
+_FREQUENCY_TOLERANCE = 1e-9
+
+
+class GibberishDetector:
+    """
+    Determines if a word is likely to be gibberish using multiple linguistic patterns.
+
+    A word fails up to four checks:
+    1. Vowel ratio: Words must maintain a minimum vowel-to-length ratio of 0.2
+    2. Consonant sequences: Flags sequences of more than 4 consecutive consonants
+    3. Letter frequency: For words >= 4 chars, compares letter frequencies against English language norms
+    4. Consonant pairs: Identifies invalid consonant combinations that rarely occur in English
+
+    A word is considered gibberish if it fails two or more of these checks.
+    """
+    MAX_CACHED_WORDS = 100_000
+    VECTORIZE_MIN_WORDS = 64  # Below this, the scalar path is faster than NumPy setup
+
+    def __init__(self) -> None:
+        self._verdicts: dict[str, bool] = {}
+        self._consonant_run = re.compile(r"[^aeiouy]{5}")
+        self._vowel_deletions = str.maketrans("", "", "".join(VOWELS))
+        self._expected_frequency = {char: freq / 100 for char, freq in LETTER_FREQUENCY.items()}
+        self._invalid_pairs = frozenset(
+            a + b
+            for a in ALPHABET
+            for b in ALPHABET
+            if a + b not in VALID_PAIRS and a not in VOWELS and b not in VOWELS
+        )
+
+        self._vectorized_ready = False
+
+    def prepare_vectorized(self) -> None:
+        """Builds the tables of the NumPy path, indexed by letter code (PAD for padding)."""
+        if self._vectorized_ready:
+            return
+
+        import numpy as np
+
+        codes = np.arange(PAD + 1)
+        self._vowel_table = np.array([c < PAD and ALPHABET[c] in VOWELS for c in codes])
+        self._consonant_table = np.array([c < PAD and ALPHABET[c] not in VOWELS for c in codes])
+        self._invalid_pair_table = np.array(
+            [
+                a < PAD and b < PAD and ALPHABET[a] + ALPHABET[b] in self._invalid_pairs
+                for a in codes
+                for b in codes
+            ]
+        )
+        self._frequency_table = np.array(
+            [self._expected_frequency.get(char, np.nan) for char in ALPHABET]
+        )
+        self._encode_table = np.full(256, PAD, dtype=np.uint8)
+        for code, char in enumerate(ALPHABET):
+            self._encode_table[ord(char)] = code
+        self._vectorized_ready = True
+
+    @staticmethod
+    def normalize(word: str) -> str | None:
+        """Returns the word as checked, or None if it is too short or not purely alphabetic."""
+        word = word.lower().strip(string.punctuation)
+        if not word or len(word) < 2 or not word.isalpha():
+            return None
+        return word
+
+    def is_gibberish(self, word: str) -> bool:
+        """Returns the memoized verdict for a raw word from a commit message."""
+        verdict = self._verdicts.get(word)
+        if verdict is None:
+            normalized = self.normalize(word)
+            verdict = normalized is not None and self._check(normalized)
+            self._remember(word, verdict)
+        return verdict
+
+    def _remember(self, word: str, verdict: bool) -> None:
+        if len(self._verdicts) >= self.MAX_CACHED_WORDS:
+            self._verdicts.clear()
+        self._verdicts[word] = verdict
+
+    def _check(self, word: str) -> bool:
+        failed_checks = 0
+        length = len(word)
+
+        vowel_count = length - len(word.translate(self._vowel_deletions))
+        if vowel_count / length < 0.2:
+            failed_checks += 1
+
+        if self._consonant_run.search(word):
+            failed_checks += 1
+
+        if length >= 4 and self._frequency_deviation(word) > _FREQUENCY_THRESHOLD:
+            failed_checks += 1
+            if failed_checks >= 2:
+                return True
+
+        if word.isascii():
+            invalid_pairs = sum(word[i:i + 2] in self._invalid_pairs for i in range(length - 1))
+        else:
+            invalid_pairs = sum(
+                a + b not in VALID_PAIRS and a not in VOWELS and b not in VOWELS
+                for a, b in zip(word, word[1:])
+            )
+        if invalid_pairs > 1:
+            failed_checks += 1
+
+        return failed_checks >= 2
+
+    def _frequency_deviation(self, word: str) -> float:
+        """Mean deviation of the word's letter frequencies from English norms."""
+        char_counts = {}
+        for char in word:
+            char_counts[char] = char_counts.get(char, 0) + 1
+
+        deviation = 0
+        for char, count in char_counts.items():
+            expected = self._expected_frequency.get(char)
+            if expected is not None:
+                deviation += abs(expected - count / len(word))
+        return deviation / len(char_counts)
+
+    def score(self, words: list[str]) -> list[bool]:
+        """
+        Returns the verdict for each raw word. Words not seen before are
+        checked together with NumPy when there are enough of them to pay off.
+        """
+        unseen = [word for word in dict.fromkeys(words) if word not in self._verdicts]
+        if len(unseen) >= self.VECTORIZE_MIN_WORDS:
+            for word, verdict in zip(unseen, self._score_vectorized(unseen)):
+                self._remember(word, verdict)
+        return [self.is_gibberish(word) for word in words]
+
+    def _score_vectorized(self, raw_words: list[str]) -> list[bool]:
+        verdicts = [False] * len(raw_words)
+        positions, words = [], []
+        for position, raw_word in enumerate(raw_words):
+            word = self.normalize(raw_word)
+            if word is None:
+                continue
+            if word.isascii():
+                positions.append(position)
+                words.append(word)
+            else:
+                verdicts[position] = self._check(word)
+
+        if not words:
+            return verdicts
+
+        import numpy as np
+
+        self.prepare_vectorized()
+        lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        width = max(int(lengths.max()), 5)
+        padded = b"".join(word.encode().ljust(width, b"\0") for word in words)
+        codes = self._encode_table[np.frombuffer(padded, dtype=np.uint8).reshape(len(words), width)]
+
+        vowels = self._vowel_table[codes]
+        consonants = self._consonant_table[codes]
+
+        failed_checks = (vowels.sum(axis=1) / lengths < 0.2).astype(np.int64)
+
+        runs = consonants[:, :-4].copy()
+        for offset in range(1, 5):
+            runs &= consonants[:, offset:width - 4 + offset]
+        failed_checks += runs.any(axis=1)
+
+        pairs = codes[:, :-1].astype(np.int64) * (PAD + 1) + codes[:, 1:]
+        failed_checks += self._invalid_pair_table[pairs].sum(axis=1) > 1
+
+        counts = np.zeros((len(words), PAD + 1), dtype=np.int64)
+        np.add.at(counts, (np.arange(len(words))[:, None], codes), 1)
+        counts = counts[:, :PAD]
+        present = counts > 0
+        known = present & ~np.isnan(self._frequency_table)
+        deviation = np.where(
+            known, np.abs(self._frequency_table - counts / lengths[:, None]), 0.0
+        ).sum(axis=1) / present.sum(axis=1)
+        frequency_failed = (lengths >= 4) & (deviation > _FREQUENCY_THRESHOLD)
+        for row in np.flatnonzero(
+            (lengths >= 4) & (np.abs(deviation - _FREQUENCY_THRESHOLD) < _FREQUENCY_TOLERANCE)
+        ):
+            frequency_failed[row] = self._frequency_deviation(words[row]) > _FREQUENCY_THRESHOLD
+        failed_checks += frequency_failed
+
+        for position, failed in zip(positions, failed_checks):
+            verdicts[position] = bool(failed >= 2)
+        return verdicts
+
+
+detector = GibberishDetector()
@@ -0,0 +1,106 @@
+"""
+Compiled multi-pattern keyword matching for commit type suggestions.
+
+Commit types are scored by how many of their phrase groups occur in a
+message as substrings. Instead of scanning the message once per phrase,
+`KeywordMatcher` finds every phrase in a single pass of one combined pattern.
+"""
+from typing import Callable, Iterable
+import re
+
+
+PhraseGroups = dict[str, list[tuple[str, ...]]]
+
+
+class KeywordMatcher:
+    """
+    Scores types by the number of their phrase groups with at least one
+    phrase contained in a message, i.e. for each type:
+
+        sum(any(phrase in message for phrase in group) for group in groups)
+    """
+    def __init__(self, groups: PhraseGroups) -> None:
+        self.types = tuple(groups)
+        self._group_types: list[str] = []
+        self._groups_by_phrase: dict[str, set[int]] = {}
+        for commit_type, type_groups in groups.items():
+            for group in type_groups:
+                group_id = len(self._group_types)
+                self._group_types.append(commit_type)
+                for phrase in group:
+                    self._groups_by_phrase.setdefault(phrase, set()).add(group_id)
+
+        # A zero-width lookahead reports a match at every position of the message.
+        # The trie-shaped pattern is greedy, so each position yields its longest
+        # phrase; shorter phrases starting at the same position are its prefixes.
+        phrases = list(self._groups_by_phrase)
+        self._pattern = re.compile(f"(?=({_trie_pattern(phrases)}))") if phrases else None
+        self._prefixes = {
+            phrase: [prefix for prefix in phrases if phrase.startswith(prefix)]
+            for phrase in phrases
+        }
+
+    @classmethod
+    def for_indicators(cls, indicators: dict[str, Iterable[str]]) -> "KeywordMatcher":
+        """Returns a cached matcher treating every indicator as its own group."""
+        return _cached_matcher(
+            indicators,
+            lambda: cls({commit_type: [(word,) for word in words] for commit_type, words in indicators.items()}),
+        )
+
+    @classmethod
+    def for_patterns(cls, patterns: PhraseGroups) -> "KeywordMatcher":
+        """Returns a cached matcher for groups of alternative phrases."""
+        return _cached_matcher(patterns, lambda: cls(patterns))
+
+    def present(self, message: str) -> set[str]:
+        """Returns every phrase contained in the message."""
+        if self._pattern is None:
+            return set()
+        longest = {match.group(1) for match in self._pattern.finditer(message)}
+        return {prefix for phrase in longest for prefix in self._prefixes[phrase]}
+
+    def scores(self, message: str) -> dict[str, int]:
+        """Returns the score of every type, in the order the types were given."""
+        scores = dict.fromkeys(self.types, 0)
+        matched_groups = set()
+        for phrase in self.present(message):
+            matched_groups |= self._groups_by_phrase[phrase]
+        for group_id in matched_groups:
+            scores[self._group_types[group_id]] += 1
+        return scores
+
+
+def _trie_pattern(phrases: list[str]) -> str:
+    """Builds a regular expression matching any phrase, sharing common prefixes."""
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(trie)
+
+
+# Matchers are cached by the identity of the dict they were built from, which
+# is treated as immutable (the module-level datasets in `config/data.py`).
+_MAX_CACHED_MATCHERS = 16
+_matchers: dict[int, tuple[object, KeywordMatcher]] = {}
+
+
+def _cached_matcher(source: object, build: Callable[[], KeywordMatcher]) -> KeywordMatcher:
+    entry = _matchers.get(id(source))
+    if entry is None or entry[0] is not source:
+        if len(_matchers) >= _MAX_CACHED_MATCHERS:
+            _matchers.clear()
+        entry = (source, build())
+        _matchers[id(source)] = entry
+    return entry[1]
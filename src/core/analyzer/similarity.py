@@ -0,0 +1,90 @@
+"""
+Similarity search backends for the ML stage of commit type suggestion.
+
+Both backends work on L2-normalized TF-IDF rows, so cosine similarity is a
+dot product. `ExactIndex` compares queries against every training row;
+`PrunedIndex` first narrows the comparison to rows sharing the query's most
+informative terms, which keeps lookups fast on large custom training corpora.
+"""
+from ...config.config import settings
+from scipy.sparse import csr_matrix
+from typing import Protocol
+import numpy as np
+
+
+class SimilarityIndex(Protocol):
+    def query(self, vectors: csr_matrix) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the index of the most similar training row and its similarity, per query row."""
+        ...
+
+
+class ExactIndex:
+    """
+    Exact search: one sparse matrix product against the full training matrix.
+    The product runs against the transposed (term-major) matrix, so computing
+    it only touches the postings of the query terms, but the scores are then
+    densified to pick each row's best match, so a query still costs time and
+    memory proportional to the corpus size (a dense queries × rows array).
+    """
+    def __init__(self, matrix: csr_matrix) -> None:
+        self.matrix = matrix
+        self._postings = matrix.T.tocsr()
+
+    def query(self, vectors: csr_matrix) -> tuple[np.ndarray, np.ndarray]:
+        similarities = (vectors @ self._postings).toarray()
+        best = similarities.argmax(axis=1)
+        return best, similarities[np.arange(vectors.shape[0]), best]
+
+
+class PrunedIndex:
+    """
+    Approximate search over an inverted index of the training matrix.
+
+    Candidates for a query are the training rows containing at least one of
+    its `query_terms` highest-weighted (rarest) terms; only those rows are
+    scored exactly. Near neighbours in TF-IDF space almost always share a
+    query's most informative terms, so recall stays high while the number of
+    rows scored is a small fraction of the corpus.
+    """
+    def __init__(self, matrix: csr_matrix, query_terms: int = 4) -> None:
+        self.matrix = matrix
+        self.query_terms = query_terms
+        self._postings = matrix.tocsc()
+
+    def query(self, vectors: csr_matrix) -> tuple[np.ndarray, np.ndarray]:
+        count = vectors.shape[0]
+        best = np.zeros(count, dtype=np.int64)
+        scores = np.zeros(count, dtype=np.float64)
+        postings, offsets = self._postings.indices, self._postings.indptr
+        query_dense = np.zeros(vectors.shape[1], dtype=np.float64)
+
+        for row in range(count):
+            start, end = vectors.indptr[row], vectors.indptr[row + 1]
+            if start == end:
+                continue
+            terms, weights = vectors.indices[start:end], vectors.data[start:end]
+            top_terms = terms[np.argsort(weights)[::-1][:self.query_terms]]
+            candidates = np.unique(
+                np.concatenate([postings[offsets[term]:offsets[term + 1]] for term in top_terms])
+            )
+
+            # Candidate rows all contain a query term, so no row segment is empty.
+            rows = self.matrix[candidates]
+            query_dense[terms] = weights
+            similarities = np.add.reduceat(rows.data * query_dense[rows.indices], rows.indptr[:-1])
+            query_dense[terms] = 0.0
+
+            position = similarities.argmax()
+            best[row], scores[row] = candidates[position], similarities[position]
+        return best, scores
+
+
+def build_index(matrix: csr_matrix) -> SimilarityIndex:
+    """Returns the similarity backend configured by `settings.similarity_backend`."""
+    backend = settings.similarity_backend
+    if backend == "auto":
+        backend = "approximate" if matrix.shape[0] >= settings.approximate_min_corpus_size else "exact"
+
+    if backend == "approximate":
+        return PrunedIndex(matrix, query_terms=settings.approximate_query_terms)
+    return ExactIndex(matrix)
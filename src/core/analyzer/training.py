@@ -0,0 +1,135 @@
+"""
+Labelled commit messages added to the classifier at runtime.
+
+Added examples are recorded in an append-only JSON-lines log and merged with
+the base training data from `config/data.py`. An update folds the examples
+into the current model incrementally, persists the result as a new artifact
+and only then appends to the log, so every worker that notices the log change
+swaps in the new model by memory-mapping the artifact instead of refitting.
+
+The artifact and classifier modules, which import NumPy and SciPy, are
+imported on first use.
+"""
+from ...config.config import settings
+from ...config.data import commit_training_data
+from pathlib import Path
+from typing import TYPE_CHECKING
+import threading
+import logging
+import json
+import time
+import os
+
+if TYPE_CHECKING:
+    from .classifier import CommitTypeClassifier
+
+
+logger = logging.getLogger(__name__)
+
+_state_lock = threading.Lock()
+_update_lock = threading.Lock()
+_log_signature: tuple | None = None
+_current: tuple[str, dict[str, list[str]]] | None = None
+_checked_at = 0.0
+
+
+def merge_examples(
+    training_data: dict[str, list[str]], examples: dict[str, list[str]]
+) -> dict[str, list[str]]:
+    """Returns the training data with the examples appended to their commit types."""
+    merged = {commit_type: list(messages) for commit_type, messages in training_data.items()}
+    for commit_type, messages in examples.items():
+        merged.setdefault(commit_type, []).extend(messages)
+    return merged
+
+
+def read_examples(path: str | Path) -> dict[str, list[str]]:
+    """Reads the example log, returning an empty mapping when it does not exist."""
+    examples: dict[str, list[str]] = {}
+    try:
+        with open(path, encoding="utf-8") as log:
+            for line in log:
+                if line.strip():
+                    entry = json.loads(line)
+                    examples.setdefault(entry["commit_type"], []).append(entry["message"])
+    except FileNotFoundError:
+        pass
+    return examples
+
+
+def _log_state(path: str) -> tuple:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return (path, None)
+    return (path, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def current_training_data(refresh: bool = False) -> tuple[str, dict[str, list[str]]]:
+    """
+    Returns the hash and contents of the base training data merged with the
+    example log. The log is checked for changes at most once every
+    `settings.model_reload_interval` seconds unless `refresh` is set.
+    """
+    global _log_signature, _current, _checked_at
+    if (
+        not refresh
+        and _current is not None
+        and time.monotonic() - _checked_at < settings.model_reload_interval
+    ):
+        return _current
+
+    from .artifact import training_data_hash
+
+    with _state_lock:
+        signature = _log_state(settings.training_examples_path)
+        if _current is None or signature != _log_signature:
+            training_data = merge_examples(
+                commit_training_data, read_examples(settings.training_examples_path)
+            )
+            _current = (training_data_hash(training_data), training_data)
+            _log_signature = signature
+        _checked_at = time.monotonic()
+    return _current
+
+
+def add_examples(examples: dict[str, list[str]]) -> "CommitTypeClassifier":
+    """
+    Appends labelled examples to the model without refitting it and publishes
+    the result to every worker. Concurrent updates from separate processes
+    are both recorded; the next reload then fits the combined log once.
+    """
+    from .artifact import artifact_path, load_or_build, prune_artifacts, save_artifact, training_data_hash
+    from .classifier import get_classifier, install_classifier
+
+    examples = {commit_type: messages for commit_type, messages in examples.items() if messages}
+    if not examples:
+        return get_classifier()
+
+    with _update_lock:
+        _, training_data = current_training_data(refresh=True)
+        directory = settings.model_artifact_dir
+        classifier = load_or_build(training_data, directory).with_examples(examples)
+
+        data_hash = training_data_hash(merge_examples(training_data, examples))
+        path = save_artifact(classifier, artifact_path(directory, data_hash), data_hash)
+
+        log_path = Path(settings.training_examples_path)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(
+            json.dumps({"commit_type": commit_type, "message": message}, ensure_ascii=False) + "\n"
+            for commit_type, messages in examples.items()
+            for message in messages
+        )
+        # A single append keeps the entries of one update together on POSIX.
+        with open(log_path, "a", encoding="utf-8") as log:
+            log.write(lines)
+
+        current_hash, _ = current_training_data(refresh=True)
+        if current_hash == data_hash:
+            install_classifier(classifier, data_hash)
+            prune_artifacts(directory, keep=path)
+        else:
+            logger.warning("Training examples were added concurrently; the model is refitted on next use")
+
+    return classifier
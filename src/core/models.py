@@ -2,19 +2,34 @@ from pydantic import BaseModel
 from dataclasses import dataclass
 
 
-class GitHubPayload(BaseModel):
-    """Represents the webhook payload from GitHub."""
-    pusher: dict
-    commits: list
-    
-    
-class Commit(BaseModel):
-    """Represents a commit object from the GitHub payload."""
+@dataclass(slots=True, frozen=True)
+class CommitAuthor:
+    """Represents the author of a commit."""
+    name: str
+    email: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class Commit:
+    """Represents a commit object from the GitHub payload, keeping only the fields in use."""
     id: str
-    author: str
     message: str
-    url: str
     timestamp: str
+    url: str
+    author: CommitAuthor
+
+
+@dataclass(slots=True, frozen=True)
+class Pusher:
+    """Represents the user who pushed the commits."""
+    name: str
+    email: str | None = None
+
+
+class GitHubPayload(BaseModel):
+    """Represents the webhook payload from GitHub. Unknown fields are dropped while parsing."""
+    pusher: Pusher
+    commits: list[Commit]
     
     
 class TelexWebhookPayload(BaseModel):
@@ -25,7 +40,7 @@ class TelexWebhookPayload(BaseModel):
     username: str
     
     
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CommitIssue:
     """Represents an issue found in a commit message."""
     severity: str
@@ -36,4 +51,15 @@ class CommitIssue:
 class TelexTargetPayload(BaseModel):
     """Represents the payload from the Telex-set target_url."""
     message: str
-    settings: list
\ No newline at end of file
+    settings: list
+
+
+class TrainingExample(BaseModel):
+    """Represents a labelled commit message to add to the classifier."""
+    commit_type: str
+    message: str
+
+
+class TrainingExamplesPayload(BaseModel):
+    """Represents a batch of labelled commit messages for the admin API."""
+    examples: list[TrainingExample]
@@ -0,0 +1,65 @@
+from fastapi.routing import APIRouter
+from ..core.models import TrainingExamplesPayload
+from ..core.analyzer.training import add_examples
+from ..config.config import settings
+from ..config.data import commit_types
+from ..utils.profiling import read_profile
+from fastapi import status, HTTPException, Header, Depends, Path
+from fastapi.responses import PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import Annotated
+import hmac
+
+
+router = APIRouter(prefix="/api/v2/admin")
+
+
+def require_admin(authorization: Annotated[str | None, Header()] = None) -> None:
+    """Rejects requests unless the admin API is enabled and the bearer token matches."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin API is disabled")
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token, settings.admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.post("/training-examples", status_code=status.HTTP_200_OK, dependencies=[Depends(require_admin)])
+async def add_training_examples(payload: TrainingExamplesPayload) -> dict:
+    """Adds labelled commit messages to the commit-type classifier without a full refit."""
+    examples: dict[str, list[str]] = {}
+    for example in payload.examples:
+        if example.commit_type not in commit_types:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown commit type: {example.commit_type}",
+            )
+        if not example.message.strip():
+            raise HTTPException(
+                status_code=422,
+                detail="Training messages must not be empty",
+            )
+        examples.setdefault(example.commit_type, []).append(example.message)
+
+    try:
+        classifier = await run_in_threadpool(add_examples, examples)
+    except OSError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Could not persist training examples: {str(e)}",
+        )
+
+    return {"status": "success", "added": len(payload.examples), "training_size": len(classifier.y_train)}
+
+
+@router.get("/profiles/{profile_id}", status_code=status.HTTP_200_OK, dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: Annotated[str, Path(pattern="^[0-9a-f]{32}$")]) -> PlainTextResponse:
+    """Returns the collapsed-stack profile of a request profiled with `X-Profile: 1`."""
+    collapsed = await run_in_threadpool(read_profile, profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(collapsed)
@@ -1,55 +1,423 @@
 from fastapi.routing import APIRouter
-from ..core.models import GitHubPayload, TelexWebhookPayload
+from ..core.models import Commit, CommitIssue, GitHubPayload, Pusher, TelexWebhookPayload
 from typing import Annotated
-from ..core.analyzer.analyzer import CommitAnalyzer
-from ..config.config import settings
-from ..utils.telex_utils import send_payload
+from ..core.analyzer.executor import run_analysis
+from ..config.config import settings, DigestMode, MessageFormat
+from ..core.analyzer.formatter import get_formatter
+from ..utils.telex_utils import get_delivery_manager, send_payloads
+from ..utils.work_queue import WorkQueue, QueueFullError
+from ..utils.dedup import PushDeduplicator, SharedPushDeduplicator
+from ..utils.digest import DigestBuffer
+from ..utils.json_stream import JSONStreamError, ObjectStreamParser, iter_object_members
+from ..utils.metrics import FORMAT_SECONDS, WEBHOOK_PARSE_SECONDS
+from ..utils.profiling import record_stage
 from fastapi.responses import JSONResponse
-from fastapi import status, HTTPException, Query
-import json
+from fastapi.exceptions import RequestValidationError
+from fastapi import status, HTTPException, Query, Header, Request
+from pydantic import TypeAdapter, ValidationError
+from typing import AsyncIterator
+from dataclasses import dataclass
+from time import perf_counter
+import logging
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/github")
 
 
-@router.post("/{telex_channel_id}/", status_code=status.HTTP_200_OK)
+@dataclass(slots=True, frozen=True)
+class NotificationOptions:
+    """Per-channel notification settings: how commits are grouped and which output format is used."""
+    digest: DigestMode = "off"
+    format: MessageFormat = "slack"
+
+
+async def analyze_violations(payload: GitHubPayload) -> list[tuple[Commit, list[CommitIssue]]]:
+    """Analyzes the commits of a push and returns each violating commit with its issues."""
+    commits = payload.commits
+    start = perf_counter()
+    all_violations = await run_analysis([commit.message for commit in commits])
+    record_stage("analysis", perf_counter() - start)
+    return [(commit, violations) for commit, violations in zip(commits, all_violations) if violations]
+
+
+def format_notifications(
+    violations: list[tuple[Commit, list[CommitIssue]]], options: NotificationOptions
+) -> list[tuple[list[Commit], str]]:
+    """
+    Formats violations into notification messages in the channel's format,
+    each with the commits it covers: one message per commit, or digests of up
+    to `settings.digest_max_commits` commits when digest mode is on.
+    """
+    start = perf_counter()
+    formatter = get_formatter(options.format)
+    if options.digest == "off":
+        notifications = [([commit], formatter.format_commit(commit, issues)) for commit, issues in violations]
+    else:
+        size = settings.digest_max_commits
+        if formatter.max_digest_commits is not None:
+            size = min(size, formatter.max_digest_commits)
+        groups = [violations[offset:offset + size] for offset in range(0, len(violations), size)]
+        notifications = [([commit for commit, _ in group], formatter.format_digest(group)) for group in groups]
+    elapsed = perf_counter() - start
+    FORMAT_SECONDS.observe(elapsed, (options.format,))
+    record_stage("format", elapsed)
+    return notifications
+
+
+async def send_notifications(
+    telex_channel_id: str, username: str, notifications: list[tuple[list[Commit], str]]
+) -> tuple[int, list[dict]]:
+    """
+    Sends notifications to the Telex channel. Returns the number of commits
+    notified and the commits whose notification could not be sent.
+    """
+    telex_payloads = [
+        TelexWebhookPayload(
+            event_name="pushed_commits",
+            message=output_message,
+            status="success",
+            username=username,
+        ).model_dump_json()
+        for _, output_message in notifications
+    ]
+
+    telex_url = f"{settings.telex_webhook_url}/{telex_channel_id}"
+    start = perf_counter()
+    errors = await send_payloads(telex_payloads, telex_url)
+    record_stage("delivery", perf_counter() - start)
+    failed = [
+        {"commit_id": commit.id, "error": str(error)}
+        for (commits, _), error in zip(notifications, errors)
+        if error is not None
+        for commit in commits
+    ]
+    return sum(len(commits) for commits, _ in notifications), failed
+
+
+async def process_push(
+    telex_channel_id: str, payload: GitHubPayload, options: NotificationOptions = NotificationOptions()
+) -> tuple[int, list[dict]]:
+    """
+    Analyzes a push and sends Telex notifications for its violating commits,
+    or adds them to the channel's digest window. Returns the number of
+    commits notified and the commits whose notification could not be sent.
+    """
+    violations = await analyze_violations(payload)
+    if options.digest == "window":
+        digest_buffer.add(
+            (telex_channel_id, options.format),
+            [(payload.pusher.name, commit, issues) for commit, issues in violations],
+        )
+        return 0, []
+
+    return await send_notifications(
+        telex_channel_id, payload.pusher.name, format_notifications(violations, options)
+    )
+
+
+async def _flush_digest(
+    key: tuple[str, MessageFormat], entries: list[tuple[str, Commit, list[CommitIssue]]]
+) -> None:
+    """Sends a channel's digest window, releasing failed commits so a redelivery retries them."""
+    telex_channel_id, message_format = key
+    usernames = ", ".join(dict.fromkeys(username for username, _, _ in entries))
+    notifications = format_notifications(
+        [(commit, issues) for _, commit, issues in entries], NotificationOptions("window", message_format)
+    )
+    _, failed = await send_notifications(telex_channel_id, usernames, notifications)
+    if failed:
+        deduplicator.release(None, telex_channel_id, [f["commit_id"] for f in failed])
+        logger.warning("Telex digest sending failed for %d commits: %s", len(failed), failed)
+
+
+digest_buffer = DigestBuffer(_flush_digest, settings.digest_window_seconds, settings.digest_max_commits)
+
+if settings.dedup_path:
+    deduplicator = SharedPushDeduplicator(settings.dedup_path, settings.dedup_window_seconds, settings.dedup_max_entries)
+else:
+    deduplicator = PushDeduplicator(settings.dedup_window_seconds, settings.dedup_max_entries)
+
+
+def _claim_commits(telex_channel_id: str, payload: GitHubPayload) -> GitHubPayload:
+    """Drops commits already processed for this channel."""
+    if not settings.dedup_enabled:
+        return payload
+
+    claimed = deduplicator.claim_commits(telex_channel_id, [commit.id for commit in payload.commits])
+    commits = [commit for commit, is_new in zip(payload.commits, claimed) if is_new]
+    return payload.model_copy(update={"commits": commits})
+
+
+def _claim_push(telex_channel_id: str, payload: GitHubPayload, delivery_id: str | None) -> GitHubPayload | None:
+    """
+    Drops commits already processed for this channel. Returns None when the
+    delivery was seen before or every commit in it is a duplicate.
+    """
+    if settings.dedup_enabled and not deduplicator.claim_delivery(delivery_id):
+        return None
+
+    claimed = _claim_commits(telex_channel_id, payload)
+    if payload.commits and not claimed.commits:
+        return None
+    return claimed
+
+
+async def _deliver_push(
+    telex_channel_id: str, payload: GitHubPayload, delivery_id: str | None, options: NotificationOptions
+) -> tuple[int, list[dict]]:
+    """
+    Processes a claimed push, releasing failed commits so a redelivery retries
+    them. If processing raises, the delivery and every commit are released.
+    """
+    try:
+        attempted, failed = await process_push(telex_channel_id, payload, options)
+    except BaseException:
+        deduplicator.release(delivery_id, telex_channel_id, [commit.id for commit in payload.commits])
+        raise
+    if failed:
+        deduplicator.release(delivery_id, telex_channel_id, [f["commit_id"] for f in failed])
+    return attempted, failed
+
+
+async def _process_queued_push(item: tuple[str, GitHubPayload, str | None, NotificationOptions]) -> None:
+    _, failed = await _deliver_push(*item)
+    if failed:
+        logger.warning("Telex payload sending failed for %d commits: %s", len(failed), failed)
+
+
+push_queue = WorkQueue(
+    _process_queued_push,
+    maxsize=settings.push_queue_size,
+    workers=settings.push_queue_workers,
+)
+
+
+@router.get("/queue", status_code=status.HTTP_200_OK)
+async def push_queue_stats() -> dict:
+    """Returns depth and backpressure counters of the background push queue."""
+    stats = push_queue.stats() | {"deduplication": deduplicator.stats(), "digest": digest_buffer.stats()}
+    if settings.delivery_retries:
+        stats["delivery"] = get_delivery_manager().stats()
+    return stats
+
+
+def _validation_error(e: ValidationError, loc: tuple = ()) -> RequestValidationError:
+    return RequestValidationError([{**error, "loc": ("body", *loc, *error["loc"])} for error in e.errors()])
+
+
+async def _read_payload(request: Request) -> GitHubPayload:
+    """Reads and validates the whole request body."""
+    body = await request.body()
+    start = perf_counter()
+    try:
+        payload = GitHubPayload.model_validate_json(body)
+    except ValidationError as e:
+        raise _validation_error(e)
+    elapsed = perf_counter() - start
+    WEBHOOK_PARSE_SECONDS.observe(elapsed, ("buffered",))
+    record_stage("parse", elapsed)
+    return payload
+
+
+_pusher_adapter = TypeAdapter(Pusher)
+_commit_adapter = TypeAdapter(Commit)
+
+
+def _validate_member(adapter: TypeAdapter, value: object, loc: tuple):
+    try:
+        return adapter.validate_python(value)
+    except ValidationError as e:
+        raise _validation_error(e, loc)
+
+
+async def _stream_payloads(request: Request) -> AsyncIterator[GitHubPayload]:
+    """
+    Parses the request body incrementally and yields the push as payloads of
+    at most `settings.analysis_chunk_size` commits, so memory stays bounded
+    regardless of push size. Members are validated as they arrive, and
+    commits that precede the pusher in the body are held until it is known.
+    """
+    parser = ObjectStreamParser(("commits",), settings.stream_max_value_size)
+    pusher = None
+    commits = []
+    received = 0
+    # Parse time excludes waiting for the body and processing the yielded chunks.
+    validate_seconds = 0.0
+    try:
+        async for key, value in iter_object_members(request.stream(), parser):
+            start = perf_counter()
+            if key == "pusher":
+                pusher = _validate_member(_pusher_adapter, value, ("pusher",))
+            elif key == "commits":
+                commits.append(_validate_member(_commit_adapter, value, ("commits", received)))
+                received += 1
+            validate_seconds += perf_counter() - start
+
+            if pusher is not None and len(commits) >= settings.analysis_chunk_size:
+                yield GitHubPayload.model_construct(pusher=pusher, commits=commits)
+                commits = []
+    except JSONStreamError as e:
+        raise RequestValidationError([{"type": "json_invalid", "loc": ("body",), "msg": str(e), "input": {}}])
+
+    missing = [key for key in ("pusher", "commits") if key not in parser.seen_keys]
+    if missing:
+        raise RequestValidationError(
+            [{"type": "missing", "loc": ("body", key), "msg": "Field required", "input": None} for key in missing]
+        )
+    WEBHOOK_PARSE_SECONDS.observe(parser.parse_seconds + validate_seconds, ("streaming",))
+    record_stage("parse", parser.parse_seconds + validate_seconds)
+    if commits:
+        yield GitHubPayload.model_construct(pusher=pusher, commits=commits)
+
+
+def _delivery_response(attempted: int, failed: list[dict]) -> JSONResponse:
+    if failed and len(failed) == attempted:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Telex payload sending failed: {failed[0]['error']}",
+        )
+    if failed:
+        return JSONResponse(
+            content={"status": "partial_failure", "sent": attempted - len(failed), "failed": failed},
+            status_code=status.HTTP_207_MULTI_STATUS,
+        )
+
+    return JSONResponse(content={"status": "success"})
+
+
+async def _stream_webhook(
+    telex_channel_id: str,
+    request: Request,
+    is_test: bool,
+    delivery_id: str | None,
+    options: NotificationOptions,
+) -> JSONResponse:
+    """
+    Streaming counterpart of `github_webhook`: each chunk of commits is
+    claimed, analyzed and delivered, or queued, while the rest of the body is
+    still being read. Push digests cover one chunk each.
+    """
+    if is_test:
+        all_messages = []
+        async for payload in _stream_payloads(request):
+            notifications = format_notifications(await analyze_violations(payload), options)
+            all_messages.extend(output_message for _, output_message in notifications)
+        return JSONResponse(content=all_messages, status_code=status.HTTP_200_OK)
+
+    if settings.dedup_enabled and not deduplicator.claim_delivery(delivery_id):
+        return JSONResponse(content={"status": "duplicate"}, status_code=status.HTTP_200_OK)
+
+    received = claimed = attempted = 0
+    failed = []
+    try:
+        async for payload in _stream_payloads(request):
+            received += len(payload.commits)
+            payload = _claim_commits(telex_channel_id, payload)
+            if not payload.commits:
+                continue
+            claimed += len(payload.commits)
+
+            if not settings.async_processing:
+                chunk_attempted, chunk_failed = await _deliver_push(
+                    telex_channel_id, payload, delivery_id, options
+                )
+                attempted += chunk_attempted
+                failed.extend(chunk_failed)
+                continue
+
+            try:
+                push_queue.put_nowait((telex_channel_id, payload, delivery_id, options))
+            except QueueFullError as e:
+                # Chunks queued so far stay claimed, so a redelivery only retries the rest.
+                deduplicator.release(
+                    delivery_id, telex_channel_id, [commit.id for commit in payload.commits]
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=str(e),
+                    headers={"Retry-After": "5"},
+                )
+    except BaseException:
+        # Chunks delivered so far stay claimed; failed ones were released by `_deliver_push`.
+        deduplicator.release(delivery_id, telex_channel_id, [])
+        raise
+
+    if received and not claimed:
+        return JSONResponse(content={"status": "duplicate"}, status_code=status.HTTP_200_OK)
+    if settings.async_processing:
+        return JSONResponse(content={"status": "accepted"}, status_code=status.HTTP_202_ACCEPTED)
+    return _delivery_response(attempted, failed)
+
+
+def _inline_schema(schema: dict) -> dict:
+    """Resolves the local `$defs` references of a JSON schema so it can be embedded in OpenAPI."""
+    definitions = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+
+    return resolve(schema)
+
+
+@router.post(
+    "/{telex_channel_id}/",
+    status_code=status.HTTP_200_OK,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _inline_schema(GitHubPayload.model_json_schema())}},
+        }
+    },
+)
 async def github_webhook(
     telex_channel_id: str,
-    payload: GitHubPayload,
+    request: Request,
     is_test: Annotated[str | None, Query()] = None,
+    digest: Annotated[DigestMode | None, Query()] = None,
+    format: Annotated[MessageFormat | None, Query()] = None,
+    x_github_delivery: Annotated[str | None, Header()] = None,
 ):
     """
     Endpoint to receive GitHub webhook events, analyze commit messages and
-    send results to Telex if issues are found.
+    send results to Telex if issues are found. `digest` and `format`
+    override `settings.digest_mode` and `settings.message_format` for the
+    channel.
     """
-    analyzer = CommitAnalyzer()
-    commits = payload.commits
-    all_messages = []  # Accumulate messages for test mode
-
-    for commit in commits:
-        violations = analyzer.analyze_commit(commit["message"])
-        if violations:
-            output_message = analyzer.format_analysis(commit, violations)
-            if is_test == "true":
-                all_messages.append(output_message)
-            else:
-                telex_payload = TelexWebhookPayload(
-                    event_name="pushed_commits",
-                    message=output_message,
-                    status="success",
-                    username=payload.pusher["name"],
-                ).model_dump_json()
-
-                telex_url = f"{settings.telex_webhook_url}/{telex_channel_id}"
-
-                try:
-                    await send_payload(telex_payload, telex_url)
-                except Exception as e:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Telex payload sending failed: {str(e)}",
-                    )
+    options = NotificationOptions(digest or settings.digest_mode, format or settings.message_format)
+    if settings.github_streaming:
+        return await _stream_webhook(telex_channel_id, request, is_test == "true", x_github_delivery, options)
+
+    payload = await _read_payload(request)
     if is_test == "true":
+        notifications = format_notifications(await analyze_violations(payload), options)
+        all_messages = [output_message for _, output_message in notifications]
         return JSONResponse(content=all_messages, status_code=status.HTTP_200_OK)
 
-    return JSONResponse(content={"status": "success"})
+    payload = _claim_push(telex_channel_id, payload, x_github_delivery)
+    if payload is None:
+        return JSONResponse(content={"status": "duplicate"}, status_code=status.HTTP_200_OK)
+
+    if settings.async_processing:
+        try:
+            push_queue.put_nowait((telex_channel_id, payload, x_github_delivery, options))
+        except QueueFullError as e:
+            deduplicator.release(
+                x_github_delivery, telex_channel_id, [commit.id for commit in payload.commits]
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "5"},
+            )
+        return JSONResponse(content={"status": "accepted"}, status_code=status.HTTP_202_ACCEPTED)
+
+    attempted, failed = await _deliver_push(telex_channel_id, payload, x_github_delivery, options)
+    return _delivery_response(attempted, failed)
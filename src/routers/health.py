@@ -0,0 +1,23 @@
+from fastapi.routing import APIRouter
+from fastapi.responses import JSONResponse
+from fastapi import status
+from ..config.config import settings
+from ..core.analyzer.executor import analyzer_state
+
+
+router = APIRouter()
+
+
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def readiness() -> JSONResponse:
+    """
+    Reports whether the app is ready for pushes: with `settings.analyzer_warmup`,
+    only once the ML stack has been loaded in the background. Without it,
+    the ML stack loads on the first push and the app is always ready.
+    """
+    state = analyzer_state()
+    ready = state == "warm" or not settings.analyzer_warmup
+    return JSONResponse(
+        content={"status": "ready" if ready else "starting", "analyzer": state},
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
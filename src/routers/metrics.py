@@ -0,0 +1,44 @@
+from fastapi.routing import APIRouter
+from fastapi.responses import PlainTextResponse
+from fastapi import status
+from fastapi.concurrency import run_in_threadpool
+from ..config.config import settings
+from ..utils.metrics import REGISTRY
+from ..utils.telex_utils import get_delivery_manager
+from .github import push_queue, digest_buffer
+from .telex import slack_relay
+
+
+router = APIRouter()
+
+REGISTRY.gauge_callback(
+    "push_queue_depth", "Pushes waiting in the background queue.", lambda: push_queue.stats()["depth"]
+)
+REGISTRY.gauge_callback(
+    "digest_pending_commits", "Violating commits waiting in digest windows.",
+    lambda: digest_buffer.stats()["pending_items"],
+)
+REGISTRY.gauge_callback(
+    "slack_relay_queue_depth", "Messages queued for coalesced Slack posts.",
+    lambda: slack_relay.stats()["queue_depth"],
+)
+REGISTRY.gauge_callback(
+    "delivery_spool_pending", "Notifications waiting in the retry spool.",
+    lambda: get_delivery_manager().spool.counts()["pending"] if settings.delivery_retries else 0,
+    # Every worker reads the same spool, so its count is not summed across them.
+    shared=True,
+)
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK, response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Returns pipeline metrics in the Prometheus text format, summed over every
+    process sharing `settings.metrics_dir`.
+    """
+    snapshots = []
+    if settings.metrics_dir:
+        snapshots = await run_in_threadpool(
+            REGISTRY.read_snapshots, settings.metrics_dir, 3 * settings.metrics_snapshot_interval
+        )
+    return PlainTextResponse(REGISTRY.render(snapshots), media_type="text/plain; version=0.0.4; charset=utf-8")
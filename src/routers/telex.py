@@ -1,10 +1,15 @@
 from fastapi.routing import APIRouter
 from ..core.models import TelexTargetPayload
-from ..config.integration_config import generate_json_config
-from fastapi.responses import JSONResponse
-from fastapi import status, HTTPException, Query
+from ..config.integration_config import PreparedConfig, get_prepared_config
+from fastapi.responses import JSONResponse, Response
+from fastapi import status, HTTPException, Query, Request
+from email.utils import parsedate_to_datetime
 from typing import Annotated
-from ..utils.telex_utils import send_payload
+from ..utils.telex_utils import deliver_payload
+from ..utils.rate_limit import CoalescingRelay
+from ..utils.profiling import record_stage
+from ..config.config import settings
+from time import perf_counter
 import textwrap, json
 
 
@@ -12,11 +17,45 @@ router = APIRouter(prefix="/telex")
 telex_json_router = APIRouter()
 
 
+def _parse_blocks(text: str) -> list | None:
+    """Returns the blocks of a Block Kit message, as sent with `?format=blocks`, or None for text."""
+    if not text.lstrip().startswith("{"):
+        return None
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return None
+    blocks = message.get("blocks") if isinstance(message, dict) else None
+    return blocks if isinstance(blocks, list) else None
+
+
+async def _send_to_slack(text: str, slack_url: str) -> None:
+    blocks = _parse_blocks(text)
+    payload = {"text": text} if blocks is None else {"blocks": blocks}
+    await deliver_payload(json.dumps(payload), slack_url)
+
+
+slack_relay = CoalescingRelay(
+    _send_to_slack,
+    rate=settings.slack_rate_limit,
+    burst=settings.slack_rate_burst,
+    max_pending=settings.slack_max_pending,
+    max_batch_chars=settings.slack_max_batch_chars,
+    # Joining Block Kit JSON with the separator would no longer parse.
+    can_coalesce=lambda text: _parse_blocks(text) is None,
+    bucket_path=settings.slack_rate_limit_path,
+)
+
+
 @router.post("/", status_code=status.HTTP_200_OK)
 async def telex_webhook(
     payload: TelexTargetPayload, is_test: Annotated[str | None, Query()] = None
 ):
-    """Handle incoming webhook from Telex and send results to Slack if webhook is provided."""
+    """
+    Handle incoming webhook from Telex and send results to Slack if webhook is provided.
+    Messages above `settings.slack_rate_limit` are queued and coalesced into
+    later posts, and acknowledged with `202 Accepted`.
+    """
     dedented_message = textwrap.dedent(payload.message)
     commit_message = {"text": dedented_message}
 
@@ -26,8 +65,16 @@ async def telex_webhook(
 
         if is_test == "true":
             return JSONResponse(content=commit_message["text"], status_code=status.HTTP_200_OK)
+
+        start = perf_counter()
+        if settings.slack_rate_limit <= 0:
+            await _send_to_slack(commit_message["text"], slack_url)
+            sent = True
         else:
-            await send_payload(json.dumps(commit_message), slack_url)
+            sent = await slack_relay.submit(commit_message["text"], slack_url)
+        record_stage("delivery", perf_counter() - start)
+        if not sent:
+            return JSONResponse(content={"status": "queued"}, status_code=status.HTTP_202_ACCEPTED)
 
     except Exception as e:
         raise HTTPException(
@@ -36,15 +83,48 @@ async def telex_webhook(
         )
 
 
+@router.get("/relay", status_code=status.HTTP_200_OK)
+async def slack_relay_stats() -> dict:
+    """Returns queue depth, coalescing and drop counters of the Slack relay."""
+    return slack_relay.stats()
+
+
+def _not_modified(request: Request, config: PreparedConfig) -> bool:
+    """Evaluates If-None-Match, or If-Modified-Since without it, against the prepared config."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison: validators match whatever their W/ prefix.
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or config.etag.removeprefix("W/") in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        return config.last_modified <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
 @telex_json_router.get("/integration.json", status_code=status.HTTP_200_OK)
-async def get_integration_config() -> dict:
-    """Endpoint to retrieve integration settings for Telex."""
+async def get_integration_config(request: Request) -> Response:
+    """
+    Endpoint to retrieve integration settings for Telex. The body is prebuilt
+    and revalidated with its ETag or Last-Modified date, so unchanged polls
+    are answered with 304 Not Modified.
+    """
     try:
-        json_data = generate_json_config()
+        config = get_prepared_config()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Error retrieving config data: {str(e)}",
         )
 
-    return json_data
+    headers = {
+        "etag": config.etag,
+        "last-modified": config.last_modified_header,
+        "cache-control": "no-cache",
+    }
+    if _not_modified(request, config):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(config.body, media_type="application/json", headers=headers)
@@ -0,0 +1,157 @@
+from .ttl_cache import TTLCache
+from pathlib import Path
+import threading
+import sqlite3
+import time
+
+
+class PushDeduplicator:
+    """
+    Remembers recently processed GitHub delivery IDs and commit IDs within a
+    time window, so retried deliveries and commits that reappear in later
+    pushes are neither re-analyzed nor re-notified.
+    """
+    def __init__(self, window: float, maxsize: int) -> None:
+        self._deliveries = TTLCache(maxsize, window)
+        self._commits = TTLCache(maxsize, window)
+        self.duplicate_deliveries = 0
+        self.duplicate_commits = 0
+
+    def claim_delivery(self, delivery_id: str | None) -> bool:
+        """Marks a delivery as seen. Returns False if it was already processed."""
+        if not delivery_id:
+            return True
+        if self._deliveries.add(delivery_id):
+            return True
+        self.duplicate_deliveries += 1
+        return False
+
+    def claim_commit(self, scope: str, commit_id: str | None) -> bool:
+        """Marks a commit as seen for a destination. Returns False if it was already processed."""
+        if not commit_id:
+            return True
+        if self._commits.add((scope, commit_id)):
+            return True
+        self.duplicate_commits += 1
+        return False
+
+    def claim_commits(self, scope: str, commit_ids: list[str | None]) -> list[bool]:
+        """Marks commits as seen for a destination, returning for each whether it was newly claimed."""
+        return [self.claim_commit(scope, commit_id) for commit_id in commit_ids]
+
+    def release(self, delivery_id: str | None, scope: str, commit_ids: list[str]) -> None:
+        """Forgets a delivery and commits so that a later retry processes them again."""
+        if delivery_id:
+            self._deliveries.discard(delivery_id)
+        for commit_id in commit_ids:
+            self._commits.discard((scope, commit_id))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "tracked_deliveries": len(self._deliveries),
+            "tracked_commits": len(self._commits),
+            "duplicate_deliveries": self.duplicate_deliveries,
+            "duplicate_commits": self.duplicate_commits,
+        }
+
+
+class SharedPushDeduplicator(PushDeduplicator):
+    """
+    `PushDeduplicator` whose claims are kept in a SQLite database shared by
+    every worker process on the host, so a redelivery is recognized whichever
+    worker receives it. A claim is a single upsert that only succeeds when no
+    unexpired claim exists, so two workers never both claim the same ID.
+    Expired claims are pruned, and the oldest ones once the table holds more
+    than `maxsize` claims of a kind.
+    """
+    PRUNE_INTERVAL = 100  # Claims between prunes
+
+    def __init__(self, path: str | Path, window: float, maxsize: int) -> None:
+        self.path = Path(path)
+        self.window = window
+        self.maxsize = maxsize
+        self.duplicate_deliveries = 0
+        self.duplicate_commits = 0
+        self._local = threading.local()
+        self._claims = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS dedup_claims (kind TEXT NOT NULL, scope TEXT NOT NULL, "
+            "id TEXT NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (kind, scope, id))"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _claim(self, connection: sqlite3.Connection, kind: str, scope: str, claim_id: str, now: float) -> bool:
+        cursor = connection.execute(
+            "INSERT INTO dedup_claims VALUES (?, ?, ?, ?) ON CONFLICT (kind, scope, id) "
+            "DO UPDATE SET expires_at = excluded.expires_at WHERE dedup_claims.expires_at <= ?",
+            (kind, scope, claim_id, now + self.window, now),
+        )
+        self._claims += 1
+        if self._claims % self.PRUNE_INTERVAL == 0:
+            self._prune(connection, now)
+        return cursor.rowcount == 1
+
+    def _prune(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM dedup_claims WHERE expires_at <= ?", (now,))
+        for kind in ("delivery", "commit"):
+            connection.execute(
+                "DELETE FROM dedup_claims WHERE rowid IN (SELECT rowid FROM dedup_claims WHERE kind = ? "
+                "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                (kind, self.maxsize),
+            )
+
+    def claim_delivery(self, delivery_id: str | None) -> bool:
+        if not delivery_id:
+            return True
+        if self._claim(self._connection(), "delivery", "", delivery_id, time.time()):
+            return True
+        self.duplicate_deliveries += 1
+        return False
+
+    def claim_commit(self, scope: str, commit_id: str | None) -> bool:
+        return self.claim_commits(scope, [commit_id])[0]
+
+    def claim_commits(self, scope: str, commit_ids: list[str | None]) -> list[bool]:
+        connection = self._connection()
+        now = time.time()
+        # One transaction for the whole batch instead of one per commit.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            claimed = [
+                not commit_id or self._claim(connection, "commit", scope, commit_id, now)
+                for commit_id in commit_ids
+            ]
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self.duplicate_commits += claimed.count(False)
+        return claimed
+
+    def release(self, delivery_id: str | None, scope: str, commit_ids: list[str]) -> None:
+        keys = [("commit", scope, commit_id) for commit_id in commit_ids]
+        if delivery_id:
+            keys.append(("delivery", "", delivery_id))
+        self._connection().executemany("DELETE FROM dedup_claims WHERE kind = ? AND scope = ? AND id = ?", keys)
+
+    def stats(self) -> dict[str, int]:
+        counts = dict(
+            self._connection().execute(
+                "SELECT kind, COUNT(*) FROM dedup_claims WHERE expires_at > ? GROUP BY kind", (time.time(),)
+            ).fetchall()
+        )
+        return {
+            "tracked_deliveries": counts.get("delivery", 0),
+            "tracked_commits": counts.get("commit", 0),
+            "duplicate_deliveries": self.duplicate_deliveries,
+            "duplicate_commits": self.duplicate_commits,
+        }
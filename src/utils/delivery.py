@@ -0,0 +1,354 @@
+"""
+Reliable delivery of outbound notifications.
+
+A notification is sent right away when its destination is healthy. If the
+send fails, or the destination's circuit breaker is open, it is written to a
+SQLite spool and retried in the background with jittered exponential
+backoff, so notifications survive outages and restarts. Destinations are
+identified by URL origin, so one unreachable host does not hold back the
+others.
+"""
+from pathlib import Path
+from typing import Awaitable, Callable, NamedTuple
+from urllib.parse import urlsplit
+import threading
+import asyncio
+import logging
+import sqlite3
+import random
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Full-jitter backoff: a random delay up to `base * 2**attempt`, capped at `maximum`."""
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+
+def destination(url: str) -> str:
+    """Returns the origin of a URL, which shares a retry queue and circuit breaker."""
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class CircuitBreaker:
+    """
+    Stops sending to a destination after `failure_threshold` consecutive
+    failures. Once `reset_timeout` seconds have passed a single probe is let
+    through, and its outcome closes or reopens the circuit.
+    """
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a probe through."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Returns whether a request may be sent now, claiming the probe when half open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class SpooledDelivery(NamedTuple):
+    id: int
+    url: str
+    payload: str
+    attempts: int
+    leased_until: float
+
+
+class DeliverySpool:
+    """
+    Durable SQLite queue of notifications awaiting retry, shared by every
+    worker process on the host. Due entries are leased in batches, and each
+    lease is renewed right before its entry is sent, so two workers never
+    retry the same notification at once however long a batch takes. Entries that
+    run out of attempts are kept as dead letters for inspection.
+    """
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS deliveries (id INTEGER PRIMARY KEY, url TEXT NOT NULL, "
+                "payload TEXT NOT NULL, attempts INTEGER NOT NULL, next_attempt_at REAL NOT NULL, "
+                "last_error TEXT, dead INTEGER NOT NULL DEFAULT 0)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS deliveries_due ON deliveries (dead, next_attempt_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def add(self, url: str, payload: str, attempts: int, next_attempt_at: float, error: str) -> int:
+        """Spools a notification for retry at `next_attempt_at` (a Unix timestamp)."""
+        cursor = self._connection().execute(
+            "INSERT INTO deliveries (url, payload, attempts, next_attempt_at, last_error) VALUES (?, ?, ?, ?, ?)",
+            (url, payload, attempts, next_attempt_at, error),
+        )
+        return cursor.lastrowid
+
+    def lease_due(self, now: float, lease: float, limit: int) -> list[SpooledDelivery]:
+        """
+        Returns up to `limit` entries due for retry, oldest first, and pushes
+        their next attempt back by `lease` seconds in case this process dies
+        before rescheduling them.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            rows = connection.execute(
+                "SELECT id, url, payload, attempts FROM deliveries "
+                "WHERE dead = 0 AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE deliveries SET next_attempt_at = ? WHERE id = ?", [(now + lease, row[0]) for row in rows]
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return [SpooledDelivery(*row, now + lease) for row in rows]
+
+    def renew_lease(self, delivery: SpooledDelivery, leased_until: float) -> SpooledDelivery | None:
+        """
+        Extends the lease of an entry to `leased_until`, returning the renewed
+        entry, or None if its lease expired and another process leased it.
+        """
+        cursor = self._connection().execute(
+            "UPDATE deliveries SET next_attempt_at = ? WHERE id = ? AND dead = 0 AND next_attempt_at = ?",
+            (leased_until, delivery.id, delivery.leased_until),
+        )
+        return delivery._replace(leased_until=leased_until) if cursor.rowcount == 1 else None
+
+    def reschedule(self, delivery_id: int, attempts: int, next_attempt_at: float, error: str | None) -> None:
+        self._connection().execute(
+            "UPDATE deliveries SET attempts = ?, next_attempt_at = ?, last_error = COALESCE(?, last_error) "
+            "WHERE id = ?",
+            (attempts, next_attempt_at, error, delivery_id),
+        )
+
+    def mark_dead(self, delivery_id: int, attempts: int, error: str) -> None:
+        self._connection().execute(
+            "UPDATE deliveries SET dead = 1, attempts = ?, last_error = ? WHERE id = ?",
+            (attempts, error, delivery_id),
+        )
+
+    def remove(self, delivery_id: int) -> None:
+        self._connection().execute("DELETE FROM deliveries WHERE id = ?", (delivery_id,))
+
+    def counts(self) -> dict[str, int]:
+        """Returns the number of pending and dead entries."""
+        pending, dead = self._connection().execute(
+            "SELECT COUNT(*) - COALESCE(SUM(dead), 0), COALESCE(SUM(dead), 0) FROM deliveries"
+        ).fetchone()
+        return {"pending": pending, "dead": dead}
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class DeliveryManager:
+    """
+    Sends notifications through `send`, spooling failed ones and retrying
+    them from a background task on the running event loop. `is_permanent`
+    identifies errors a retry cannot fix, which are reported to the caller
+    instead of spooled.
+    """
+    def __init__(
+        self,
+        spool: DeliverySpool,
+        send: Callable[[str, str], Awaitable[object]],
+        *,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        failure_threshold: int,
+        reset_timeout: float,
+        poll_interval: float,
+        lease: float,
+        batch_size: int = 100,
+        is_permanent: Callable[[Exception], bool] = lambda error: False,
+    ) -> None:
+        self.spool = spool
+        self.send = send
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.batch_size = batch_size
+        self.is_permanent = is_permanent
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._task: asyncio.Task | None = None
+        self.sent = 0
+        self.spooled = 0
+        self.retried = 0
+        self.dead = 0
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        key = destination(url)
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = self.breakers[key] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def start(self) -> None:
+        """Starts the retry task on the running event loop, if it is not running already."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the retry task. Spooled notifications are retried after the next start."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def deliver(self, payload: str, url: str) -> bool:
+        """
+        Sends a notification, spooling it for retry if the send fails or the
+        destination's circuit is open. Returns whether it was sent now;
+        raises only for permanent errors.
+        """
+        self.start()
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            self._spool(url, payload, 0, breaker.retry_after, "Circuit open")
+            return False
+
+        try:
+            await self.send(payload, url)
+        except Exception as e:
+            if self.is_permanent(e):
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            self._spool(url, payload, 1, backoff_delay(0, self.backoff_base, self.backoff_max), str(e))
+            return False
+
+        breaker.record_success()
+        self.sent += 1
+        return True
+
+    def _spool(self, url: str, payload: str, attempts: int, delay: float, error: str) -> None:
+        self.spool.add(url, payload, attempts, time.time() + delay, error)
+        self.spooled += 1
+        logger.warning("Notification to %s spooled for retry: %s", destination(url), error)
+
+    async def retry_due(self) -> int:
+        """Retries the spooled notifications that are due and returns how many were sent."""
+        due = self.spool.lease_due(time.time(), self.lease, self.batch_size)
+        queues: dict[str, list[SpooledDelivery]] = {}
+        for delivery in due:
+            queues.setdefault(destination(delivery.url), []).append(delivery)
+
+        # Destinations are retried concurrently, each in order, so an open circuit stops its queue.
+        results = await asyncio.gather(*(self._retry_queue(queue) for queue in queues.values()))
+        return sum(results)
+
+    async def _retry_queue(self, queue: list[SpooledDelivery]) -> int:
+        sent = 0
+        for delivery in queue:
+            # Earlier sends may have outlasted the batch's lease; renewing it fails
+            # if another worker has since leased the entry.
+            delivery = self.spool.renew_lease(delivery, time.time() + self.lease)
+            if delivery is None:
+                continue
+
+            breaker = self.breaker(delivery.url)
+            if not breaker.allow():
+                self.spool.reschedule(delivery.id, delivery.attempts, time.time() + breaker.retry_after, None)
+                continue
+
+            self.retried += 1
+            attempts = delivery.attempts + 1
+            try:
+                await self.send(delivery.payload, delivery.url)
+            except Exception as e:
+                permanent = self.is_permanent(e)
+                if permanent:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+                if permanent or attempts >= self.max_attempts:
+                    self.spool.mark_dead(delivery.id, attempts, str(e))
+                    self.dead += 1
+                    logger.error("Notification to %s dropped after %d attempts: %s", destination(delivery.url), attempts, e)
+                else:
+                    delay = backoff_delay(attempts - 1, self.backoff_base, self.backoff_max)
+                    self.spool.reschedule(delivery.id, attempts, time.time() + delay, str(e))
+                continue
+
+            breaker.record_success()
+            self.spool.remove(delivery.id)
+            self.sent += 1
+            sent += 1
+        return sent
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.retry_due()
+            except Exception:
+                logger.exception("Notification retry failed")
+            await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> dict:
+        """Returns spool sizes, delivery counters and the state of every open circuit."""
+        return self.spool.counts() | {
+            "sent": self.sent,
+            "spooled": self.spooled,
+            "retried": self.retried,
+            "dead_lettered": self.dead,
+            "circuits": {key: breaker.state for key, breaker in self.breakers.items() if breaker.state != "closed"},
+        }
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable
+
+
+logger = logging.getLogger(__name__)
+
+
+class DigestBuffer:
+    """
+    Collects items per key and hands each key's batch to `flush` once
+    `window` seconds have passed since its first item, or as soon as the
+    batch reaches `max_items`.
+
+    Timers run on the event loop that added the items; `drain` flushes every
+    pending batch at shutdown.
+    """
+    def __init__(
+        self,
+        flush: Callable[[Hashable, list[Any]], Awaitable[Any]],
+        window: float,
+        max_items: int,
+    ) -> None:
+        self.flush = flush
+        self.window = window
+        self.max_items = max_items
+        self._pending: dict[Hashable, list[Any]] = {}
+        self._timers: dict[Hashable, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.flushed_batches = 0
+        self.flushed_items = 0
+
+    def add(self, key: Hashable, items: list[Any]) -> None:
+        """Adds items to the batch for `key`, flushing it when it is full."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Timers of a previous loop never fire; reschedule the pending batches.
+            self._loop = loop
+            self._timers = {
+                pending_key: loop.call_later(self.window, self._flush_key, pending_key)
+                for pending_key in self._pending
+            }
+
+        batch = self._pending.setdefault(key, [])
+        batch.extend(items)
+        while len(batch) >= self.max_items:
+            self._start_flush(key, batch[:self.max_items])
+            del batch[:self.max_items]
+
+        if not batch:
+            self._flush_key(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.window, self._flush_key, key)
+
+    def _flush_key(self, key: Hashable) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if batch:
+            self._start_flush(key, batch)
+
+    def _start_flush(self, key: Hashable, batch: list[Any]) -> None:
+        task = self._loop.create_task(self._run_flush(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_flush(self, key: Hashable, batch: list[Any]) -> None:
+        try:
+            await self.flush(key, batch)
+        except Exception:
+            logger.exception("Digest flush failed for %s", key)
+        self.flushed_batches += 1
+        self.flushed_items += len(batch)
+
+    async def drain(self, timeout: float) -> None:
+        """Flushes every pending batch and waits up to `timeout` seconds for the flushes to finish."""
+        if self._loop is not asyncio.get_running_loop():
+            self._loop = asyncio.get_running_loop()
+            self._timers = {}
+        for key in list(self._pending):
+            self._flush_key(key)
+
+        if self._tasks:
+            _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+            if pending:
+                logger.warning("Digest drain timed out with %d flushes pending", len(pending))
+
+    def stats(self) -> dict[str, int]:
+        """Returns pending and flushed counters."""
+        return {
+            "pending_keys": len(self._pending),
+            "pending_items": sum(len(batch) for batch in self._pending.values()),
+            "flushed_batches": self.flushed_batches,
+            "flushed_items": self.flushed_items,
+        }
@@ -0,0 +1,161 @@
+"""
+Incremental parsing of a JSON object whose body arrives in chunks.
+
+Top-level members are decoded one at a time as soon as they are complete,
+and members holding large arrays can be emitted element by element, so the
+parser never holds more than one value of the document in memory.
+"""
+from time import perf_counter
+from typing import Any, AsyncIterator, Iterable
+import codecs
+import json
+import re
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+_START, _FIRST_KEY, _KEY, _COLON, _VALUE, _FIRST_ELEMENT, _ELEMENT, _AFTER_ELEMENT, _AFTER_MEMBER, _DONE = range(10)
+
+
+class JSONStreamError(ValueError):
+    """Raised when a streamed document is malformed or a single value exceeds the size limit."""
+
+
+class ObjectStreamParser:
+    """
+    Push parser for a single JSON object. `feed` returns the `(key, value)`
+    members completed by a chunk; members named in `stream_keys` must be
+    arrays and yield one `(key, element)` pair per element instead.
+    """
+    def __init__(self, stream_keys: Iterable[str] = (), max_value_size: int = 1 << 20) -> None:
+        self.stream_keys = frozenset(stream_keys)
+        self.max_value_size = max_value_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._key: str | None = None
+        self._final = False
+        self.seen_keys: set[str] = set()
+        self.parse_seconds = 0.0  # Total time spent in `feed`
+
+    def feed(self, text: str) -> list[tuple[str, Any]]:
+        """Parses the next chunk of the document and returns the members it completed."""
+        start = perf_counter()
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        events: list[tuple[str, Any]] = []
+        try:
+            self._parse(events)
+        finally:
+            self.parse_seconds += perf_counter() - start
+        return events
+
+    def close(self) -> list[tuple[str, Any]]:
+        """Parses what remains of the document, raising if it is incomplete."""
+        self._final = True
+        events = self.feed("")
+        if self._state != _DONE:
+            raise JSONStreamError("Unexpected end of JSON document")
+        return events
+
+    def _decode(self) -> tuple[Any, bool]:
+        """
+        Decodes the value at the current position. Returns `(value, True)` on
+        success and `(None, False)` when the value may continue in the next chunk.
+        """
+        buffer, pos = self._buffer, self._pos
+        try:
+            value, end = self._decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if self._final:
+                raise JSONStreamError(f"Malformed JSON document: {e.msg}") from None
+            end = None
+
+        # A value touching the end of the buffer may be a truncated number.
+        if end is None or (end == len(buffer) and not self._final):
+            if len(buffer) - pos > self.max_value_size:
+                raise JSONStreamError(f"JSON value exceeds {self.max_value_size} characters")
+            return None, False
+
+        self._pos = end
+        return value, True
+
+    def _expect(self, char: str) -> None:
+        found = self._buffer[self._pos]
+        if found not in char:
+            raise JSONStreamError(f"Expected {' or '.join(repr(c) for c in char)} at {found!r}")
+
+    def _parse(self, events: list[tuple[str, Any]]) -> None:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos == len(self._buffer):
+                return
+
+            state, char = self._state, self._buffer[self._pos]
+            if state == _START:
+                self._expect("{")
+                self._pos += 1
+                self._state = _FIRST_KEY
+            elif state in (_FIRST_KEY, _KEY):
+                if state == _FIRST_KEY and char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                self._expect('"')
+                key, complete = self._decode()
+                if not complete:
+                    return
+                self._key = key
+                self.seen_keys.add(key)
+                self._state = _COLON
+            elif state == _COLON:
+                self._expect(":")
+                self._pos += 1
+                self._state = _VALUE
+            elif state == _VALUE:
+                if self._key in self.stream_keys:
+                    self._expect("[")
+                    self._pos += 1
+                    self._state = _FIRST_ELEMENT
+                    continue
+                value, complete = self._decode()
+                if not complete:
+                    return
+                events.append((self._key, value))
+                self._state = _AFTER_MEMBER
+            elif state in (_FIRST_ELEMENT, _ELEMENT):
+                if state == _FIRST_ELEMENT and char == "]":
+                    self._pos += 1
+                    self._state = _AFTER_MEMBER
+                    continue
+                value, complete = self._decode()
+                if not complete:
+                    return
+                events.append((self._key, value))
+                self._state = _AFTER_ELEMENT
+            elif state == _AFTER_ELEMENT:
+                self._expect(",]")
+                self._pos += 1
+                self._state = _ELEMENT if char == "," else _AFTER_MEMBER
+            elif state == _AFTER_MEMBER:
+                self._expect(",}")
+                self._pos += 1
+                self._state = _KEY if char == "," else _DONE
+            else:
+                raise JSONStreamError(f"Unexpected data after JSON document: {char!r}")
+
+
+async def iter_object_members(
+    chunks: AsyncIterator[bytes], parser: ObjectStreamParser
+) -> AsyncIterator[tuple[str, Any]]:
+    """Yields the members of a UTF-8 encoded JSON object as its byte chunks arrive."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        async for chunk in chunks:
+            for event in parser.feed(decoder.decode(chunk)):
+                yield event
+        for event in parser.feed(decoder.decode(b"", final=True)) + parser.close():
+            yield event
+    except UnicodeDecodeError as e:
+        raise JSONStreamError(f"Invalid UTF-8 in JSON document: {e}") from None
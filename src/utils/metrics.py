@@ -0,0 +1,383 @@
+"""
+Minimal in-process metrics in the Prometheus text exposition format.
+
+Metrics are plain counters and fixed-bucket histograms keyed by label
+values, updated under a per-metric lock, so recording costs a dict lookup
+and a bisect. Values computed at scrape time, such as queue depths, are
+registered as callbacks.
+
+When several processes serve the app, each writes a snapshot of its metrics
+to a shared directory every few seconds, and a scrape of any process sums
+its own values with the other processes' snapshots.
+"""
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Iterable
+import threading
+import atexit
+import json
+import math
+import os
+import time
+
+
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class holding the name, help text and label names of a metric family."""
+    type = "untyped"
+    shared = False
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def samples(self) -> dict[tuple[str, ...], object]:
+        """Returns a copy of the current value per label set."""
+        return {}
+
+    def merge_sample(self, samples: dict, labels: tuple[str, ...], value) -> None:
+        """Adds a value from another process's snapshot to `samples`."""
+        samples[labels] = samples.get(labels, 0.0) + value
+
+    def reset(self) -> None:
+        """Drops every recorded value, e.g. in a forked child that must not report its parent's."""
+        self._lock = threading.Lock()
+
+    def render(self, samples: dict | None = None) -> list[str]:
+        return [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(Metric):
+    """A monotonically increasing value per label set."""
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: tuple[str, ...] = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def reset(self) -> None:
+        super().reset()
+        self._values = {}
+
+    def samples(self) -> dict[tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self, samples: dict | None = None) -> list[str]:
+        samples = self.samples() if samples is None else samples
+        return super().render() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in samples.items()
+        ]
+
+
+class Histogram(Metric):
+    """Counts observations into cumulative buckets per label set, with their sum and count."""
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last one is +Inf), then the sum.
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def observe_many(self, values: Iterable[float], labels: tuple[str, ...] = ()) -> None:
+        """Records several observations under a single lock acquisition."""
+        buckets = self.buckets
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(buckets) + 2)
+            for value in values:
+                counts[bisect_left(buckets, value)] += 1
+                counts[-1] += value
+
+    def reset(self) -> None:
+        super().reset()
+        self._values = {}
+
+    def count(self, labels: tuple[str, ...] = ()) -> int:
+        counts = self._values.get(labels)
+        return sum(counts[:-1]) if counts else 0
+
+    def samples(self) -> dict[tuple[str, ...], list[float]]:
+        with self._lock:
+            return {labels: list(counts) for labels, counts in self._values.items()}
+
+    def merge_sample(self, samples: dict, labels: tuple[str, ...], value: list[float]) -> None:
+        if len(value) != len(self.buckets) + 2:
+            return  # Written with other buckets, e.g. by a process running an older version.
+        counts = samples.get(labels)
+        samples[labels] = value if counts is None else [a + b for a, b in zip(counts, value)]
+
+    def render(self, samples: dict | None = None) -> list[str]:
+        samples = self.samples() if samples is None else samples
+        lines = super().render()
+        names = (*self.labelnames, "le")
+        for labels, counts in samples.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(names, (*labels, _number(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(counts[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """
+    A gauge or counter read from `collect` at scrape time, as `(label values,
+    value)` pairs. A `shared` metric reads state every process sees alike,
+    such as a store they share, so it is neither written to snapshots nor
+    summed across processes.
+    """
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        type: str,
+        collect: Callable[[], Iterable[tuple[tuple[str, ...], float]]],
+        labelnames: tuple[str, ...] = (),
+        shared: bool = False,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.type = type
+        self.collect = collect
+        self.shared = shared
+
+    def samples(self) -> dict[tuple[str, ...], float]:
+        return dict(self.collect())
+
+    def render(self, samples: dict | None = None) -> list[str]:
+        samples = self.samples() if samples is None else samples
+        return super().render() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in samples.items()
+        ]
+
+
+class Registry:
+    """A named collection of metrics rendered together."""
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Adds a metric, replacing any registered under the same name."""
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge_callback(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], float],
+        shared: bool = False,
+    ) -> CallbackMetric:
+        """Registers an unlabelled gauge whose value is returned by `collect`."""
+        return self.register(
+            CallbackMetric(name, documentation, "gauge", lambda: [((), collect())], shared=shared)
+        )
+
+    def reset(self) -> None:
+        """
+        Drops every recorded value and every callback metric, e.g. in a forked
+        child, whose copies of the objects the callbacks read it does not serve.
+        """
+        self._metrics = {
+            name: metric for name, metric in self._metrics.items() if not isinstance(metric, CallbackMetric)
+        }
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def snapshot(self) -> dict:
+        """Returns the current values of every metric in a JSON-serializable form."""
+        return {
+            "pid": os.getpid(),
+            "time": time.time(),
+            "metrics": {
+                name: [[list(labels), value] for labels, value in metric.samples().items()]
+                for name, metric in self._metrics.items()
+                if not metric.shared
+            },
+        }
+
+    def write_snapshot(self, directory: str | Path) -> None:
+        """Writes this process's snapshot to `directory`, replacing its previous one atomically."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{os.getpid()}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp_path, path)
+
+    def read_snapshots(self, directory: str | Path, gauge_max_age: float) -> list[dict]:
+        """
+        Returns the snapshots other processes wrote to `directory`. Counters
+        and histograms of exited processes are kept, so totals do not drop
+        when a worker restarts, but gauges older than `gauge_max_age` seconds
+        are left out.
+        """
+        snapshots = []
+        for path in Path(directory).glob("*.json"):
+            if path.stem == str(os.getpid()):
+                continue
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue  # Removed or replaced while listing.
+            if time.time() - snapshot["time"] > gauge_max_age:
+                snapshot["metrics"] = {
+                    name: values for name, values in snapshot["metrics"].items()
+                    if name in self._metrics and self._metrics[name].type != "gauge"
+                }
+            snapshots.append(snapshot)
+        return snapshots
+
+    def render(self, snapshots: Iterable[dict] = ()) -> str:
+        """
+        Renders every metric in the Prometheus text format, version 0.0.4,
+        summing this process's values with those of `snapshots`. Shared
+        metrics report this process's value alone.
+        """
+        snapshots = list(snapshots)
+        lines = []
+        for name, metric in self._metrics.items():
+            samples = metric.samples()
+            for snapshot in snapshots if not metric.shared else ():
+                for labels, value in snapshot["metrics"].get(name, ()):
+                    metric.merge_sample(samples, tuple(labels), value)
+            lines.extend(metric.render(samples))
+        return "\n".join(lines) + "\n"
+
+
+class SnapshotWriter:
+    """Writes a registry's snapshot to a shared directory every `interval` seconds from a daemon thread."""
+    def __init__(self, registry: Registry, directory: str | Path, interval: float) -> None:
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshots", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the thread and writes a final snapshot."""
+        self._stopped.set()
+        self._thread.join()
+        self.registry.write_snapshot(self.directory)
+
+    def _run(self) -> None:
+        while True:
+            self.registry.write_snapshot(self.directory)
+            if self._stopped.wait(self.interval):
+                return
+
+
+def clear_snapshots(directory: str | Path) -> None:
+    """Removes the snapshots of a previous run, which would otherwise add to this run's totals."""
+    for path in Path(directory).glob("*.json"):
+        path.unlink(missing_ok=True)
+
+
+_writer: SnapshotWriter | None = None
+_writer_pid: int | None = None
+_writer_lock = threading.Lock()
+
+
+def share_metrics(directory: str | Path, interval: float) -> None:
+    """
+    Starts writing `REGISTRY` snapshots to `directory` for this process, once
+    per process, until it exits.
+    """
+    global _writer, _writer_pid
+    with _writer_lock:
+        if _writer_pid == os.getpid():
+            return
+        _writer, _writer_pid = SnapshotWriter(REGISTRY, directory, interval), os.getpid()
+        _writer.start()
+        atexit.register(_writer.stop)
+
+
+REGISTRY = Registry()
+# Forked workers, such as process executor workers, report only their own values, and no queue gauges.
+os.register_at_fork(after_in_child=REGISTRY.reset)
+
+WEBHOOK_PARSE_SECONDS = REGISTRY.histogram(
+    "webhook_parse_seconds", "Time spent reading and validating GitHub push bodies.", ("mode",)
+)
+ANALYSIS_STAGE_SECONDS = REGISTRY.histogram(
+    "analysis_stage_seconds",
+    "Time spent per commit in each analysis stage. The type stage includes the keyword, ml and "
+    "semantic stages; ml is timed once per batch when messages are vectorized together, as is "
+    "gibberish_batch.",
+    ("stage",),
+)
+FORMAT_SECONDS = REGISTRY.histogram(
+    "notification_format_seconds", "Time spent formatting the notifications of a push.", ("format",)
+)
+OUTBOUND_REQUEST_SECONDS = REGISTRY.histogram(
+    "outbound_request_seconds", "Latency of outbound notification requests.", ("destination", "outcome")
+)
+COMMITS_ANALYZED = REGISTRY.counter("commits_analyzed_total", "Commit messages analyzed.")
+VIOLATIONS = REGISTRY.counter(
+    "commit_violations_total", "Issues found in analyzed commits.", ("rule", "severity")
+)
+ANALYSIS_CACHE_REQUESTS = REGISTRY.counter(
+    "analysis_cache_requests_total", "Analysis cache lookups.", ("result",)
+)
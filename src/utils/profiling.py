@@ -0,0 +1,164 @@
+"""
+Opt-in profiling of single webhook requests.
+
+When `settings.profiling_enabled` is set, a POST to a GitHub or Telex
+webhook carrying `X-Profile: 1` or `?profile=1` runs with a sampling
+profiler attached to the thread serving it. The sampled stacks are stored in
+collapsed form, one `frame;frame;frame count` line per stack, which
+flamegraph tools read directly, and the response carries the profile's id in
+`X-Profile-Id` and the time spent per pipeline stage in `Server-Timing`.
+
+Requests without the flag only pay for a settings check, and stage timings
+are dropped unless a profiled request is in progress. Stacks are sampled
+from the serving thread only, so analysis on an executor shows as waiting;
+its stage timings are kept for thread executors, which run each chunk in a
+copy of the request's context, but not for process executors.
+"""
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from urllib.parse import parse_qs
+from time import perf_counter
+from uuid import uuid4
+from ..config.config import settings
+import asyncio
+import os
+import sys
+import threading
+
+
+PROFILED_PATHS = ("/api/v2/webhook/github/", "/api/v2/webhook/telex/")
+PROFILE_LIMIT = 100 # stored profiles; older ones are deleted
+
+_stage_seconds: ContextVar[dict[str, float] | None] = ContextVar("stage_seconds", default=None)
+# Chunks of one request analyzed on executor threads record into the same timings.
+_stage_lock = threading.Lock()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """
+    Adds time spent in a pipeline stage to the profile of the current request,
+    if any. Code run on another thread records into the request's profile when
+    it runs in a copy of the request's context.
+    """
+    timings = _stage_seconds.get()
+    if timings is not None:
+        with _stage_lock:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(os.getcwd()):
+        filename = os.path.relpath(filename)
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the Python stack of one thread every `interval` seconds from a
+    background thread, counting identical stacks in collapsed form.
+    """
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stopped.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        labels: dict = {}
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Returns the samples as collapsed stacks, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def server_timing(stage_seconds: dict[str, float]) -> str:
+    """Formats stage durations as a `Server-Timing` header value in milliseconds."""
+    return ", ".join(f"{stage};dur={seconds * 1e3:.3f}" for stage, seconds in stage_seconds.items())
+
+
+def _profile_path(profile_id: str) -> Path:
+    return Path(settings.profiling_dir) / f"{profile_id}.folded"
+
+
+def save_profile(profile_id: str, collapsed: str) -> None:
+    """Writes a collapsed-stack profile, deleting the oldest beyond `PROFILE_LIMIT`."""
+    path = _profile_path(profile_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(collapsed)
+    profiles = sorted(path.parent.glob("*.folded"), key=lambda p: p.stat().st_mtime)
+    for old in profiles[:-PROFILE_LIMIT]:
+        old.unlink(missing_ok=True)
+
+
+def read_profile(profile_id: str) -> str | None:
+    """Returns a stored collapsed-stack profile, or None when it does not exist."""
+    try:
+        return _profile_path(profile_id).read_text()
+    except FileNotFoundError:
+        return None
+
+
+def _profile_requested(scope) -> bool:
+    if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(PROFILED_PATHS):
+        return False
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            return value.lower() in (b"1", b"true")
+    return parse_qs(scope["query_string"].decode("latin-1")).get("profile", [""])[-1].lower() in ("1", "true")
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling webhook requests that ask for it, when profiling is enabled."""
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if not settings.profiling_enabled or not _profile_requested(scope):
+            return await self.app(scope, receive, send)
+
+        profile_id = uuid4().hex
+        stage_seconds: dict[str, float] = {}
+        token = _stage_seconds.set(stage_seconds)
+        sampler = StackSampler(threading.get_ident(), settings.profiling_interval)
+        start = perf_counter()
+
+        async def send_with_timings(message) -> None:
+            if message["type"] == "http.response.start":
+                timings = stage_seconds | {"total": perf_counter() - start}
+                message = message | {"headers": [
+                    *message.get("headers", []),
+                    (b"server-timing", server_timing(timings).encode()),
+                    (b"x-profile-id", profile_id.encode()),
+                ]}
+            await send(message)
+
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            sampler.stop()
+            _stage_seconds.reset(token)
+            await asyncio.to_thread(save_profile, profile_id, sampler.collapsed())
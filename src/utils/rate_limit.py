@@ -0,0 +1,256 @@
+"""
+Per-destination rate limiting for relayed messages.
+
+Each destination URL has a token bucket. A message is sent right away while
+the bucket has a token; above the rate, messages wait in a bounded queue and
+are coalesced into as few posts as the destination's rate allows. With
+several worker processes the buckets can be kept in a shared SQLite file, so
+the rate holds across all of them rather than per worker.
+"""
+from collections import deque
+from pathlib import Path
+from typing import Awaitable, Callable
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allows `rate` events per second on average, with bursts of up to `capacity`."""
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """Takes a token if one is available."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def delay(self) -> float:
+        """Seconds until a token is available."""
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class SharedTokenBucket:
+    """
+    `TokenBucket` stored under `key` in a SQLite database, so every worker
+    process on the host draws from the same tokens. Each refill and take runs
+    in an immediate transaction, and times are wall-clock so that they agree
+    between processes.
+    """
+    def __init__(self, path: str | Path, key: str, rate: float, capacity: int) -> None:
+        self.path = Path(path)
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS token_buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _update(self, take: bool) -> tuple[bool, float]:
+        """Refills the bucket, taking a token if `take` and one is available. Returns whether it did and the tokens left."""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = connection.execute("SELECT tokens, updated FROM token_buckets WHERE key = ?", (self.key,)).fetchone()
+            tokens, updated = row if row else (float(self.capacity), now)
+            tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+            taken = take and tokens >= 1
+            if taken:
+                tokens -= 1
+            connection.execute(
+                "INSERT OR REPLACE INTO token_buckets VALUES (?, ?, ?)", (self.key, tokens, max(now, updated))
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return taken, tokens
+
+    def try_acquire(self) -> bool:
+        """Takes a token if one is available."""
+        return self._update(take=True)[0]
+
+    def delay(self) -> float:
+        """Seconds until a token is available."""
+        return max(0.0, (1 - self._update(take=False)[1]) / self.rate)
+
+
+class _Destination:
+    __slots__ = ("bucket", "queue", "task")
+
+    def __init__(self, bucket: TokenBucket | SharedTokenBucket) -> None:
+        self.bucket = bucket
+        self.queue: deque[str] = deque()
+        self.task: asyncio.Task | None = None
+
+
+class CoalescingRelay:
+    """
+    Sends text messages through `send(text, url)` at no more than `rate`
+    posts per second per URL. Messages over the limit are queued, up to
+    `max_pending` per URL with the oldest dropped first, and each later post
+    joins as many queued messages as fit in `max_batch_chars`. Messages for
+    which `can_coalesce` returns False, such as structured payloads that
+    would not survive being joined, are always posted on their own. When
+    `bucket_path` is set, the per-URL buckets are `SharedTokenBucket`s in
+    that file; queues and coalescing stay per process.
+    """
+    SEPARATOR = "\n\n―――\n\n"
+
+    def __init__(
+        self,
+        send: Callable[[str, str], Awaitable[object]],
+        rate: float,
+        burst: int,
+        max_pending: int,
+        max_batch_chars: int,
+        can_coalesce: Callable[[str], bool] = lambda message: True,
+        bucket_path: str | Path | None = None,
+    ) -> None:
+        self.send = send
+        self.rate = rate
+        self.burst = burst
+        self.max_pending = max_pending
+        self.max_batch_chars = max_batch_chars
+        self.can_coalesce = can_coalesce
+        self.bucket_path = bucket_path
+        self._destinations: dict[str, _Destination] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.sent_messages = 0
+        self.posts = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.failed = 0
+        self.high_watermark = 0
+
+    def _destination(self, url: str) -> _Destination:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Flush tasks of a previous loop never run; restart them on this one.
+            self._loop = loop
+            for destination_url, destination in self._destinations.items():
+                destination.task = None
+                if destination.queue:
+                    self._start_flush(destination_url, destination)
+
+        destination = self._destinations.get(url)
+        if destination is None:
+            if self.bucket_path:
+                bucket = SharedTokenBucket(self.bucket_path, url, self.rate, self.burst)
+            else:
+                bucket = TokenBucket(self.rate, self.burst)
+            destination = self._destinations[url] = _Destination(bucket)
+        return destination
+
+    async def submit(self, message: str, url: str) -> bool:
+        """
+        Sends the message now if the destination is under its rate, raising
+        on failure; otherwise queues it for a coalesced post. Returns whether
+        the message was sent now.
+        """
+        destination = self._destination(url)
+        if not destination.queue and destination.bucket.try_acquire():
+            await self.send(message, url)
+            self.posts += 1
+            self.sent_messages += 1
+            return True
+
+        if len(destination.queue) >= self.max_pending:
+            destination.queue.popleft()
+            self.dropped += 1
+            logger.warning("Relay queue for a destination is full; dropped the oldest message")
+        destination.queue.append(message)
+        self.high_watermark = max(self.high_watermark, len(destination.queue))
+        if destination.task is None:
+            self._start_flush(url, destination)
+        return False
+
+    def _start_flush(self, url: str, destination: _Destination) -> None:
+        destination.task = self._loop.create_task(self._flush(url, destination))
+
+    def _next_batch(self, queue: deque[str]) -> list[str]:
+        batch = [queue.popleft()]
+        if not self.can_coalesce(batch[0]):
+            return batch
+        size = len(batch[0])
+        while (
+            queue
+            and size + len(self.SEPARATOR) + len(queue[0]) <= self.max_batch_chars
+            and self.can_coalesce(queue[0])
+        ):
+            size += len(self.SEPARATOR) + len(queue[0])
+            batch.append(queue.popleft())
+        return batch
+
+    async def _flush(self, url: str, destination: _Destination) -> None:
+        try:
+            while destination.queue:
+                while not destination.bucket.try_acquire():
+                    await asyncio.sleep(destination.bucket.delay())
+
+                batch = self._next_batch(destination.queue)
+                try:
+                    await self.send(self.SEPARATOR.join(batch), url)
+                except Exception:
+                    self.failed += len(batch)
+                    logger.exception("Relaying %d coalesced messages failed", len(batch))
+                    continue
+                self.posts += 1
+                self.sent_messages += len(batch)
+                self.coalesced += len(batch) - 1
+        finally:
+            destination.task = None
+
+    async def drain(self, timeout: float) -> None:
+        """Waits up to `timeout` seconds for queued messages to be sent."""
+        tasks = [destination.task for destination in self._destinations.values() if destination.task is not None]
+        if self._loop is not asyncio.get_running_loop() or not tasks:
+            return
+
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            for task in pending:
+                task.cancel()
+            logger.warning("Relay drain timed out with %d messages queued", self.stats()["queue_depth"])
+
+    def stats(self) -> dict[str, int]:
+        """Returns queue depth and throughput counters."""
+        return {
+            "destinations": len(self._destinations),
+            "queue_depth": sum(len(destination.queue) for destination in self._destinations.values()),
+            "high_watermark": self.high_watermark,
+            "sent_messages": self.sent_messages,
+            "posts": self.posts,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
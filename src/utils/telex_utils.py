@@ -1,9 +1,83 @@
 import asyncio
+import httpx
 from ..config.config import settings
+from .delivery import DeliveryManager, DeliverySpool, destination
+from .metrics import OUTBOUND_REQUEST_SECONDS
+from time import perf_counter
 from fastapi import HTTPException, status
 
 
+class CurlStatusError(Exception):
+    """Raised when a curl subprocess receives an HTTP error status."""
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"The requested URL returned error: {status_code}")
+        self.status_code = status_code
+
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared keep-alive HTTP client, creating it on first use.
+    Connections are bound to an event loop, so a new client is created if
+    the running loop changes (e.g. between test client sessions).
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=settings.http2,
+            limits=httpx.Limits(
+                max_connections=settings.http_pool_size,
+                max_keepalive_connections=settings.http_pool_size,
+            ),
+            timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+            headers={"Accept": "application/json", "Content-Type": "application/json"},
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """Closes the shared HTTP client and its pooled connections."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = _client_loop = None
+
+
 async def send_payload(payload: str, url: str):
+    """
+    Sends payload through the pooled HTTP client, or through a curl
+    subprocess when `settings.curl_command` is configured.
+    """
+    start = perf_counter()
+    outcome = "error"
+    try:
+        content = await (_send_with_curl(payload, url) if settings.curl_command else _send_with_client(payload, url))
+        outcome = "success"
+    finally:
+        OUTBOUND_REQUEST_SECONDS.observe(perf_counter() - start, (destination(url), outcome))
+    return content
+
+
+async def _send_with_client(payload: str, url: str):
+    """Sends payload through the pooled HTTP client."""
+    try:
+        response = await get_http_client().post(url, content=payload)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"HTTP transport exception: {str(e)}",
+        ) from e
+
+    return response.content
+
+
+async def _send_with_curl(payload: str, url: str):
     """Sends payload through an asynchronous curl subprocess."""
     curl_command = [
         settings.curl_command,
@@ -14,13 +88,23 @@ async def send_payload(payload: str, url: str):
         "Accept: application/json",
         "-H",
         "Content-Type: application/json",
-        "-d",
-        payload,
+        "--data-binary",
+        "@-",
+        # The status code is appended to the body as three digits.
+        "--write-out",
+        "%{http_code}",
+        "--max-time",
+        str(settings.http_timeout),
+        "--connect-timeout",
+        str(settings.http_connect_timeout),
     ]
     process = await asyncio.create_subprocess_exec(
-        *curl_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        *curl_command,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
     )
-    stdout, stderr = await process.communicate()
+    stdout, stderr = await process.communicate(payload.encode())
 
     # Check for exit on error
     if process.returncode != 0:
@@ -29,4 +113,80 @@ async def send_payload(payload: str, url: str):
             detail=f"Subprocess exception: {stderr.decode().strip()}",
         )
 
-    return stdout
+    content, status_code = stdout[:-3], int(stdout[-3:])
+    if status_code >= 400:
+        error = CurlStatusError(status_code)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Subprocess exception: {error}",
+        ) from error
+
+    return content
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """Returns whether a send failed with a client error that a retry would repeat."""
+    cause = error.__cause__
+    if isinstance(cause, httpx.HTTPStatusError):
+        status_code = cause.response.status_code
+    elif isinstance(cause, CurlStatusError):
+        status_code = cause.status_code
+    else:
+        return False
+    return 400 <= status_code < 500 and status_code not in (408, 429)
+
+
+_delivery: DeliveryManager | None = None
+
+
+def get_delivery_manager() -> DeliveryManager:
+    """Returns the process-wide delivery manager, opening the spool on first use."""
+    global _delivery
+    if _delivery is None:
+        _delivery = DeliveryManager(
+            DeliverySpool(settings.delivery_spool_path),
+            # Looked up on each call so the transport can be swapped out in tests.
+            lambda payload, url: send_payload(payload, url),
+            max_attempts=settings.delivery_max_attempts,
+            backoff_base=settings.delivery_backoff_base,
+            backoff_max=settings.delivery_backoff_max,
+            failure_threshold=settings.circuit_failure_threshold,
+            reset_timeout=settings.circuit_reset_timeout,
+            poll_interval=settings.delivery_poll_interval,
+            lease=settings.http_timeout * 2,
+            is_permanent=is_permanent_error,
+        )
+    return _delivery
+
+
+async def deliver_payload(payload: str, url: str) -> None:
+    """
+    Sends payload, or with `settings.delivery_retries` enabled, spools it for
+    background retries when the destination is failing. Only errors that a
+    retry cannot fix are raised in that mode.
+    """
+    if settings.delivery_retries:
+        await get_delivery_manager().deliver(payload, url)
+    else:
+        await send_payload(payload, url)
+
+
+async def send_payloads(payloads: list[str], url: str) -> list[Exception | None]:
+    """
+    Delivers payloads to the same URL concurrently, with at most
+    `settings.telex_max_concurrency` requests in flight. A failed send does not
+    cancel the others; the exception (or None on success or when spooled for
+    retry) is returned for each payload, in order.
+    """
+    semaphore = asyncio.Semaphore(settings.telex_max_concurrency)
+
+    async def send(payload: str) -> None:
+        async with semaphore:
+            await deliver_payload(payload, url)
+
+    results = await asyncio.gather(*(send(payload) for payload in payloads), return_exceptions=True)
+    for result in results:
+        # Cancellation is not a failed send; it propagates instead of being reported as one.
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+    return [result if isinstance(result, Exception) else None for result in results]
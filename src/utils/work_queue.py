@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when an item is offered to a work queue that is at capacity."""
+
+
+class WorkQueue:
+    """
+    Bounded in-process queue drained by a pool of asyncio worker tasks.
+
+    Workers are started lazily on the running event loop the first time an
+    item is enqueued. Offering an item to a full queue raises
+    `QueueFullError` so callers can apply backpressure upstream.
+    """
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[Any]],
+        maxsize: int,
+        workers: int,
+    ) -> None:
+        self.handler = handler
+        self.maxsize = maxsize
+        self.worker_count = workers
+        self._queue: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._workers: list[asyncio.Task] = []
+        self.enqueued = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.high_watermark = 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._loop = loop
+            self._workers = [
+                loop.create_task(self._worker()) for _ in range(self.worker_count)
+            ]
+        return self._queue
+
+    def put_nowait(self, item: Any) -> None:
+        """Enqueues an item without waiting, raising `QueueFullError` at capacity."""
+        queue = self._ensure_started()
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError(f"Work queue is full ({self.maxsize} items)")
+
+        self.enqueued += 1
+        self.high_watermark = max(self.high_watermark, queue.qsize())
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            item = await queue.get()
+            self.in_flight += 1
+            try:
+                await self.handler(item)
+                self.processed += 1
+            except Exception:
+                self.failed += 1
+                logger.exception("Work queue item failed")
+            finally:
+                self.in_flight -= 1
+                queue.task_done()
+
+    async def drain(self, timeout: float) -> None:
+        """Waits up to `timeout` seconds for queued items to finish, then stops the workers."""
+        if self._queue is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Work queue drain timed out with %d items pending", self._queue.qsize())
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._queue = self._loop = None
+        self._workers = []
+
+    def stats(self) -> dict[str, int]:
+        """Returns queue depth and throughput counters."""
+        return {
+            "depth": self._queue.qsize() if self._queue else 0,
+            "maxsize": self.maxsize,
+            "workers": len(self._workers),
+            "in_flight": self.in_flight,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "processed": self.processed,
+            "failed": self.failed,
+            "high_watermark": self.high_watermark,
+        }
@@ -0,0 +1,57 @@
+"""
+Preparation for running the app in several uvicorn worker processes.
+
+Workers are started with the spawn method, so each one imports the app and
+reads its settings from the environment. Before they start, the classifier
+artifact is built once so every worker memory-maps the same read-only files,
+sharing them through the page cache, instead of fitting a model of its own.
+The environment then points workers at a shared metrics directory, shared
+SQLite files for deduplication claims and the Slack relay's rate limit and,
+unless configured otherwise, the disk analysis cache. Digest windows, the push
+queue and relay queues stay per worker.
+"""
+from ..config.config import settings
+from .metrics import clear_snapshots
+import logging
+import os
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_DIR = ".cache/metrics"
+DEFAULT_DEDUP_PATH = ".cache/dedup.sqlite3"
+DEFAULT_SLACK_RATE_LIMIT_PATH = ".cache/slack_rate_limit.sqlite3"
+
+
+def prepare_workers() -> dict[str, str]:
+    """
+    Builds the classifier artifact and sets the environment inherited by the
+    workers. Returns the environment variables that were set.
+    """
+    from ..core.analyzer.artifact import load_or_build
+    from ..core.analyzer.training import current_training_data
+
+    _, training_data = current_training_data(refresh=True)
+    load_or_build(training_data, settings.model_artifact_dir)
+
+    environment = {}
+    if not settings.metrics_dir:
+        environment["METRICS_DIR"] = DEFAULT_METRICS_DIR
+    if not settings.dedup_path:
+        environment["DEDUP_PATH"] = DEFAULT_DEDUP_PATH
+    if not settings.slack_rate_limit_path:
+        environment["SLACK_RATE_LIMIT_PATH"] = DEFAULT_SLACK_RATE_LIMIT_PATH
+    if "analysis_cache_backend" not in settings.model_fields_set:
+        environment["ANALYSIS_CACHE_BACKEND"] = "disk"
+    os.environ.update(environment)
+
+    if settings.digest_mode == "window":
+        logger.warning(
+            "Digest windows are collected per worker, so a channel's violations may be split across %d digests",
+            settings.workers,
+        )
+
+    clear_snapshots(settings.metrics_dir or DEFAULT_METRICS_DIR)
+
+    logger.info("Starting %d workers with %s", settings.workers, environment)
+    return environment
@@ -0,0 +1,71 @@
+from src.config.config import settings
+from src.core.analyzer import classifier as classifier_module, training
+from src.config.data import commit_training_data
+from src.core.analyzer.classifier import CommitTypeClassifier, get_classifier
+from src.core.analyzer.training import read_examples
+from tests import client
+import pytest
+
+
+MESSAGE = "docs: add flamegraph walkthrough"
+HEADERS = {"Authorization": "Bearer secret"}
+
+
+@pytest.fixture
+def isolated_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    monkeypatch.setattr(settings, "model_artifact_dir", str(tmp_path / "models"))
+    monkeypatch.setattr(settings, "training_examples_path", str(tmp_path / "examples.jsonl"))
+    for module, name in [
+        (training, "_current"),
+        (training, "_log_signature"),
+        (training, "_checked_at"),
+        (classifier_module, "_classifier"),
+        (classifier_module, "_classifier_version"),
+    ]:
+        monkeypatch.setattr(module, name, getattr(module, name))
+    training.current_training_data(refresh=True)
+    return tmp_path
+
+
+def test_admin_api_disabled_without_token():
+    response = client.post("/admin/training-examples", json={"examples": []}, headers=HEADERS)
+    assert response.status_code == 403
+
+
+def test_admin_api_rejects_invalid_token(isolated_model):
+    response = client.post(
+        "/admin/training-examples", json={"examples": []}, headers={"Authorization": "Bearer wrong"}
+    )
+    assert response.status_code == 401
+
+
+def test_admin_api_rejects_unknown_commit_type(isolated_model):
+    response = client.post(
+        "/admin/training-examples",
+        json={"examples": [{"commit_type": "misc", "message": MESSAGE}]},
+        headers=HEADERS,
+    )
+    assert response.status_code == 422
+
+
+def test_added_examples_are_swapped_in_and_persisted(isolated_model):
+    before = get_classifier()
+    response = client.post(
+        "/admin/training-examples",
+        json={"examples": [{"commit_type": "docs", "message": MESSAGE}]},
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 200
+    assert response.json()["training_size"] == len(before.y_train) + 1
+    assert get_classifier().most_similar(MESSAGE) == pytest.approx(("docs", 1.0))
+    assert read_examples(settings.training_examples_path) == {"docs": [MESSAGE]}
+    assert len(list((isolated_model / "models").iterdir())) == 1
+
+    # Another worker notices the log change and memory-maps the published artifact.
+    classifier_module._classifier = None
+    classifier_module._classifier_version = None
+    assert get_classifier().y_train == CommitTypeClassifier.fit(
+        training.merge_examples(commit_training_data, {"docs": [MESSAGE]})
+    ).y_train
@@ -0,0 +1,64 @@
+from src.config.config import settings
+from src.core.analyzer.analyzer import CommitAnalyzer
+from src.core.analyzer.cache import AnalysisCache, DiskBackend, MemoryBackend
+from src.core.analyzer.executor import run_analysis, shutdown_executor
+import asyncio
+import pytest
+
+
+MESSAGES = [
+    "feat(api): add pagination\n\nAdded cursor pagination to the list endpoint.",
+    "misc: dark mode switch",
+    "thing: sql injection in queries",
+    "remove unnecessary comment",
+    "x: lorem ipsum dolor",
+]
+
+
+@pytest.fixture(autouse=True)
+def no_analysis_cache(monkeypatch):
+    monkeypatch.setattr(settings, "analysis_cache_backend", "none")
+
+
+def test_analyze_batch_matches_analyze_commit():
+    analyzer = CommitAnalyzer()
+    assert analyzer.analyze_batch(MESSAGES) == [analyzer.analyze_commit(m) for m in MESSAGES]
+    assert analyzer.analyze_batch([]) == []
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_run_analysis_executor_backends(monkeypatch, backend):
+    monkeypatch.setattr(settings, "analysis_executor", backend)
+    monkeypatch.setattr(settings, "analysis_workers", 2)
+    monkeypatch.setattr(settings, "analysis_chunk_size", 2)
+    try:
+        issues = asyncio.run(run_analysis(MESSAGES))
+    finally:
+        shutdown_executor()
+    assert issues == CommitAnalyzer().analyze_batch(MESSAGES)
+
+
+@pytest.mark.parametrize("backend_name", ["memory", "disk"])
+def test_analysis_cache_hits(tmp_path, backend_name):
+    if backend_name == "disk":
+        backend = DiskBackend(tmp_path / "cache.sqlite3", maxsize=100, ttl=60)
+    else:
+        backend = MemoryBackend(maxsize=100, ttl=60)
+    cache = AnalysisCache(backend)
+    analyzer = CommitAnalyzer(cache=cache)
+
+    expected = CommitAnalyzer().analyze_batch(MESSAGES)
+    assert analyzer.analyze_batch(MESSAGES) == expected
+    assert analyzer.analyze_batch(MESSAGES + MESSAGES[:1]) == expected + expected[:1]
+    assert cache.stats() | {"backend": None} == {
+        "backend": None, "size": len(MESSAGES), "hits": len(MESSAGES), "misses": len(MESSAGES)
+    }
+
+
+def test_disk_cache_shared_between_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    CommitAnalyzer(cache=AnalysisCache(DiskBackend(path, maxsize=100, ttl=60))).analyze_batch(MESSAGES)
+
+    other = AnalysisCache(DiskBackend(path, maxsize=100, ttl=60))
+    assert [other.get(message) for message in MESSAGES] == CommitAnalyzer().analyze_batch(MESSAGES)
+    assert other.hits == len(MESSAGES)
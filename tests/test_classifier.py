@@ -0,0 +1,83 @@
+from src.config.data import commit_training_data
+from src.core.analyzer.artifact import (
+    artifact_path,
+    load_or_build,
+    training_data_hash,
+)
+from src.core.analyzer.classifier import CommitTypeClassifier
+from src.core.analyzer.similarity import ExactIndex, PrunedIndex
+import numpy as np
+import pytest
+
+
+MESSAGES = ["misc: dark mode switch", "thing: sql injection in queries", "x: lorem ipsum"]
+
+
+def test_artifact_matches_fitted_model(tmp_path):
+    fitted = CommitTypeClassifier.fit(commit_training_data)
+    loaded = load_or_build(commit_training_data, tmp_path)
+
+    assert isinstance(loaded.idf, np.memmap)
+    assert loaded.y_train == fitted.y_train
+    assert np.allclose(loaded.transform(MESSAGES).toarray(), fitted.transform(MESSAGES).toarray())
+    for message in MESSAGES:
+        assert loaded.most_similar(message) == fitted.most_similar(message)
+
+
+def test_artifact_rebuilt_when_training_data_changes(tmp_path):
+    load_or_build(commit_training_data, tmp_path)
+    changed = {**commit_training_data, "ci": ["ci(lint): enforce code style in workflow"]}
+    classifier = load_or_build(changed, tmp_path)
+
+    assert "ci" in classifier.y_train
+    assert artifact_path(tmp_path, training_data_hash(changed)).exists()
+    assert not artifact_path(tmp_path, training_data_hash(commit_training_data)).exists()
+
+
+def test_similarity_indexes_agree_with_dense_cosine():
+    classifier = CommitTypeClassifier.fit(commit_training_data)
+    queries = MESSAGES + [message for messages in commit_training_data.values() for message in messages]
+    vectors = classifier.transform(queries)
+    expected = (vectors @ classifier.x_train_vectorized.T).toarray().max(axis=1)
+
+    for index in (ExactIndex(classifier.x_train_vectorized), PrunedIndex(classifier.x_train_vectorized)):
+        best, scores = index.query(vectors)
+        assert np.allclose(scores, expected)
+        assert np.allclose(
+            (vectors @ classifier.x_train_vectorized[best].T).diagonal(), scores
+        )
+
+
+def test_fit_matches_scikit_learn():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    messages = [message for messages in commit_training_data.values() for message in messages]
+    vectorizer = TfidfVectorizer().fit(messages)
+    classifier = CommitTypeClassifier.fit(commit_training_data)
+
+    assert classifier.vocabulary == vectorizer.vocabulary_
+    assert np.allclose(classifier.idf, vectorizer.idf_)
+    assert np.allclose(classifier.transform(MESSAGES).toarray(), vectorizer.transform(MESSAGES).toarray())
+
+
+def test_incremental_examples_match_full_refit():
+    examples = {
+        "ci": ["ci(lint): enforce code style in workflow"],
+        "docs": ["docs(api): describe webhook retries", "docs: add flamegraph walkthrough"],
+    }
+    merged = {commit_type: list(messages) for commit_type, messages in commit_training_data.items()}
+    for commit_type, messages in examples.items():
+        merged.setdefault(commit_type, []).extend(messages)
+
+    incremental = CommitTypeClassifier.fit(commit_training_data).with_examples(examples)
+    refitted = CommitTypeClassifier.fit(merged)
+
+    queries = MESSAGES + ["enforce code style in workflow", "flamegraph walkthrough"]
+    # Same rows and terms in the same order, so ties are broken alike
+    assert incremental.y_train == refitted.y_train
+    assert incremental.vocabulary == refitted.vocabulary
+    assert (incremental.term_counts != refitted.term_counts).nnz == 0
+    assert np.allclose(incremental.x_train_vectorized.toarray(), refitted.x_train_vectorized.toarray())
+    for query in queries:
+        assert incremental.most_similar(query) == pytest.approx(refitted.most_similar(query))
+    assert incremental.most_similar("flamegraph walkthrough")[0] == "docs"
@@ -0,0 +1,15 @@
+from benchmarks.corpus import CATEGORIES, generate, generate_mix, suggestion_stage
+
+
+def test_corpus_categories_hit_their_stage():
+    for category in CATEGORIES:
+        expected = category if category in ("keyword", "ml", "semantic", "fallback") else None
+        messages = generate(category, 10)
+        assert len(set(messages)) == 10
+        assert [suggestion_stage(message) for message in messages] == [expected] * 10
+
+
+def test_corpus_is_reproducible():
+    assert generate_mix(30, seed=1) == generate_mix(30, seed=1)
+    assert generate_mix(30, seed=1) != generate_mix(30, seed=2)
+    assert {category for category, _ in generate_mix(70)} == set(CATEGORIES)
@@ -0,0 +1,187 @@
+from benchmarks.fake_server import FakeServer
+from src.config.config import settings
+from src.utils.delivery import CircuitBreaker, DeliveryManager, DeliverySpool, backoff_delay
+from src.utils.telex_utils import close_http_client, is_permanent_error, send_payload, send_payloads
+from fastapi.testclient import TestClient
+from main import app
+import asyncio
+import json
+import shutil
+import time
+import pytest
+
+
+def _manager(path, **options) -> DeliveryManager:
+    options = {
+        "max_attempts": 3,
+        "backoff_base": 0.0,
+        "backoff_max": 0.0,
+        "failure_threshold": 2,
+        "reset_timeout": 0.05,
+        "poll_interval": 0.01,
+        "lease": 5.0,
+        "is_permanent": is_permanent_error,
+    } | options
+    return DeliveryManager(DeliverySpool(path), send_payload, **options)
+
+
+def test_backoff_delay_is_capped_and_jittered():
+    delays = [backoff_delay(attempt, 1.0, 10.0) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= delay <= 10.0 for delay in delays)
+    assert len(set(delays)) > 1
+    assert all(backoff_delay(0, 1.0, 10.0) <= 1.0 for _ in range(20))
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_spool_survives_restart(tmp_path):
+    spool = DeliverySpool(tmp_path / "spool.sqlite3")
+    spool.add("http://telex/channel", "payload", 1, time.time(), "down")
+    spool.close()
+
+    spool = DeliverySpool(tmp_path / "spool.sqlite3")
+    (delivery,) = spool.lease_due(time.time(), lease=60.0, limit=10)
+    assert (delivery.url, delivery.payload, delivery.attempts) == ("http://telex/channel", "payload", 1)
+    # Leased entries are not handed out again until the lease expires.
+    assert spool.lease_due(time.time(), lease=60.0, limit=10) == []
+    assert spool.counts() == {"pending": 1, "dead": 0}
+
+
+def test_expired_lease_cannot_be_renewed_after_another_lease(tmp_path):
+    spool = DeliverySpool(tmp_path / "spool.sqlite3")
+    spool.add("http://telex/channel", "payload", 1, time.time(), "down")
+    now = time.time()
+    (first,) = spool.lease_due(now, lease=1.0, limit=10)
+    first = spool.renew_lease(first, now + 2.0)
+    assert first.leased_until == now + 2.0
+
+    # The renewed lease expired and another worker leased the entry.
+    (second,) = spool.lease_due(now + 3.0, lease=60.0, limit=10)
+    assert spool.renew_lease(first, now + 4.0) is None
+    assert spool.renew_lease(second, now + 70.0) == second._replace(leased_until=now + 70.0)
+
+
+def test_failed_notifications_are_retried_after_recovery(tmp_path):
+    async def scenario(server: FakeServer) -> DeliveryManager:
+        manager = _manager(tmp_path / "spool.sqlite3")
+        try:
+            results = [await manager.deliver(json.dumps({"n": n}), f"{server.url}/channel") for n in range(4)]
+            assert results == [False] * 4
+            # The circuit opened after two failures, so later notifications were spooled without a request.
+            assert len(server.bodies) == 2
+            assert manager.stats()["circuits"] == {server.url: "open"}
+
+            server.status_code = 200
+            for _ in range(200):
+                if manager.spool.counts()["pending"] == 0:
+                    break
+                await asyncio.sleep(0.01)
+            return manager
+        finally:
+            await manager.stop()
+            await close_http_client()
+
+    with FakeServer(status_code=503) as server:
+        manager = asyncio.run(scenario(server))
+
+    delivered = [json.loads(body) for body in server.bodies[2:]]
+    assert sorted(body["n"] for body in delivered) == [0, 1, 2, 3]
+    assert manager.spool.counts() == {"pending": 0, "dead": 0}
+    assert manager.stats()["circuits"] == {}
+
+
+def test_notifications_are_dead_lettered(tmp_path):
+    async def scenario(server: FakeServer) -> DeliveryManager:
+        manager = _manager(tmp_path / "spool.sqlite3", failure_threshold=100)
+        try:
+            assert not await manager.deliver("{}", server.url)
+            for _ in range(200):
+                if manager.spool.counts()["dead"]:
+                    break
+                await asyncio.sleep(0.01)
+            return manager
+        finally:
+            await manager.stop()
+            await close_http_client()
+
+    with FakeServer(status_code=500) as server:
+        manager = asyncio.run(scenario(server))
+
+    assert manager.spool.counts() == {"pending": 0, "dead": 1}
+    assert len(server.bodies) == 3
+
+
+@pytest.mark.parametrize(
+    "curl_command",
+    [None, pytest.param("curl", marks=pytest.mark.skipif(not shutil.which("curl"), reason="curl not installed"))],
+)
+def test_client_errors_are_not_retried(tmp_path, monkeypatch, curl_command):
+    monkeypatch.setattr(settings, "curl_command", curl_command)
+
+    async def scenario(server: FakeServer) -> None:
+        manager = _manager(tmp_path / "spool.sqlite3")
+        try:
+            with pytest.raises(Exception) as error:
+                await manager.deliver("{}", server.url)
+            assert is_permanent_error(error.value)
+        finally:
+            await manager.stop()
+            await close_http_client()
+
+    with FakeServer(status_code=400) as server:
+        asyncio.run(scenario(server))
+    assert DeliverySpool(tmp_path / "spool.sqlite3").counts() == {"pending": 0, "dead": 0}
+
+
+def test_webhook_spools_when_telex_is_down(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "delivery_retries", True)
+    monkeypatch.setattr(settings, "delivery_spool_path", str(tmp_path / "spool.sqlite3"))
+    monkeypatch.setattr(settings, "delivery_backoff_base", 60.0)
+    monkeypatch.setattr("src.utils.telex_utils._delivery", None)
+
+    with FakeServer(status_code=503) as server:
+        monkeypatch.setattr(settings, "telex_webhook_url", server.url)
+        commit = {
+            "id": "spooled_commit",
+            "message": "fix typo",
+            "timestamp": "2025-02-18T10:17:54+01:00",
+            "url": "https://github.com/test/test/commit/spooled_commit",
+            "author": {"name": "test", "email": "test@example.com"},
+        }
+        with TestClient(app, base_url="http://test/api/v2") as lifespan_client:
+            push = {"pusher": {"name": "test"}, "commits": [commit]}
+            response = lifespan_client.post("/webhook/github/channel_id/", json=push)
+            assert response.json() == {"status": "success"}
+            assert lifespan_client.get("/webhook/github/queue").json()["delivery"]["pending"] == 1
+
+
+def test_send_payloads_propagates_cancellation(monkeypatch):
+    async def send_payload(payload, url):
+        if payload == "cancelled":
+            raise asyncio.CancelledError
+        if payload == "failed":
+            raise RuntimeError("failed")
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", send_payload)
+    errors = asyncio.run(send_payloads(["sent", "failed"], "https://telex.example.com"))
+    assert errors[0] is None and isinstance(errors[1], RuntimeError)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(send_payloads(["sent", "cancelled"], "https://telex.example.com"))
@@ -0,0 +1,29 @@
+from src.utils.digest import DigestBuffer
+import asyncio
+
+
+def test_batches_flush_after_window_or_when_full():
+    flushed = []
+
+    async def flush(key, batch):
+        flushed.append((key, batch))
+
+    async def scenario():
+        buffer = DigestBuffer(flush, window=0.05, max_items=3)
+        buffer.add("a", [1, 2])
+        buffer.add("b", [10])
+        buffer.add("a", [3, 4])
+        await asyncio.sleep(0)
+        assert flushed == [("a", [1, 2, 3])]
+
+        await asyncio.sleep(0.1)
+        assert sorted(flushed[1:]) == [("a", [4]), ("b", [10])]
+
+        buffer.add("c", [5])
+        await buffer.drain(timeout=1)
+        assert flushed[-1] == ("c", [5])
+        assert buffer.stats() == {
+            "pending_keys": 0, "pending_items": 0, "flushed_batches": 4, "flushed_items": 6,
+        }
+
+    asyncio.run(scenario())
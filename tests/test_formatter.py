@@ -0,0 +1,104 @@
+from src.core.analyzer.formatter import MessageFormatter, get_formatter
+from src.config.config import settings
+from src.core.models import Commit, CommitAuthor, CommitIssue
+from src.routers.github import NotificationOptions, format_notifications
+import json
+import pytest
+
+
+COMMIT = Commit(
+    "abcdef1234567890",
+    "fix typo",
+    "2025-02-18T10:17:54Z",
+    "https://github.com/org/repo/commit/abcdef1234567890",
+    CommitAuthor("Jane Doe", "jane@example.com"),
+)
+
+ISSUES = [
+    CommitIssue("low", "Low issue", "Low suggestion"),
+    CommitIssue("high", "High issue", "High suggestion\nSecond line"),
+    CommitIssue("medium", "Medium issue", "Medium suggestion"),
+]
+
+
+def test_slack_format():
+    assert get_formatter("slack").format_commit(COMMIT, ISSUES) == (
+        "📝 *Commit Details*\n"
+        "└─ Hash: `abcdef12`\n"
+        "└─ Author: Jane Doe (jane@example.com)\n"
+        "└─ URL: <https://github.com/org/repo/commit/abcdef1234567890|commit url>\n"
+        "└─ Time: 10:17AM. Tuesday, February 18, 2025.\n"
+        "└─ Message:\n"
+        "• ```fix typo```\n"
+        "\n🔍 *Analysis Results*\n"
+        "🔴 High issue\n   └─ High suggestion\n     Second line\n"
+        "🟡 Medium issue\n   └─ Medium suggestion\n"
+        "🔵 Low issue\n   └─ Low suggestion\n"
+        "\n💡 Resources\n"
+        "└─ Conventional Commits: <https://www.conventionalcommits.org|Conventional Commits>\n"
+        "└─ Commit Best Practices: <https://dev.to/sheraz4194/good-commit-vs-bad-commit-best-practices-for-git-1plc|Best Practices>\n"
+        "└─ Git Best Practices: <https://git-scm.com/book/en/v2/Distributed-Git-Contributing-to-a-Project|Git Contributing>"
+    )
+
+
+def test_plain_format_has_no_markup():
+    message = get_formatter("plain").format_commit(COMMIT, ISSUES)
+    assert not any(markup in message for markup in ("*", "`", "<", "└─"))
+    assert message.index("[HIGH]") < message.index("[MEDIUM]") < message.index("[LOW]")
+
+
+@pytest.mark.parametrize("name", ["slack", "plain", "blocks"])
+def test_digest_lists_every_commit(name):
+    other = Commit("0123456789abcdef", 'say "hi"', COMMIT.timestamp, COMMIT.url, CommitAuthor("Bob"))
+    message = get_formatter(name).format_digest([(COMMIT, ISSUES), (other, ISSUES[:1])])
+    assert "2 commits need attention" in message
+    assert "abcdef12" in message and "01234567" in message
+    assert message.count("Low issue") == 2
+
+
+def test_blocks_format_is_valid_json():
+    commit = Commit(COMMIT.id, 'quote " and \\ backslash', COMMIT.timestamp, COMMIT.url, CommitAuthor("Bob"))
+    blocks = json.loads(get_formatter("blocks").format_commit(commit, ISSUES))["blocks"]
+
+    assert [block["type"] for block in blocks] == ["header", "section", "section", "section", "context"]
+    assert blocks[2]["text"]["text"] == '```quote " and \\ backslash```'
+    assert "*Author:*\nBob" in [field["text"] for field in blocks[1]["fields"]]
+    issues = blocks[3]["text"]["text"]
+    assert issues.index("High issue") < issues.index("Medium issue") < issues.index("Low issue")
+    json.loads(get_formatter("blocks").format_digest([(commit, ISSUES)]))
+
+
+def test_incomplete_formatter_fails_on_creation():
+    class CommitOnlyFormatter(MessageFormatter):
+        name = "slack"
+
+        def _render_issue(self, issue):
+            return issue.message
+
+        def format_commit(self, commit, issues):
+            return commit.message
+
+    with pytest.raises(TypeError, match="format_digest"):
+        CommitOnlyFormatter()
+
+
+@pytest.mark.parametrize("max_commits, sizes", [(25, [25]), (60, [48, 12])])
+def test_blocks_digests_fit_slack_limits(monkeypatch, max_commits, sizes):
+    monkeypatch.setattr(settings, "digest_max_commits", max_commits)
+    long_commit = Commit(COMMIT.id, "x" * 5000, COMMIT.timestamp, COMMIT.url, COMMIT.author)
+    violations = [(long_commit, ISSUES)] * max_commits
+
+    notifications = format_notifications(violations, NotificationOptions("push", "blocks"))
+
+    # Longer digests are split across messages
+    assert [len(commits) for commits, _ in notifications] == sizes
+    for _, message in notifications:
+        blocks = json.loads(message)["blocks"]
+        assert len(blocks) <= 50
+        for block in blocks:
+            assert len(block.get("text", {}).get("text", "")) <= 3000
+            assert all(len(field["text"]) <= 2000 for field in block.get("fields", ()))
+        assert "Low issue" in blocks[1]["text"]["text"]
+
+    commit_blocks = json.loads(get_formatter("blocks").format_commit(long_commit, ISSUES))["blocks"]
+    assert len(commit_blocks[2]["text"]["text"]) == 3000
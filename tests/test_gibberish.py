@@ -0,0 +1,76 @@
+from src.config.data import LETTER_FREQUENCY, VALID_PAIRS
+from src.core.analyzer.gibberish import GibberishDetector
+import random
+import string
+
+
+def reference_check_gibberish(word: str) -> bool:
+    """The original pure-Python implementation from QualityAnalyzer."""
+    VOWELS = set('aeiouyAEIOUY')
+
+    word = word.lower().strip(string.punctuation)
+    if not word or len(word) < 2 or not word.isalpha():
+        return False
+
+    failed_checks = 0
+
+    vowel_count = sum(1 for c in word if c in VOWELS)
+    if vowel_count / len(word) < 0.2:
+        failed_checks += 1
+
+    consonant_sequence = 0
+    for char in word:
+        if char not in VOWELS:
+            consonant_sequence += 1
+            if consonant_sequence > 4:
+                failed_checks += 1
+                break
+        else:
+            consonant_sequence = 0
+
+    if len(word) >= 4:
+        char_counts = {}
+        for char in word:
+            char_counts[char] = char_counts.get(char, 0) + 1
+
+        deviation = 0
+        for char, count in char_counts.items():
+            if char in LETTER_FREQUENCY:
+                expected = LETTER_FREQUENCY[char] / 100
+                actual = count / len(word)
+                deviation += abs(expected - actual)
+
+        if (deviation / len(char_counts)) > 0.5:
+            failed_checks += 1
+
+    invalid_pairs = 0
+    for i in range(len(word) - 1):
+        pair = word[i:i+2]
+        if pair not in VALID_PAIRS and pair[0] not in VOWELS and pair[1] not in VOWELS:
+            invalid_pairs += 1
+            if invalid_pairs > 1:
+                failed_checks += 1
+                break
+
+    return failed_checks >= 2
+
+
+def sample_words(count: int) -> list[str]:
+    rng = random.Random(42)
+    alphabets = [string.ascii_lowercase, "bcdfghjklmnpqrstvwxz", "aeiouy", "sstthh", "éßçñ" + string.ascii_letters]
+    words = ["refactor", "xkcd", "zzzz", "aaaa", "qwrtp", "strength", "rhythms", "Fix:", "...", "a", "", "v2", "naïve"]
+    for _ in range(count):
+        alphabet = rng.choice(alphabets)
+        word = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 14)))
+        words.append(rng.choice(["", "(", "`"]) + word + rng.choice(["", ".", ",", ":"]))
+    return words
+
+
+def test_detector_matches_reference_implementation():
+    words = sample_words(5000)
+    expected = [reference_check_gibberish(word) for word in words]
+
+    scalar_detector = GibberishDetector()
+    assert [scalar_detector.is_gibberish(word) for word in words] == expected
+    assert GibberishDetector()._score_vectorized(words) == expected
+    assert GibberishDetector().score(words) == expected
@@ -1,5 +1,18 @@
+from fastapi.testclient import TestClient
+from main import app
+from src.config.config import settings
+from src.core.models import Commit, CommitAuthor, GitHubPayload
+from src.core.analyzer.executor import run_analysis
+from src.routers.github import push_queue
+from src.utils.dedup import PushDeduplicator, SharedPushDeduplicator
 from tests import client
 import json
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fresh_deduplicator(monkeypatch):
+    monkeypatch.setattr("src.routers.github.deduplicator", PushDeduplicator(window=60, maxsize=100))
 
 
 def test_send_to_telex_success():
@@ -28,3 +41,247 @@ def test_send_to_telex_failure():
     assert response.status_code == 422
     response_data = json.loads(response.content.decode())
     assert "commits" in response_data["detail"][0]["loc"]
+
+
+def _commit(commit_id, message):
+    return {
+        "id": commit_id,
+        "message": message,
+        "timestamp": "2025-02-18T10:17:54+01:00",
+        "url": "commit_url",
+        "author": {"name": "author_name", "email": "author_email"},
+    }
+
+
+def test_send_to_telex_partial_failure(monkeypatch):
+    sent = []
+
+    async def fake_send_payload(payload, url):
+        if "bad_commit" in payload:
+            raise RuntimeError("telex unavailable")
+        sent.append(payload)
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", fake_send_payload)
+    response = client.post(
+        "/webhook/github/channel_id/",
+        json={
+            "pusher": {"name": "test"},
+            "commits": [
+                _commit("bad_commit", "bad_commit message"),
+                _commit("commit_a", "commit_a message"),
+                _commit("commit_b", "commit_b message"),
+            ],
+        },
+    )
+    assert response.status_code == 207
+    response_data = response.json()
+    assert response_data["sent"] == 2 and len(sent) == 2
+    assert response_data["failed"][0]["commit_id"] == "bad_commit"
+
+
+def test_send_to_telex_async_processing(monkeypatch):
+    sent = []
+
+    async def fake_send_payload(payload, url):
+        sent.append(payload)
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", fake_send_payload)
+    monkeypatch.setattr(settings, "async_processing", True)
+    with TestClient(app, base_url="http://test/api/v2") as async_client:
+        response = async_client.post(
+            "/webhook/github/channel_id/",
+            json={"pusher": {"name": "test"}, "commits": [_commit("commit_a", "commit_a message")]},
+        )
+        assert response.status_code == 202
+    # Leaving the client runs the shutdown drain of the push queue
+    assert len(sent) == 1
+    assert push_queue.stats()["processed"] >= 1
+
+
+def test_duplicate_deliveries_and_commits_skipped(monkeypatch):
+    sent = []
+
+    async def fake_send_payload(payload, url):
+        sent.append(payload)
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", fake_send_payload)
+    push = {"pusher": {"name": "test"}, "commits": [_commit("commit_a", "commit_a message")]}
+
+    first = client.post("/webhook/github/channel_id/", json=push, headers={"X-GitHub-Delivery": "delivery_1"})
+    retried = client.post("/webhook/github/channel_id/", json=push, headers={"X-GitHub-Delivery": "delivery_1"})
+    repushed = client.post("/webhook/github/channel_id/", json=push, headers={"X-GitHub-Delivery": "delivery_2"})
+    other_channel = client.post("/webhook/github/other_channel/", json=push)
+
+    assert first.json() == {"status": "success"}
+    assert retried.json() == repushed.json() == {"status": "duplicate"}
+    assert other_channel.json() == {"status": "success"}
+    assert len(sent) == 2
+
+
+def test_shared_deduplicator_claims_across_workers(tmp_path):
+    first = SharedPushDeduplicator(tmp_path / "dedup.sqlite3", window=60, maxsize=100)
+    second = SharedPushDeduplicator(tmp_path / "dedup.sqlite3", window=60, maxsize=100)
+
+    assert first.claim_delivery("delivery_1") and not second.claim_delivery("delivery_1")
+    assert first.claim_commits("channel_id", ["commit_a", "commit_b"]) == [True, True]
+    assert second.claim_commits("channel_id", ["commit_b", "commit_c", None]) == [False, True, True]
+    assert second.claim_commit("other_channel", "commit_a")
+    assert second.stats() == {
+        "tracked_deliveries": 1, "tracked_commits": 4, "duplicate_deliveries": 1, "duplicate_commits": 1,
+    }
+
+    second.release("delivery_1", "channel_id", ["commit_a"])
+    assert first.claim_delivery("delivery_1") and first.claim_commit("channel_id", "commit_a")
+
+    expiring = SharedPushDeduplicator(tmp_path / "dedup.sqlite3", window=0, maxsize=100)
+    assert expiring.claim_delivery("delivery_2") and expiring.claim_delivery("delivery_2")
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_failed_processing_releases_claims(monkeypatch, streaming):
+    sent = []
+    calls = 0
+
+    async def fake_send_payload(payload, url):
+        sent.append(payload)
+
+    async def flaky_run_analysis(messages):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("analysis failed")
+        return await run_analysis(messages)
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", fake_send_payload)
+    monkeypatch.setattr("src.routers.github.run_analysis", flaky_run_analysis)
+    monkeypatch.setattr(settings, "github_streaming", streaming)
+    push = {"pusher": {"name": "test"}, "commits": [_commit("commit_f", "commit_f message")]}
+    unraised_client = TestClient(app, base_url="http://test/api/v2", raise_server_exceptions=False)
+
+    failed = unraised_client.post("/webhook/github/channel_id/", json=push, headers={"X-GitHub-Delivery": "d_f"})
+    redelivered = unraised_client.post("/webhook/github/channel_id/", json=push, headers={"X-GitHub-Delivery": "d_f"})
+
+    assert failed.status_code == 500
+    assert redelivered.json() == {"status": "success"}
+    assert len(sent) == 1
+
+
+def _chunked(body, size=7):
+    return (body[i:i + size] for i in range(0, len(body), size))
+
+
+def test_streaming_matches_buffered_analysis(monkeypatch):
+    commits = [_commit(f"commit_{n}", message) for n, message in enumerate(
+        ["wibble: jwt token expiry", "feat(api): add pagination", "x: lorem ipsum", "fix typo"] * 3
+    )]
+    # Commits before the pusher exercise the held-back path.
+    body = json.dumps({"commits": commits, "repository": {"name": "repo"}, "pusher": {"name": "test"}}).encode()
+
+    buffered = client.post("/webhook/github/channel_id/?is_test=true", content=body)
+    monkeypatch.setattr(settings, "github_streaming", True)
+    monkeypatch.setattr(settings, "analysis_chunk_size", 5)
+    streamed = client.post("/webhook/github/channel_id/?is_test=true", content=_chunked(body))
+
+    assert streamed.status_code == buffered.status_code == 200
+    assert streamed.json() == buffered.json()
+
+
+def test_streaming_delivers_chunks_and_skips_duplicates(monkeypatch):
+    sent = []
+
+    async def fake_send_payload(payload, url):
+        sent.append(payload)
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", fake_send_payload)
+    monkeypatch.setattr(settings, "github_streaming", True)
+    monkeypatch.setattr(settings, "analysis_chunk_size", 2)
+    body = json.dumps({
+        "pusher": {"name": "test"},
+        "commits": [_commit(f"commit_{n}", f"commit_{n} message") for n in range(5)],
+    }).encode()
+
+    first = client.post("/webhook/github/channel_id/", content=_chunked(body), headers={"X-GitHub-Delivery": "d1"})
+    repushed = client.post("/webhook/github/channel_id/", content=_chunked(body), headers={"X-GitHub-Delivery": "d2"})
+
+    assert first.json() == {"status": "success"}
+    assert repushed.json() == {"status": "duplicate"}
+    assert len(sent) == 5
+
+
+def test_streaming_rejects_invalid_payloads(monkeypatch):
+    monkeypatch.setattr(settings, "github_streaming", True)
+
+    missing = client.post("/webhook/github/channel_id/?is_test=true", json={"pusher": {"name": "test"}})
+    malformed = client.post("/webhook/github/channel_id/", content=b'{"pusher": {"name": "test"}, "commits": [{')
+
+    assert missing.status_code == malformed.status_code == 422
+    assert "commits" in missing.json()["detail"][0]["loc"]
+
+
+def test_commits_are_parsed_into_typed_models(monkeypatch):
+    commit = _commit("commit_a", "commit_a message") | {"added": ["README.md"], "tree_id": "tree"}
+    payload = GitHubPayload.model_validate({"pusher": {"name": "test", "login": "t"}, "commits": [commit]})
+
+    assert payload.commits[0] == Commit(
+        "commit_a", "commit_a message", commit["timestamp"], "commit_url", CommitAuthor("author_name", "author_email")
+    )
+    assert not hasattr(payload.commits[0], "__dict__")
+
+    incomplete = {"pusher": {"name": "test"}, "commits": [{"id": "commit_a", "message": "fix: typo"}]}
+    for streaming in (False, True):
+        monkeypatch.setattr(settings, "github_streaming", streaming)
+        response = client.post("/webhook/github/channel_id/?is_test=true", json=incomplete)
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][:3] == ["body", "commits", 0]
+
+
+def test_push_digest_sends_one_message(monkeypatch):
+    sent = []
+
+    async def fake_send_payload(payload, url):
+        sent.append(json.loads(payload))
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", fake_send_payload)
+    push = {"pusher": {"name": "test"}, "commits": [_commit(f"commit_{n}", "fix typo") for n in range(3)]}
+
+    response = client.post("/webhook/github/channel_id/?digest=push", json=push)
+
+    assert response.json() == {"status": "success"}
+    assert len(sent) == 1
+    message = sent[0]["message"]
+    assert message.startswith("📋 *Commit Digest*: 3 commits need attention")
+    assert message.count("💡 Resources") == 1 and message.count("fix typo") == 3
+
+
+def test_window_digest_groups_pushes(monkeypatch):
+    sent = []
+
+    async def fake_send_payload(payload, url):
+        sent.append(json.loads(payload))
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", fake_send_payload)
+    with TestClient(app, base_url="http://test/api/v2") as lifespan_client:
+        for n, pusher in enumerate(["alice", "bob"]):
+            push = {"pusher": {"name": pusher}, "commits": [_commit(f"window_{n}", "fix typo")]}
+            response = lifespan_client.post("/webhook/github/channel_id/?digest=window", json=push)
+            assert response.json() == {"status": "success"}
+        assert not sent
+    # Leaving the client flushes pending digests
+    assert len(sent) == 1
+    assert sent[0]["username"] == "alice, bob"
+    assert "2 commits need attention" in sent[0]["message"]
+
+
+def test_message_format_query_parameter(monkeypatch):
+    sent = []
+
+    async def fake_send_payload(payload, url):
+        sent.append(json.loads(payload))
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", fake_send_payload)
+    push = {"pusher": {"name": "test"}, "commits": [_commit("format_plain", "fix typo")]}
+
+    response = client.post("/webhook/github/channel_id/?format=plain", json=push)
+
+    assert response.json() == {"status": "success"}
+    assert sent[0]["message"].startswith("Commit Details\n- Hash: ")
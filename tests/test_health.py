@@ -0,0 +1,75 @@
+from fastapi.testclient import TestClient
+from main import app
+from src.config.config import settings
+from src.core.analyzer import executor
+import asyncio
+import subprocess
+import sys
+import time
+
+
+def test_app_import_defers_ml_stack():
+    code = "import main, sys; print(sorted({'numpy', 'scipy'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_readiness_reports_warm_analyzer():
+    with TestClient(app, base_url="http://test") as lifespan_client:
+        deadline = time.monotonic() + 30
+        response = lifespan_client.get("/ready")
+        while response.status_code == 503 and time.monotonic() < deadline:
+            assert response.json() == {"status": "starting", "analyzer": "warming"}
+            time.sleep(0.05)
+            response = lifespan_client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "analyzer": "warm"}
+
+
+def test_readiness_without_warmup(monkeypatch):
+    monkeypatch.setattr(settings, "analyzer_warmup", False)
+    with TestClient(app, base_url="http://test") as lifespan_client:
+        response = lifespan_client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_analysis_leaves_warm_up_state(monkeypatch):
+    monkeypatch.setattr(executor, "_analyzer_state", "failed")
+    asyncio.run(executor.run_analysis(["feat: add login page"]))
+
+    assert executor.analyzer_state() == "failed"
+
+
+def test_warm_up_covers_every_worker_process(monkeypatch):
+    monkeypatch.setattr(settings, "analysis_executor", "process")
+    monkeypatch.setattr(settings, "analysis_workers", 2)
+    try:
+        warmed = asyncio.run(executor._warm_up_processes(executor.get_executor(), 2))
+    finally:
+        executor.shutdown_executor()
+
+    assert len(warmed) == 2
+
+
+def test_readiness_recovers_after_failed_warm_up(monkeypatch):
+    from src.core.analyzer import classifier
+
+    monkeypatch.setattr(classifier, "_classifier", None)
+    monkeypatch.setattr(classifier, "_classifier_version", None)
+    monkeypatch.setattr(executor, "_warm_up_worker", lambda: 1 / 0)
+    with TestClient(app, base_url="http://test") as lifespan_client:
+        deadline = time.monotonic() + 30
+        while executor.analyzer_state() == "warming" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert lifespan_client.get("/ready").json() == {"status": "starting", "analyzer": "failed"}
+
+        # A push that loads the classifier makes the analyzer ready
+        classifier.get_classifier()
+        response = lifespan_client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "analyzer": "warm"}
@@ -0,0 +1,53 @@
+from src.utils.json_stream import JSONStreamError, ObjectStreamParser
+import json
+import random
+import pytest
+
+
+DOCUMENT = {
+    "ref": "refs/heads/main",
+    "commits": [
+        {"id": str(n), "message": f"fix: \"quoted\" \\ unicode é {n}", "distinct": n % 2 == 0, "size": n * 1.5}
+        for n in range(40)
+    ],
+    "repository": {"name": "repo", "topics": [], "size": 12345},
+    "pusher": {"name": "test", "email": None},
+    "forced": False,
+}
+
+
+def _parse(text, chunk_sizes, **kwargs):
+    parser = ObjectStreamParser(["commits"], **kwargs)
+    events = []
+    position = 0
+    while position < len(text):
+        size = next(chunk_sizes)
+        events += parser.feed(text[position:position + size])
+        position += size
+    return events + parser.close(), parser
+
+
+def test_members_and_elements_survive_any_chunking():
+    text = json.dumps(DOCUMENT)
+    rng = random.Random(0)
+    for _ in range(50):
+        events, parser = _parse(text, iter(lambda: rng.randint(1, 64), None))
+        assert [value for key, value in events if key == "commits"] == DOCUMENT["commits"]
+        assert {key: value for key, value in events if key != "commits"} == {
+            key: value for key, value in DOCUMENT.items() if key != "commits"
+        }
+        assert parser.seen_keys == set(DOCUMENT)
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['{"a": 1', '{"a" 1}', "[1]", '{"a": 1} x', '{"commits": 3}', '{"a": tru}', '{"commits": [1 2]}'],
+)
+def test_malformed_documents_raise(text):
+    with pytest.raises(JSONStreamError):
+        _parse(text, iter(lambda: 3, None))
+
+
+def test_oversized_values_raise():
+    with pytest.raises(JSONStreamError, match="exceeds"):
+        _parse(json.dumps({"commits": [{"message": "x" * 500}]}), iter(lambda: 64, None), max_value_size=100)
@@ -0,0 +1,39 @@
+from src.config.data import commit_types, semantic_patterns, commit_training_data
+from src.core.analyzer.keywords import KeywordMatcher
+import random
+
+
+def reference_type_scores(message: str) -> dict[str, int]:
+    return {
+        commit_type: sum(word in message for word in indicators)
+        for commit_type, indicators in commit_types.items()
+    }
+
+
+def reference_semantic_scores(message: str) -> dict[str, int]:
+    return {
+        commit_type: sum(1 for pattern in patterns if any(word in message for word in pattern))
+        for commit_type, patterns in semantic_patterns.items()
+    }
+
+
+def sample_messages(count: int) -> list[str]:
+    rng = random.Random(7)
+    phrases = [word for words in commit_types.values() for word in words]
+    phrases += [word for patterns in semantic_patterns.values() for pattern in patterns for word in pattern]
+    phrases += ["lorem", "ipsum", "x", " "]
+    messages = [message.lower() for messages in commit_training_data.values() for message in messages]
+    for _ in range(count):
+        separator = rng.choice([" ", ""])
+        messages.append(separator.join(rng.choice(phrases) for _ in range(rng.randint(0, 25))))
+    return messages
+
+
+def test_matcher_scores_match_substring_scan():
+    type_matcher = KeywordMatcher.for_indicators(commit_types)
+    semantic_matcher = KeywordMatcher.for_patterns(semantic_patterns)
+
+    for message in sample_messages(1000):
+        # Key order matters: ties are broken by the first type with the highest score.
+        assert list(type_matcher.scores(message).items()) == list(reference_type_scores(message).items())
+        assert list(semantic_matcher.scores(message).items()) == list(reference_semantic_scores(message).items())
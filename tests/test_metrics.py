@@ -0,0 +1,150 @@
+from fastapi.testclient import TestClient
+from main import app
+from src.config.config import settings
+from src.utils.metrics import (
+    ANALYSIS_STAGE_SECONDS,
+    COMMITS_ANALYZED,
+    FORMAT_SECONDS,
+    VIOLATIONS,
+    WEBHOOK_PARSE_SECONDS,
+    Registry,
+)
+from src.utils.workers import prepare_workers
+from tests import client
+import json
+import os
+import time
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.", ("path",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    registry.gauge_callback("depth", "Queue depth.", lambda: 3)
+
+    requests.inc(("/a\"b",))
+    requests.inc(("/a\"b",), amount=2)
+    latency.observe(0.05)
+    latency.observe_many([0.5, 5.0])
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{path="/a\\"b"} 3',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+        "# HELP depth Queue depth.",
+        "# TYPE depth gauge",
+        "depth 3",
+    ]
+
+
+def test_registry_sums_snapshots_of_other_processes(tmp_path):
+    def build_registry():
+        registry = Registry()
+        requests = registry.counter("requests_total", "Requests.", ("path",))
+        latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        registry.gauge_callback("depth", "Queue depth.", lambda: 2)
+        registry.gauge_callback("spool", "Shared spool size.", lambda: 7, shared=True)
+        return registry, requests, latency
+
+    worker, worker_requests, worker_latency = build_registry()
+    other, other_requests, other_latency = build_registry()
+    worker_requests.inc(("/a",))
+    worker_latency.observe(0.05)
+    other_requests.inc(("/a",), amount=2)
+    other_requests.inc(("/b",))
+    other_latency.observe(0.5)
+    (tmp_path / "1.json").write_text(json.dumps(other.snapshot() | {"pid": 1}))
+    # An exited process: its counters still count, its gauges no longer do.
+    (tmp_path / "2.json").write_text(json.dumps(other.snapshot() | {"pid": 2, "time": time.time() - 60}))
+    worker.write_snapshot(tmp_path)
+
+    lines = worker.render(worker.read_snapshots(tmp_path, gauge_max_age=5)).splitlines()
+
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+    assert 'requests_total{path="/a"} 5' in lines
+    assert 'requests_total{path="/b"} 2' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 3' in lines
+    assert "latency_seconds_count 3" in lines
+    assert "depth 4" in lines
+    assert "spool 7" in lines
+
+
+def test_reset_drops_callback_metrics():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests.")
+    registry.gauge_callback("depth", "Queue depth.", lambda: 3)
+    requests.inc()
+
+    registry.reset()
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+    ]
+
+
+def test_prepare_workers_builds_artifact_and_shares_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(os, "environ", dict(os.environ))
+    # Settings assigned by other tests count as explicitly configured.
+    monkeypatch.setattr(settings, "__pydantic_fields_set__", set())
+    monkeypatch.setattr(settings, "model_artifact_dir", str(tmp_path / "models"))
+    monkeypatch.setattr(settings, "metrics_dir", str(tmp_path / "metrics"))
+    (tmp_path / "metrics").mkdir()
+    (tmp_path / "metrics" / "123.json").write_text("{}")
+
+    environment = prepare_workers()
+
+    assert environment == {
+        "DEDUP_PATH": ".cache/dedup.sqlite3",
+        "SLACK_RATE_LIMIT_PATH": ".cache/slack_rate_limit.sqlite3",
+        "ANALYSIS_CACHE_BACKEND": "disk",
+    }
+    assert os.environ["ANALYSIS_CACHE_BACKEND"] == "disk"
+    assert list((tmp_path / "models").iterdir())
+    assert not list((tmp_path / "metrics").iterdir())
+
+
+def test_webhook_records_pipeline_metrics(monkeypatch):
+    monkeypatch.setattr(settings, "analysis_cache_backend", "none")
+    commits_before = COMMITS_ANALYZED.value()
+    violations_before = VIOLATIONS.value(("Commit message type unidentifiable", "high"))
+    stages_before = ANALYSIS_STAGE_SECONDS.count(("subject",))
+    push = {
+        "pusher": {"name": "test"},
+        "commits": [
+            {
+                "id": "metrics_commit",
+                "message": "remove unnecessary comment",
+                "timestamp": "2025-02-18T10:17:54+01:00",
+                "url": "https://github.com/test/test/commit/metrics_commit",
+                "author": {"name": "test", "email": "test@example.com"},
+            }
+        ],
+    }
+
+    response = client.post("/webhook/github/channel_id/?is_test=true", json=push)
+
+    assert response.status_code == 200
+    assert COMMITS_ANALYZED.value() == commits_before + 1
+    assert VIOLATIONS.value(("Commit message type unidentifiable", "high")) >= violations_before + 1
+    assert WEBHOOK_PARSE_SECONDS.count(("buffered",)) >= 1
+    assert FORMAT_SECONDS.count(("slack",)) >= 1
+    assert ANALYSIS_STAGE_SECONDS.count(("subject",)) == stages_before + 1
+
+
+def test_metrics_endpoint():
+    with TestClient(app, base_url="http://test") as metrics_client:
+        response = metrics_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for name in ("commits_analyzed_total", "analysis_stage_seconds", "push_queue_depth 0", "slack_relay_queue_depth"):
+        assert name in response.text
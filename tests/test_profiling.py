@@ -0,0 +1,81 @@
+from src.config.config import settings
+from src.core.analyzer.executor import shutdown_executor
+from src.utils.profiling import StackSampler
+from tests import client
+import threading
+import time
+import pytest
+
+
+PUSH = {
+    "pusher": {"name": "test"},
+    "commits": [
+        {
+            "id": "profiled_commit",
+            "message": "remove unnecessary comment",
+            "timestamp": "2025-02-18T10:17:54+01:00",
+            "url": "https://github.com/test/test/commit/profiled_commit",
+            "author": {"name": "test", "email": "test@example.com"},
+        }
+    ],
+}
+
+
+@pytest.fixture
+def profiling(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "admin_token", "secret")
+    return tmp_path
+
+
+def test_profiled_webhook_returns_stage_timings_and_stores_profile(profiling):
+    response = client.post("/webhook/github/channel_id/?is_test=true&profile=1", json=PUSH)
+
+    assert response.status_code == 200
+    stages = {entry.split(";")[0].strip() for entry in response.headers["server-timing"].split(",")}
+    assert {"parse", "analysis", "analysis.subject", "format", "total"} <= stages
+    profile_id = response.headers["x-profile-id"]
+    assert (profiling / f"{profile_id}.folded").exists()
+
+    profile = client.get(f"/admin/profiles/{profile_id}", headers={"Authorization": "Bearer secret"})
+    assert profile.status_code == 200
+    for line in profile.text.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
+
+
+def test_thread_executor_keeps_analysis_stage_timings(profiling, monkeypatch):
+    monkeypatch.setattr(settings, "analysis_cache_backend", "none")
+    monkeypatch.setattr(settings, "analysis_executor", "thread")
+    try:
+        response = client.post("/webhook/github/channel_id/?is_test=true&profile=1", json=PUSH)
+    finally:
+        shutdown_executor()
+
+    stages = {entry.split(";")[0].strip() for entry in response.headers["server-timing"].split(",")}
+    assert "analysis.subject" in stages
+
+
+def test_profiling_requires_setting_and_flag(profiling, monkeypatch):
+    response = client.post("/webhook/github/channel_id/?is_test=true", json=PUSH)
+    assert "server-timing" not in response.headers
+
+    monkeypatch.setattr(settings, "profiling_enabled", False)
+    response = client.post("/webhook/github/channel_id/?is_test=true", json=PUSH, headers={"X-Profile": "1"})
+    assert "server-timing" not in response.headers
+    assert not list(profiling.iterdir())
+
+
+def test_stack_sampler_collapses_stacks():
+    def busy_wait():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    sampler = StackSampler(threading.get_ident(), interval=0.001)
+    sampler.start()
+    busy_wait()
+    sampler.stop()
+
+    assert any("busy_wait" in line for line in sampler.collapsed().splitlines())
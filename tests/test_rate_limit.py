@@ -0,0 +1,99 @@
+from src.utils.rate_limit import CoalescingRelay, SharedTokenBucket, TokenBucket
+import asyncio
+import time
+
+
+def test_token_bucket_allows_bursts_then_refills():
+    bucket = TokenBucket(rate=20.0, capacity=2)
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert 0 < bucket.delay() <= 0.05
+
+    time.sleep(0.06)
+    assert bucket.try_acquire()
+
+
+def test_shared_token_bucket_is_shared_between_workers(tmp_path):
+    first = SharedTokenBucket(tmp_path / "buckets.sqlite3", "https://hooks.slack.com/a", rate=20.0, capacity=2)
+    second = SharedTokenBucket(tmp_path / "buckets.sqlite3", "https://hooks.slack.com/a", rate=20.0, capacity=2)
+    other = SharedTokenBucket(tmp_path / "buckets.sqlite3", "https://hooks.slack.com/b", rate=20.0, capacity=2)
+    assert first.try_acquire() and second.try_acquire()
+    assert not first.try_acquire() and not second.try_acquire()
+    assert 0 < second.delay() <= 0.05
+    assert other.try_acquire()
+
+    time.sleep(0.06)
+    assert second.try_acquire()
+
+
+def test_relay_coalesces_messages_above_the_rate():
+    posts = []
+
+    async def send(text, url):
+        posts.append((url, text))
+
+    async def scenario() -> CoalescingRelay:
+        relay = CoalescingRelay(send, rate=20.0, burst=1, max_pending=10, max_batch_chars=4000)
+        sent_now = [await relay.submit(f"message {n}", "https://hooks.slack.com/a") for n in range(4)]
+        assert sent_now == [True, False, False, False]
+        # Other destinations have their own bucket.
+        assert await relay.submit("other", "https://hooks.slack.com/b")
+        assert relay.stats()["queue_depth"] == 3
+
+        await relay.drain(timeout=1.0)
+        return relay
+
+    relay = asyncio.run(scenario())
+    assert posts == [
+        ("https://hooks.slack.com/a", "message 0"),
+        ("https://hooks.slack.com/b", "other"),
+        ("https://hooks.slack.com/a", CoalescingRelay.SEPARATOR.join(["message 1", "message 2", "message 3"])),
+    ]
+    assert relay.stats() | {"high_watermark": 0} == {
+        "destinations": 2,
+        "queue_depth": 0,
+        "high_watermark": 0,
+        "sent_messages": 5,
+        "posts": 3,
+        "coalesced": 2,
+        "dropped": 0,
+        "failed": 0,
+    }
+
+
+def test_relay_splits_batches_and_drops_oldest():
+    posts = []
+
+    async def send(text, url):
+        posts.append(text)
+
+    async def scenario() -> CoalescingRelay:
+        relay = CoalescingRelay(send, rate=50.0, burst=1, max_pending=3, max_batch_chars=12)
+        for n in range(5):
+            await relay.submit(f"message {n}", "https://hooks.slack.com/a")
+        await relay.drain(timeout=1.0)
+        return relay
+
+    relay = asyncio.run(scenario())
+    # "message 1" was dropped when the queue was full; each batch fits one message.
+    assert posts == ["message 0", "message 2", "message 3", "message 4"]
+    assert relay.stats()["dropped"] == 1
+
+
+def test_relay_posts_uncoalescable_messages_alone():
+    posts = []
+
+    async def send(text, url):
+        posts.append(text)
+
+    async def scenario() -> None:
+        relay = CoalescingRelay(
+            send, rate=50.0, burst=1, max_pending=10, max_batch_chars=4000,
+            can_coalesce=lambda message: not message.startswith("{"),
+        )
+        for message in ("a", "b", "{1}", "c", "{2}", "{3}", "d"):
+            await relay.submit(message, "https://hooks.slack.com/a")
+        await relay.drain(timeout=1.0)
+
+    asyncio.run(scenario())
+    assert posts == ["a", "b", "{1}", "c", "{2}", "{3}", "d"]
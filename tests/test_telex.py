@@ -1,3 +1,7 @@
+from fastapi.testclient import TestClient
+from main import app
+from src.routers.telex import slack_relay
+from src.config.config import settings
 from tests import client
 import json
 
@@ -43,4 +47,73 @@ def test_send_from_telex_success():
     
     
     
-    
\ No newline at end of file
+    
+
+def test_slack_relay_coalesces_bursts(monkeypatch):
+    sent = []
+
+    async def fake_send_payload(payload, url):
+        sent.append(json.loads(payload)["text"])
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", fake_send_payload)
+    # Slow enough that no token refills between the posts, even while the analyzer warms up.
+    monkeypatch.setattr(slack_relay, "rate", 5.0)
+    monkeypatch.setattr(slack_relay, "burst", 1)
+    settings = [{"label": "slack_url", "type": "text", "default": "https://hooks.slack.com/test"}]
+
+    with TestClient(app, base_url="http://test/api/v2") as lifespan_client:
+        statuses = [
+            lifespan_client.post("/webhook/telex/", json={"message": f"burst {n}", "settings": settings}).status_code
+            for n in range(3)
+        ]
+        assert statuses == [200, 202, 202]
+    # Leaving the client drains the relay
+    assert sent == ["burst 0", "burst 1\n\n―――\n\nburst 2"]
+
+
+def test_slack_relay_posts_blocks_as_blocks(monkeypatch):
+    sent = []
+
+    async def fake_send_payload(payload, url):
+        sent.append(json.loads(payload))
+
+    monkeypatch.setattr("src.utils.telex_utils.send_payload", fake_send_payload)
+    monkeypatch.setattr(slack_relay, "rate", 5.0)
+    monkeypatch.setattr(slack_relay, "burst", 1)
+    slack_settings = [{"label": "slack_url", "type": "text", "default": "https://hooks.slack.com/blocks"}]
+    messages = [json.dumps({"blocks": [{"type": "divider", "n": n}]}) for n in range(3)] + ["text"]
+
+    with TestClient(app, base_url="http://test/api/v2") as lifespan_client:
+        for message in messages:
+            lifespan_client.post("/webhook/telex/", json={"message": message, "settings": slack_settings})
+    # Queued blocks are not joined with each other or with text
+    assert sent == [{"blocks": [{"type": "divider", "n": n}]} for n in range(3)] + [{"text": "text"}]
+
+
+def test_integration_config_is_prebuilt_and_revalidated(monkeypatch):
+    root_client = TestClient(app, base_url="http://test")
+    first = root_client.get("/integration.json")
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/json"
+    # Unchanged settings serve the same body, dates included
+    second = root_client.get("/integration.json")
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+    for headers in ({"if-none-match": etag}, {"if-none-match": f'"other", {etag}'}, {"if-modified-since": last_modified}):
+        response = root_client.get("/integration.json", headers=headers)
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    # If-None-Match takes precedence over If-Modified-Since
+    response = root_client.get(
+        "/integration.json", headers={"if-none-match": '"other"', "if-modified-since": last_modified}
+    )
+    assert response.status_code == 200
+
+    monkeypatch.setattr(settings, "app_url", "https://changed.example.com")
+    response = root_client.get("/integration.json", headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["data"]["website"] == "https://changed.example.com"